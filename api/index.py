@@ -0,0 +1,7 @@
+"""Точка входа для Python-рантайма Vercel (vc_init.py ищет переменную `app`)."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wb_acts.server import app  # noqa: E402,F401
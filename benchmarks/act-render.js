@@ -0,0 +1,315 @@
+// Бенчмарк шаблонов актов: прежние шаблонные строки с style="..." в каждой
+// ячейке против скомпилированных макетов js/act-templates.js.
+//
+//   node benchmarks/act-render.js                 # месяц на 10 000 SKU
+//   node benchmarks/act-render.js --skus 1000,10000,50000
+//
+// Время — медиана по --runs запускам, от позиций до байт UTF-8 с BOM (как в .doc).
+// Размер — сам .doc и его запись в ZIP (deflate).
+import { deflateRawSync } from 'zlib';
+
+import { syntheticItems } from './synthetic.js';
+
+// js/*.js — обычные скрипты для страницы: подключаем их после объявления self
+globalThis.self = globalThis;
+await import('../js/acts.js');
+await import('../js/act-templates.js');
+
+const { formatDate, getPeriodDates, renderActChunks, encodeChunks } = self.WbActs;
+
+const BOM = '\uFEFF';
+const MONTH = 'Январь 24';
+const ACT_DATE = '2024-01-31';
+
+const argValue = (name, fallback) => {
+  const index = process.argv.indexOf(name);
+  return index >= 0 ? process.argv[index + 1] : fallback;
+};
+
+// Прежние шаблоны из js/acts.js (до компиляции макетов) — без изменений
+const legacy = (() => {
+  // Реквизиты в обычном тексте - теперь работает через HTML Blob с BOM
+  const getRequisitesHtml = () => {
+    return `
+  <table style="border: none; width: 100%; border-collapse: collapse; table-layout: fixed; margin-top: 30px;">
+    <tr>
+      <td style="border: none; width: 50%; vertical-align: top; padding: 10px; font-size: 10pt;">
+        <p style="font-weight: bold; margin: 5px 0;">Исполнитель</p>
+        <br>
+        <p style="margin: 5px 0;">Индивидуальный предприниматель Мирошниченко Михаил Михайлович</p>
+        <p style="margin: 5px 0;">ИНН: 771994433911</p>
+        <p style="margin: 5px 0;">Банк: МОСКОВСКИЙ ФИЛИАЛ АО КБ "МОДУЛЬБАНК"</p>
+        <p style="margin: 5px 0;">БИК: 044525092</p>
+        <p style="margin: 5px 0;">к/с: 30101810645250000092</p>
+        <p style="margin: 5px 0;">Счет: 40802810670010452146</p>
+        <br><br>
+        <p style="margin: 5px 0;">_________________________</p>
+      </td>
+      <td style="border: none; width: 50%; vertical-align: top; padding: 10px; font-size: 10pt;">
+        <p style="font-weight: bold; margin: 5px 0;">Заказчик</p>
+        <br>
+        <p style="margin: 5px 0;">ИП Гаряев Руслан Асланович</p>
+        <p style="margin: 5px 0;">ИНН: 910303241077</p>
+        <p style="margin: 5px 0;">ОГРНИП: 320911200033071</p>
+        <p style="margin: 5px 0;">Банк: МОСКОВСКИЙ ФИЛИАЛ АО КБ "МОДУЛЬБАНК"</p>
+        <p style="margin: 5px 0;">БИК: 044525092</p>
+        <p style="margin: 5px 0;">к/с: 30101810645250000092</p>
+        <p style="margin: 5px 0;">Счет: 40802810470010467690</p>
+        <p style="margin: 5px 0;">Адрес: 427112, Удмуртская Республика,<br>
+        р-н. Якшур-Бодьинский,<br>
+        с. Старые Зятцы, ул. Советская, д. 43</p>
+        <br><br>
+        <p style="margin: 5px 0;">_________________________</p>
+      </td>
+    </tr>
+  </table>`;
+  };
+
+  // Новые реквизиты по образцу (без ОГРНИП и адреса у заказчика)
+  const getRequisitesHtmlNew = () => {
+    return `
+  <table style="border: none; width: 100%; border-collapse: collapse; table-layout: fixed; margin-top: 30px;">
+    <tr>
+      <td style="border: none; width: 50%; vertical-align: top; padding: 10px; font-size: 10pt;">
+        <p style="font-weight: bold; margin: 5px 0;">Исполнитель</p>
+        <br>
+        <p style="margin: 5px 0;">Индивидуальный предприниматель Мирошниченко Михаил Михайлович</p>
+        <p style="margin: 5px 0;">ИНН: 771994433911</p>
+        <p style="margin: 5px 0;">Банк: МОСКОВСКИЙ ФИЛИАЛ АО КБ "МОДУЛЬБАНК"</p>
+        <p style="margin: 5px 0;">БИК: 044525092</p>
+        <p style="margin: 5px 0;">к/с: 30101810645250000092</p>
+        <p style="margin: 5px 0;">Счет: 40802810670010452146</p>
+        <br><br>
+        <p style="margin: 5px 0;">_________________________</p>
+      </td>
+      <td style="border: none; width: 50%; vertical-align: top; padding: 10px; font-size: 10pt;">
+        <p style="font-weight: bold; margin: 5px 0;">Заказчик</p>
+        <br>
+        <p style="margin: 5px 0;">Индивидуальный предприниматель<br>Гаряев Руслан Асланович</p>
+        <p style="margin: 5px 0;">ИНН: 910303241077</p>
+        <p style="margin: 5px 0;">Банк: МОСКОВСКИЙ ФИЛИАЛ АО КБ "МОДУЛЬБАНК"</p>
+        <p style="margin: 5px 0;">БИК: 044525092</p>
+        <p style="margin: 5px 0;">к/с: 30101810645250000092</p>
+        <p style="margin: 5px 0;">Счет: 40802810470010467690</p>
+        <br><br>
+        <p style="margin: 5px 0;">_________________________</p>
+      </td>
+    </tr>
+  </table>`;
+  };
+
+  const renderAcceptanceAct = (items, acceptanceDate) => {
+    const totalPrice = items.reduce((sum, item) => sum + item.totalPrice, 0);
+
+    const tableRows = items.map((item, index) => `
+          <tr>
+            <td style="font-size:7pt;text-align:center;word-wrap:break-word;word-break:break-word;white-space:normal;">${index + 1}</td>
+            <td style="font-size:7pt;word-wrap:break-word;word-break:break-word;white-space:normal;">${item.name}</td>
+            <td style="font-size:7pt;text-align:center;word-wrap:break-word;word-break:break-word;white-space:normal;">${item.quantity}</td>
+            <td style="font-size:7pt;word-wrap:break-word;word-break:break-word;white-space:normal;">${item.brand}</td>
+            <td style="font-size:7pt;word-wrap:break-word;word-break:break-word;white-space:normal;">${item.sellerArticle || ''}</td>
+            <td style="font-size:7pt;word-wrap:break-word;word-break:break-word;white-space:normal;">${item.color}</td>
+            <td style="font-size:7pt;text-align:right;word-wrap:break-word;word-break:break-word;white-space:normal;">${item.totalPrice.toFixed(2)}</td>
+          </tr>
+        `).join('');
+
+    const html = `<!DOCTYPE html>
+<html xmlns:o="urn:schemas-microsoft-com:office:office" xmlns:w="urn:schemas-microsoft-com:office:word">
+<head>
+  <meta charset="UTF-8">
+  <title>Акт приема-передачи</title>
+  <!--[if gte mso 9]>
+  <xml>
+    <w:WordDocument>
+      <w:View>Print</w:View>
+      <w:Zoom>100</w:Zoom>
+    </w:WordDocument>
+  </xml>
+  <![endif]-->
+  <style>
+    @page { size: A4; margin: 2cm 1.5cm 2cm 2cm; }
+    body { font-family: Arial, sans-serif; font-size: 11pt; line-height: 1.3; margin: 0; padding: 0; }
+    .right-text { text-align: right; }
+    .center-text { text-align: center; }
+    .bold { font-weight: bold; }
+    p { margin: 4px 0; }
+    td, th { word-wrap: break-word; word-break: break-word; overflow-wrap: break-word; white-space: normal; vertical-align: top; }
+  </style>
+</head>
+<body>
+  <p><strong>${formatDate(acceptanceDate)}</strong></p>
+  <p class="right-text">Приложение № 1</p>
+  <p class="right-text">к договору по оказанию транспортных услуг</p>
+  <p class="right-text">и услуг Фулфилмента №11/3/24 от 11.03.2024</p>
+  <br>
+  <h2 class="center-text">АКТ ПРИЕМА-ПЕРЕДАЧИ</h2>
+  <br>
+  <p>Индивидуальный предприниматель Гаряев Руслан Асланович, ИНН 910303241077 именуемый в дальнейшем Заказчик с одной стороны и Индивидуальный предприниматель Зверева Юлиана Владимировна, ИНН 623406499402, именуемая в дальнейшем Исполнитель, а совместно именуемые Стороны, заключили настоящий акт, о нижеследующем:</p>
+  <br>
+  <p>1. В рамках исполнения договора по оказанию транспортных услуг и услуг Фулфилмента №11/3/24 от 11.03.2024 г. Заказчик передал, а Исполнитель принял следующий товар:</p>
+  <br>
+  <table width="100%" border="1" cellpadding="1" cellspacing="0" align="center" style="border-collapse: collapse; table-layout: fixed; margin: 10px auto;">
+    <tr>
+      <th width="3%" rowspan="2" style="background-color:#f0f0f0;font-size:7pt;text-align:center;word-wrap:break-word;">№</th>
+      <th colspan="5" style="background-color:#f0f0f0;font-size:7pt;text-align:center;">Товар</th>
+      <th width="10%" rowspan="2" style="background-color:#f0f0f0;font-size:7pt;text-align:center;word-wrap:break-word;">Сумма</th>
+    </tr>
+    <tr>
+      <th width="37%" style="background-color:#f0f0f0;font-size:7pt;text-align:center;word-wrap:break-word;">Наименование</th>
+      <th width="6%" style="background-color:#f0f0f0;font-size:7pt;text-align:center;word-wrap:break-word;">Кол</th>
+      <th width="15%" style="background-color:#f0f0f0;font-size:7pt;text-align:center;word-wrap:break-word;">Бренд</th>
+      <th width="15%" style="background-color:#f0f0f0;font-size:7pt;text-align:center;word-wrap:break-word;">Артикул</th>
+      <th width="14%" style="background-color:#f0f0f0;font-size:7pt;text-align:center;word-wrap:break-word;">Цвет</th>
+    </tr>
+    ${tableRows}
+    <tr>
+      <td colspan="6" style="text-align: right;font-size:7pt;"><strong>Итого</strong></td>
+      <td style="text-align: right;font-size:7pt;"><strong>${totalPrice.toFixed(2)}</strong></td>
+    </tr>
+  </table>
+  <br>
+  <p>2. Особые отметки: внешних повреждений тары (упаковки) товара не выявлено.</p>
+  <br>
+  <p>3. Настоящий акт составлен в двух экземплярах, имеющих одинаковую юридическую силу, по одному для каждой из Сторон.</p>
+  <br>
+  <p>4. Настоящий акт является неотъемлемой частью договора по оказанию транспортных услуг и услуг Фулфилмента №11/3/24 от 11.03.2024 г.</p>
+  <br><br>
+  ${getRequisitesHtml()}
+</body>
+</html>`;
+
+    return html;
+  };
+
+  const renderServicesAct = (items, servicesDate, selectedMonth) => {
+    // Стоимость услуг: 60 рублей за единицу товара
+    const serviceCostPerItem = 60;
+    const totalQuantity = items.reduce((sum, item) => sum + item.quantity, 0);
+    const totalServiceCost = totalQuantity * serviceCostPerItem;
+
+    // Получаем даты периода
+    const periodDates = getPeriodDates(selectedMonth);
+
+    const tableRows = items.map((item, index) => `
+          <tr>
+            <td style="font-size:7pt;text-align:center;word-wrap:break-word;word-break:break-word;white-space:normal;">${index + 1}</td>
+            <td style="font-size:7pt;word-wrap:break-word;word-break:break-word;white-space:normal;">${item.name}</td>
+            <td style="font-size:7pt;text-align:center;word-wrap:break-word;word-break:break-word;white-space:normal;">${item.quantity}</td>
+            <td style="font-size:7pt;word-wrap:break-word;word-break:break-word;white-space:normal;">${item.brand}</td>
+            <td style="font-size:7pt;word-wrap:break-word;word-break:break-word;white-space:normal;">${item.sellerArticle || ''}</td>
+            <td style="font-size:7pt;word-wrap:break-word;word-break:break-word;white-space:normal;">${item.color}</td>
+            <td style="font-size:7pt;word-wrap:break-word;word-break:break-word;white-space:normal;">${item.sku}</td>
+            <td style="font-size:7pt;text-align:right;word-wrap:break-word;word-break:break-word;white-space:normal;">${item.quantity * serviceCostPerItem}</td>
+          </tr>
+        `).join('');
+
+    const html = `<!DOCTYPE html>
+<html xmlns:o="urn:schemas-microsoft-com:office:office" xmlns:w="urn:schemas-microsoft-com:office:word">
+<head>
+  <meta charset="UTF-8">
+  <title>Акт оказания услуг</title>
+  <!--[if gte mso 9]>
+  <xml>
+    <w:WordDocument>
+      <w:View>Print</w:View>
+      <w:Zoom>100</w:Zoom>
+    </w:WordDocument>
+  </xml>
+  <![endif]-->
+  <style>
+    @page { size: A4; margin: 2cm 1.5cm 2cm 2cm; }
+    body { font-family: Verdana, Arial, sans-serif; font-size: 11pt; line-height: 1.3; margin: 0; padding: 0; }
+    .right-text { text-align: right; }
+    .center-text { text-align: center; }
+    .bold { font-weight: bold; }
+    p { margin: 4px 0; text-align: justify; }
+    td, th { word-wrap: break-word; word-break: break-word; overflow-wrap: break-word; white-space: normal; vertical-align: top; }
+  </style>
+</head>
+<body>
+  <h2 class="center-text">АКТ ОКАЗАНИЯ УСЛУГ ОТ ${formatDate(servicesDate)} г.</h2>
+  <br>
+  <p>Индивидуальный предприниматель Гаряев Руслан Асланович, ИНН 910303241077 именуемый в дальнейшем Заказчик с одной стороны и Индивидуальный предприниматель Мирошниченко Михаил Михайлович, ИНН 771994433911, именуемый в дальнейшем Исполнитель с другой стороны, а совместно именуемые Стороны, заключили настоящий акт, о нижеследующем:</p>
+  <br>
+  <p>1. В рамках исполнения договора по оказанию транспортных услуг и услуг Фулфилмента №11/3/24 от 11.03.2024 г. Исполнитель за период с ${periodDates.start} по ${periodDates.end}, согласно сборочным заданиям, поставил на маркетплейс Wildberries следующие товары:</p>
+  <br>
+  <table width="104%" border="1" cellpadding="1" cellspacing="0" align="center" style="border-collapse: collapse; table-layout: fixed; margin: 10px auto;">
+    <tr>
+      <th width="3%" rowspan="2" style="background-color:#f0f0f0;font-size:7pt;text-align:center;word-wrap:break-word;">№</th>
+      <th colspan="6" style="background-color:#f0f0f0;font-size:7pt;text-align:center;">Товар</th>
+      <th width="8%" rowspan="2" style="background-color:#f0f0f0;font-size:7pt;text-align:center;word-wrap:break-word;">Стоимость услуг</th>
+    </tr>
+    <tr>
+      <th width="29%" style="background-color:#f0f0f0;font-size:7pt;text-align:center;word-wrap:break-word;">Наименование</th>
+      <th width="5%" style="background-color:#f0f0f0;font-size:7pt;text-align:center;word-wrap:break-word;">Кол-во</th>
+      <th width="13%" style="background-color:#f0f0f0;font-size:7pt;text-align:center;word-wrap:break-word;">Бренд</th>
+      <th width="14%" style="background-color:#f0f0f0;font-size:7pt;text-align:center;word-wrap:break-word;">Артикул</th>
+      <th width="14%" style="background-color:#f0f0f0;font-size:7pt;text-align:center;word-wrap:break-word;">Цвет</th>
+      <th width="14%" style="background-color:#f0f0f0;font-size:7pt;text-align:center;word-wrap:break-word;">SKU</th>
+    </tr>
+    ${tableRows}
+    <tr>
+      <td colspan="7" style="text-align: right;font-size:7pt;"><strong>Итого</strong></td>
+      <td style="text-align: right;font-size:7pt;"><strong>${totalServiceCost}</strong></td>
+    </tr>
+  </table>
+  <br>
+  <p>2. Настоящий акт составлен в двух экземплярах, имеющих одинаковую юридическую силу, по одному для каждой из Сторон.</p>
+  <br>
+  <p>3. Настоящий акт является неотъемлемой частью договора по оказанию транспортных услуг и услуг Фулфилмента №11/3/24 от 11.03.2024 г.</p>
+  <br><br>
+  ${getRequisitesHtmlNew()}
+</body>
+</html>`;
+
+    return html;
+  };
+
+  return { renderAcceptanceAct, renderServicesAct };
+})();
+
+const legacyBytes = (kind, items) => {
+  const html = kind === 'acceptance'
+    ? legacy.renderAcceptanceAct(items, ACT_DATE)
+    : legacy.renderServicesAct(items, ACT_DATE, MONTH);
+  return new TextEncoder().encode(BOM + html);
+};
+
+const compiledBytes = (kind, items) => encodeChunks(renderActChunks(kind, items, ACT_DATE, MONTH), BOM);
+
+const median = (values) => values.slice().sort((a, b) => a - b)[Math.floor(values.length / 2)];
+
+const measure = (render, kind, items, runs) => {
+  const times = [];
+  let bytes;
+  for (let run = 0; run < runs; run++) {
+    const started = process.hrtime.bigint();
+    bytes = render(kind, items);
+    times.push(Number(process.hrtime.bigint() - started) / 1e6);
+  }
+  return { ms: median(times), size: bytes.length, zipped: deflateRawSync(bytes).length };
+};
+
+const sizes = argValue('--skus', '10000').split(',').map(Number);
+const runs = Number(argValue('--runs', 7));
+
+// Прогрев JIT, чтобы первый размер не был завышен
+for (const kind of ['acceptance', 'services']) {
+  legacyBytes(kind, syntheticItems(1000));
+  compiledBytes(kind, syntheticItems(1000));
+}
+
+const kb = (bytes) => (bytes / 1024).toFixed(0);
+console.log('SKU      акт          прежний: мс    КБ  ZIP КБ   макет: мс    КБ  ZIP КБ');
+for (const size of sizes) {
+  const items = syntheticItems(size);
+  for (const kind of ['acceptance', 'services']) {
+    const before = measure(legacyBytes, kind, items, runs);
+    const after = measure(compiledBytes, kind, items, runs);
+    console.log(
+      `${String(size).padEnd(8)} ${kind.padEnd(11)} ` +
+      `${before.ms.toFixed(1).padStart(12)} ${kb(before.size).padStart(5)} ${kb(before.zipped).padStart(7)} ` +
+      `${after.ms.toFixed(1).padStart(11)} ${kb(after.size).padStart(5)} ${kb(after.zipped).padStart(7)}`
+    );
+  }
+}
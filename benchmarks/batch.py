@@ -0,0 +1,61 @@
+"""Бенчмарк пакетной генерации: разбор всех листов и ZIP со всеми актами.
+
+    python3 -m benchmarks.batch                       # 120 000 строк, 12 листов, 1 и N процессов
+    python3 -m benchmarks.batch --workers 1 2 4
+
+Для каждого числа процессов замеряется разбор книги (aggregate_workbook без
+кэша) и сборка архива (iter_month_files -> stream_zip). Ускорение ограничено
+числом ядер машины: на одном ядре пул процессов только добавляет накладные расходы.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+
+from wb_acts.batch import iter_month_files, stream_zip
+from wb_acts.server import aggregate_workbook
+
+from .synthetic import MONTHS, write_workbook
+
+
+def measure(path: str, workers: int) -> dict:
+    started = time.perf_counter()
+    months = aggregate_workbook(path, workers=workers)
+    parsed = time.perf_counter()
+    size = sum(len(chunk) for chunk in stream_zip(iter_month_files(months, workers)))
+    finished = time.perf_counter()
+    return {
+        'parse_seconds': parsed - started,
+        'zip_seconds': finished - parsed,
+        'zip_bytes': size,
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=120_000, help='всего строк в книге')
+    parser.add_argument('--sheets', type=int, default=12, help='число листов (месяцев)')
+    parser.add_argument('--skus', type=int, default=5000, help='уникальных артикулов WB')
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({1, os.cpu_count() or 1}), help='числа процессов')
+    args = parser.parse_args(argv)
+
+    sheets = list(MONTHS[:args.sheets])
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'bench.xlsx')
+        rows = write_workbook(path, args.rows // len(sheets), sheets, args.skus)
+        print(f'Книга: {rows} строк, {len(sheets)} листов, {args.skus} SKU; '
+              f'ядер: {os.cpu_count()}')
+
+        for workers in args.workers:
+            result = measure(path, workers)
+            total = result['parse_seconds'] + result['zip_seconds']
+            print(f'Процессов {workers}: разбор {result["parse_seconds"]:.2f} с, '
+                  f'акты и ZIP {result["zip_seconds"]:.2f} с, всего {total:.2f} с '
+                  f'({rows / total:,.0f} строк/с), архив {result["zip_bytes"] / 1e6:.1f} МБ')
+
+
+if __name__ == '__main__':
+    main()
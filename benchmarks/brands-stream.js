@@ -0,0 +1,78 @@
+// Бенчмарк загрузки таблицы брендов: потоком против чтения всего листа в массив.
+//
+//   node benchmarks/brands-stream.js                    # 100 000 и 1 000 000 строк
+//   node benchmarks/brands-stream.js --rows 3000000
+//
+// Таблица генерируется benchmarks/synthetic.py. Каждый способ запускается в
+// отдельном процессе, чтобы пиковая память (maxRSS) не смешивалась:
+//   stream — loadBrandsTable: файл читается кусками, строки сразу идут в каталог;
+//   array  — файл целиком в памяти и массив всех строк, как прежние
+//            XLSX.read + sheet_to_json({ header: 1 }) (сам SheetJS держит ещё и книгу).
+import { execFileSync } from 'child_process';
+import { mkdtempSync, openAsBlob, readFileSync, rmSync, statSync } from 'fs';
+import { tmpdir } from 'os';
+import { join } from 'path';
+import { fileURLToPath } from 'url';
+
+// js/*.js — обычные скрипты для страницы: подключаем их после объявления self
+globalThis.self = globalThis;
+await import('../js/xlsx-stream.js');
+await import('../js/brands.js');
+
+const { BrandsTableReader, XlsxStreamReader, loadBrandsTable } = self.WbActs;
+
+const argValue = (name, fallback) => {
+  const index = process.argv.indexOf(name);
+  return index >= 0 ? process.argv[index + 1] : fallback;
+};
+
+const runMode = async (mode, path) => {
+  const started = performance.now();
+  let resolver;
+  if (mode === 'stream') {
+    resolver = await loadBrandsTable(await openAsBlob(path));
+  } else {
+    const xlsx = await XlsxStreamReader.open(new Blob([readFileSync(path)]));
+    const rows = [];
+    for await (const batch of xlsx.rowBatches()) rows.push(...batch);
+    const table = new BrandsTableReader();
+    table.push(rows);
+    resolver = table.build();
+  }
+  const ms = performance.now() - started;
+  // Последней строкой вывода — результат для родительского процесса
+  console.log(JSON.stringify({ ms, loaded: resolver.loaded, maxRss: process.resourceUsage().maxRSS * 1024 }));
+};
+
+const mode = argValue('--mode', null);
+if (mode) {
+  await runMode(mode, argValue('--file'));
+} else {
+  const sizes = argValue('--rows', '100000,1000000').split(',').map(Number);
+  const root = fileURLToPath(new URL('..', import.meta.url));
+  const script = fileURLToPath(import.meta.url);
+  const workdir = mkdtempSync(join(tmpdir(), 'brands-'));
+  try {
+    console.log('Строк       XLSX, МБ   способ   время, с   строк/с     пик RSS, МБ');
+    for (const rows of sizes) {
+      const path = join(workdir, `brands-${rows}.xlsx`);
+      execFileSync('python3', ['-c',
+        `from benchmarks.synthetic import write_brands_workbook; write_brands_workbook(${JSON.stringify(path)}, ${rows})`
+      ], { cwd: root });
+      const size = statSync(path).size / 1e6;
+      for (const runAs of ['stream', 'array']) {
+        const output = execFileSync(process.execPath, [script, '--mode', runAs, '--file', path], {
+          encoding: 'utf8', maxBuffer: 1 << 20
+        });
+        const result = JSON.parse(output.trim().split('\n').pop());
+        console.log(
+          `${String(rows).padEnd(11)} ${size.toFixed(1).padStart(8)}   ${runAs.padEnd(6)} ` +
+          `${(result.ms / 1000).toFixed(2).padStart(10)} ${Math.round(rows / result.ms * 1000).toString().padStart(9)} ` +
+          `${(result.maxRss / 1e6).toFixed(0).padStart(15)}`
+        );
+      }
+    }
+  } finally {
+    rmSync(workdir, { recursive: true, force: true });
+  }
+}
@@ -0,0 +1,55 @@
+"""Бенчмарк каталога брендов: разбор XLSX против загрузки скомпилированного файла.
+
+    python3 -m benchmarks.brands                 # таблица на 1 000 000 строк
+    python3 -m benchmarks.brands --rows 100000
+
+Сравниваются: чтение таблицы брендов из XLSX со сборкой BrandResolver,
+сохранение каталога (JSON + gzip) и его загрузка, а также скорость resolve().
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+
+from wb_acts.brands import BrandResolver, load_brands
+
+from .synthetic import write_brands_workbook
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000, help='строк в таблице брендов')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        xlsx_path = os.path.join(workdir, 'brands.xlsx')
+        write_brands_workbook(xlsx_path, args.rows)
+        print(f'Таблица брендов: {args.rows} строк, XLSX {os.path.getsize(xlsx_path) / 1e6:.1f} МБ')
+
+        started = time.perf_counter()
+        resolver = load_brands(xlsx_path)
+        parsed = time.perf_counter() - started
+        print(f'Разбор XLSX и сборка:   {parsed:.2f} с ({resolver.loaded} артикулов)')
+
+        started = time.perf_counter()
+        payload = resolver.dumps()
+        print(f'Сохранение каталога:    {time.perf_counter() - started:.2f} с, '
+              f'{len(payload) / 1e6:.1f} МБ')
+
+        started = time.perf_counter()
+        loaded = BrandResolver.loads(payload)
+        restored = time.perf_counter() - started
+        print(f'Загрузка каталога:      {restored:.2f} с ({parsed / restored:.1f}× быстрее XLSX)')
+
+        skus = [str(200000000 + index * 7) for index in range(0, args.rows, 7)]
+        started = time.perf_counter()
+        for sku in skus:
+            loaded.resolve(sku, 'Март 24')
+        elapsed = time.perf_counter() - started
+        print(f'resolve():              {len(skus) / elapsed:,.0f} артикулов/с')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+// Бенчмарк форматов акта в браузерном коде: .docx (js/docx.js) против HTML-.doc.
+//
+//   node benchmarks/docx.js                       # 1 000, 10 000 и 50 000 SKU
+//   node benchmarks/docx.js --skus 10000 --runs 3
+//
+// Время — медиана по --runs запускам, от позиций до готовых байт файла.
+// Время открытия в LibreOffice — python3 -m benchmarks.docx.
+
+import { syntheticItems } from './synthetic.js';
+
+// js/*.js — обычные скрипты для страницы: подключаем их после объявления self
+globalThis.self = globalThis;
+await import('../js/acts.js');
+await import('../js/act-templates.js');
+await import('../js/zip.js');
+await import('../js/docx.js');
+
+const { renderActChunks, renderDocx, encodeChunks } = self.WbActs;
+
+const BOM = '\uFEFF';
+const MONTH = 'Январь 24';
+const ACT_DATE = '2024-01-31';
+
+const argValue = (name, fallback) => {
+  const index = process.argv.indexOf(name);
+  return index >= 0 ? process.argv[index + 1] : fallback;
+};
+
+const FORMATS = {
+  docx: (kind, items) => renderDocx(kind, items, ACT_DATE, MONTH),
+  doc: async (kind, items) => encodeChunks(renderActChunks(kind, items, ACT_DATE, MONTH), BOM)
+};
+
+const median = (values) => values.slice().sort((a, b) => a - b)[Math.floor(values.length / 2)];
+
+const sizes = argValue('--skus', '1000,10000,50000').split(',').map(Number);
+const runs = Number(argValue('--runs', 5));
+
+// Прогрев JIT, чтобы первый размер не был завышен
+for (const render of Object.values(FORMATS)) await render('acceptance', syntheticItems(1000));
+
+console.log('SKU      акт          формат  генерация, мс   размер, КБ');
+for (const size of sizes) {
+  const items = syntheticItems(size);
+  for (const kind of ['acceptance', 'services']) {
+    for (const [format, render] of Object.entries(FORMATS)) {
+      const times = [];
+      let bytes;
+      for (let run = 0; run < runs; run++) {
+        const started = process.hrtime.bigint();
+        bytes = await render(kind, items);
+        times.push(Number(process.hrtime.bigint() - started) / 1e6);
+      }
+      console.log(
+        `${String(size).padEnd(8)} ${kind.padEnd(12)} ${format.padEnd(7)} ` +
+        `${median(times).toFixed(1).padStart(13)} ${(bytes.length / 1024).toFixed(0).padStart(12)}`
+      );
+    }
+  }
+}
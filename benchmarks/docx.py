@@ -0,0 +1,98 @@
+"""Бенчмарк форматов акта: .docx (wb_acts.docx) против HTML-.doc (wb_acts.render).
+
+    python3 -m benchmarks.docx                        # 1 000, 10 000 и 50 000 SKU
+    python3 -m benchmarks.docx --skus 10000 --runs 3
+
+Для каждого акта замеряется генерация (медиана по --runs запускам, от позиций до
+готовых байт) и размер файла. Если установлен LibreOffice (soffice), замеряется
+и открытие: soffice --headless --convert-to pdf — загрузка, разбивка на страницы
+и экспорт, то есть та же работа, что при открытии документа в редакторе.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+from typing import List, Optional
+
+from wb_acts.aggregate import Item
+from wb_acts.docx import ACT_FORMATS
+from wb_acts.render import ACT_TITLES, default_act_date
+
+from .synthetic import MONTHS, catalogue
+
+MONTH = MONTHS[0]
+
+
+def synthetic_items(skus: int) -> List[Item]:
+    items = []
+    for index, product in enumerate(catalogue(skus)):
+        quantity = 1 + index % 7
+        items.append(Item(
+            name=product['name'], quantity=quantity, brand=('Lithium', 'Magnet', '—')[index % 3],
+            color=product['color'], sku=product['sku'], seller_article=product['seller'],
+            price=product['price'] * 0.65, total_price=quantity * product['price'] * 0.65,
+        ))
+    return items
+
+
+def find_soffice() -> Optional[str]:
+    return shutil.which('soffice') or shutil.which('libreoffice')
+
+
+def open_seconds(soffice: str, path: str, workdir: str) -> float:
+    # Отдельный профиль: первый запуск LibreOffice создаёт его и сильно дольше обычного
+    profile = f'-env:UserInstallation=file://{os.path.join(workdir, "profile")}'
+    started = time.perf_counter()
+    subprocess.run([soffice, profile, '--headless', '--convert-to', 'pdf', '--outdir',
+                    os.path.join(workdir, 'pdf'), path],
+                   check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - started
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--skus', type=int, nargs='+', default=[1000, 10_000, 50_000],
+                        help='позиций в акте')
+    parser.add_argument('--runs', type=int, default=5, help='запусков генерации')
+    args = parser.parse_args(argv)
+
+    soffice = find_soffice()
+    if soffice is None:
+        print('LibreOffice (soffice) не найден — время открытия не измеряется')
+    act_date = default_act_date(MONTH)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        # Прогрев LibreOffice: профиль создаётся при первом запуске
+        if soffice:
+            warmup = os.path.join(workdir, 'warmup.docx')
+            with open(warmup, 'wb') as target:
+                target.write(ACT_FORMATS['docx'][1]('acceptance', synthetic_items(10), MONTH, act_date))
+            open_seconds(soffice, warmup, workdir)
+
+        print('SKU      акт          формат  генерация, мс   размер, КБ   открытие, с')
+        for skus in args.skus:
+            items = synthetic_items(skus)
+            for kind in ACT_TITLES:
+                for file_format, (_, render) in ACT_FORMATS.items():
+                    times = []
+                    for _ in range(args.runs):
+                        started = time.perf_counter()
+                        body = render(kind, items, MONTH, act_date)
+                        times.append((time.perf_counter() - started) * 1000)
+                    opened = '—'
+                    if soffice:
+                        path = os.path.join(workdir, f'{kind}-{skus}.{file_format}')
+                        with open(path, 'wb') as target:
+                            target.write(body)
+                        opened = f'{open_seconds(soffice, path, workdir):.2f}'
+                    print(f'{skus:<8} {kind:<12} {file_format:<7} {statistics.median(times):13.1f} '
+                          f'{len(body) / 1024:12.0f} {opened:>13}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""Набор бенчмарков конвейера (wb_acts.pipeline) на синтетических выгрузках WB.
+
+    python3 -m benchmarks.pipeline                          # 1k…1M строк × 100, 5 000 и 50 000 SKU
+    python3 -m benchmarks.pipeline --quick                  # до 100 000 строк
+    python3 -m benchmarks.pipeline --rows 10000 --skus 100 5000 --no-record
+
+Каждый прогон — отдельный процесс (python3 -m wb_acts.pipeline --json -), чтобы
+пиковый RSS не смешивался между размерами. Сочетания, где SKU больше строк,
+пропускаются: все артикулы и так уникальны.
+
+Результаты дописываются в benchmarks/results/pipeline.jsonl (локально, вне git):
+версия, дата, машина, параметры и время по этапам. Таблица сравнивает каждый прогон с последней записью
+предыдущей версии для тех же параметров на той же машине — замедление видно сразу.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from wb_acts import __version__
+
+from .synthetic import MONTHS, write_workbook
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS = os.path.join(ROOT, 'benchmarks', 'results', 'pipeline.jsonl')
+
+ROWS = (1000, 10_000, 100_000, 1_000_000)
+QUICK_ROWS = (1000, 10_000, 100_000)
+SKUS = (100, 5000, 50_000)
+
+Params = Tuple[int, int, int, str]
+
+
+def machine() -> str:
+    return f'{platform.node()} {platform.machine()} {os.cpu_count()} CPU, Python {platform.python_version()}'
+
+
+def _params(record: dict) -> Params:
+    return record['rows'], record['skus'], record['sheets'], record['format']
+
+
+def load_results(path: str) -> List[dict]:
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as source:
+        return [json.loads(line) for line in source if line.strip()]
+
+
+def baselines(results: List[dict], host: str) -> Dict[Params, dict]:
+    """Последняя запись предыдущих версий для каждого набора параметров."""
+    found: Dict[Params, dict] = {}
+    for record in results:
+        if record['machine'] == host and record['version'] != __version__:
+            found[_params(record)] = record
+    return found
+
+
+def run_once(rows: int, skus: int, sheets: int, file_format: str, workdir: str) -> dict:
+    path = os.path.join(workdir, f'wb-{rows}-{skus}.xlsx')
+    names = [MONTHS[index % len(MONTHS)] + ('' if index < len(MONTHS) else f' ({index})')
+             for index in range(sheets)]
+    write_workbook(path, max(1, rows // sheets), names, skus)
+    output = subprocess.run(
+        [sys.executable, '-m', 'wb_acts.pipeline', path, '--format', file_format,
+         '-o', os.path.join(workdir, 'acts.zip'), '--json', '-'],
+        check=True, capture_output=True, text=True, cwd=ROOT)
+    os.unlink(path)
+    return json.loads(output.stdout)
+
+
+def _change(seconds: float, baseline: Optional[dict]) -> str:
+    if baseline is None:
+        return '—'
+    previous = baseline['report']['seconds']
+    return f'{(seconds / previous - 1) * 100:+.0f}% к {baseline["version"]}'
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=None,
+                        help=f'строк в книге (по умолчанию {", ".join(map(str, ROWS))})')
+    parser.add_argument('--skus', type=int, nargs='+', default=list(SKUS), help='уникальных артикулов WB')
+    parser.add_argument('--sheets', type=int, default=12, help='листов (месяцев) в книге')
+    parser.add_argument('--format', default='docx', help='формат актов')
+    parser.add_argument('--quick', action='store_true', help='без миллиона строк')
+    parser.add_argument('--results', default=RESULTS, help='куда дописывать результаты (JSON Lines)')
+    parser.add_argument('--no-record', action='store_true', help='не записывать результаты')
+    args = parser.parse_args(argv)
+
+    sizes = args.rows or (QUICK_ROWS if args.quick else ROWS)
+    host = machine()
+    previous = baselines(load_results(args.results), host)
+    print(f'wb_acts {__version__}; {host}')
+    print(f'{"строк":>9} {"SKU":>7} {"время, с":>9} {"строк/с":>10} {"пик RSS, МБ":>12} '
+          f'{"разбор":>7} {"рендер":>7}  изменение')
+
+    records = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in sizes:
+            for skus in args.skus:
+                if skus > rows:
+                    continue
+                started = time.perf_counter()
+                report = run_once(rows, skus, args.sheets, args.format, workdir)
+                stages = report['stages']
+                record = {
+                    'version': __version__,
+                    'recorded': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                    'machine': host,
+                    'rows': rows, 'skus': skus, 'sheets': args.sheets, 'format': args.format,
+                    'report': {key: report[key] for key in ('seconds', 'rows_per_second', 'peak_rss', 'items')},
+                    'stages': {stage: {'seconds': stats['seconds'], 'rate': stats['rate']}
+                               for stage, stats in stages.items()},
+                }
+                records.append(record)
+                share = {stage: stages[stage]['seconds'] / report['seconds'] * 100
+                         for stage in ('parse', 'render')}
+                print(f'{rows:>9} {skus:>7} {report["seconds"]:>9.2f} {report["rows_per_second"]:>10,.0f} '
+                      f'{report["peak_rss"] / 1e6:>12.1f} {share["parse"]:>6.0f}% {share["render"]:>6.0f}%  '
+                      f'{_change(report["seconds"], previous.get(_params(record)))}'
+                      f'   (с генерацией {time.perf_counter() - started:.0f} с)')
+
+    if not args.no_record and records:
+        os.makedirs(os.path.dirname(args.results), exist_ok=True)
+        with open(args.results, 'a', encoding='utf-8') as target:
+            for record in records:
+                target.write(json.dumps(record, ensure_ascii=False) + '\n')
+        print(f'Записано прогонов: {len(records)} -> {os.path.relpath(args.results)}')
+
+
+if __name__ == '__main__':
+    main()
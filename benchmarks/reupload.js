@@ -0,0 +1,76 @@
+// Бенчмарк отпечатков листов в браузерном коде (js/workbook-diff.js).
+//
+//   node benchmarks/reupload.js                        # 24 листа по 20 000 строк
+//   node benchmarks/reupload.js --sheets 12 --rows 50000
+//
+// Книга и её «исправленная» копия (один лист изменён) генерируются
+// benchmarks/synthetic.py — в двух случаях, как в benchmarks/reupload.py: правка
+// только из существующих строк и правка с новой общей строкой. Первая загрузка
+// читает потоком все листы, повторная — только те, что не узнались ни по
+// отпечатку из каталога ZIP, ни по XML листа с нужными ему общими строками.
+// Разбор SheetJS и агрегация в Node не запускаются: их стоят только листы с
+// новым содержимым.
+import { execFileSync } from 'child_process';
+import { mkdtempSync, openAsBlob, rmSync } from 'fs';
+import { tmpdir } from 'os';
+import { join } from 'path';
+import { fileURLToPath } from 'url';
+
+// js/*.js — обычные скрипты для страницы: подключаем их после объявления self
+globalThis.self = globalThis;
+await import('../js/items-cache.js');
+await import('../js/xlsx-stream.js');
+await import('../js/workbook-diff.js');
+
+const { ItemsCache, XlsxStreamReader, fingerprintSheets, compareSheets } = self.WbActs;
+
+const argValue = (name, fallback) => {
+  const index = process.argv.indexOf(name);
+  return index >= 0 ? process.argv[index + 1] : fallback;
+};
+
+const sheets = Number(argValue('--sheets', 24));
+const rows = Number(argValue('--rows', 20000));
+const root = fileURLToPath(new URL('..', import.meta.url));
+const workdir = mkdtempSync(join(tmpdir(), 'reupload-'));
+
+const fingerprint = async (path, cache) => {
+  const started = performance.now();
+  const reader = await XlsxStreamReader.open(await openAsBlob(path));
+  const result = await fingerprintSheets(reader, cache);
+  return { ...result, ms: performance.now() - started };
+};
+
+// [новая общая строка в правке, подпись]
+const cases = [
+  [false, 'правка из существующих строк'],
+  [true, 'правка с новой общей строкой']
+];
+
+try {
+  for (const [newStrings, title] of cases) {
+    const original = join(workdir, 'original.xlsx');
+    const fixed = join(workdir, 'fixed.xlsx');
+    const flag = newStrings ? 'True' : 'False';
+    execFileSync('python3', ['-c', [
+      'from benchmarks.reupload import sheet_names',
+      'from benchmarks.synthetic import write_workbook',
+      `names = sheet_names(${sheets})`,
+      `write_workbook(${JSON.stringify(original)}, ${rows}, names, new_strings=${flag})`,
+      `write_workbook(${JSON.stringify(fixed)}, ${rows}, names, edited=[names[len(names) // 2]], new_strings=${flag})`
+    ].join('\n')], { cwd: root });
+
+    // Кэш в памяти: IndexedDB в Node нет, отпечатки живут в ItemsCache.fingerprints
+    const cache = new ItemsCache();
+    const first = await fingerprint(original, cache);
+    const again = await fingerprint(fixed, cache);
+    const diff = compareSheets(first.keys, again.keys);
+
+    console.log(`Книга: ${sheets * rows} строк, ${sheets} листов, ${title}`);
+    console.log(`  Первая загрузка:   ${first.ms.toFixed(0).padStart(7)} мс, прочитано листов ${first.scanned.length}`);
+    console.log(`  Исправленная:      ${again.ms.toFixed(0).padStart(7)} мс, прочитано листов ${again.scanned.length}`);
+    console.log(`  Изменены: ${diff.changed.join(', ') || '—'}; без изменений: ${diff.unchanged}`);
+  }
+} finally {
+  rmSync(workdir, { recursive: true, force: true });
+}
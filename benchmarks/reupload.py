@@ -0,0 +1,106 @@
+"""Бенчмарк повторной загрузки исправленной выгрузки: правка одного месяца.
+
+    python3 -m benchmarks.reupload                  # 24 листа по 20 000 строк
+    python3 -m benchmarks.reupload --sheets 12 --rows-per-sheet 50000
+
+Книга загружается в POST /upload, затем загружается та же книга с одним
+исправленным листом (cookie прежней загрузки — как из браузера). Для сравнения
+исправленная книга загружается и в пустой кэш. Два случая правки:
+
+  - только существующие строки — sharedStrings.xml прежний, отпечатки из
+    каталога ZIP у нетронутых листов совпадают;
+  - с новой строкой — sharedStrings.xml меняется у всей книги, нетронутые листы
+    узнаются по своему XML и тем общим строкам, на которые они ссылаются.
+
+Ожидаемо в обоих: повторная загрузка стоит разбора одного листа плюс чтения
+общих строк, а ответ содержит разницу только по изменённому месяцу. Если Excel
+перенумеровал общие строки (XML нетронутых листов тоже изменился), листы
+разбираются заново — этот случай бенчмарк не моделирует.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from wb_acts.cache import ItemsCache
+from wb_acts.server import COOKIE_NAME, ActsApp
+
+from .synthetic import MONTHS, write_workbook
+from .upload import _write_multipart
+
+BOUNDARY = 'benchboundary'
+
+# (новая общая строка в правке, подпись)
+CASES = (
+    (False, 'правка из существующих строк'),
+    (True, 'правка с новой общей строкой'),
+)
+
+
+def sheet_names(count: int) -> list:
+    # Год по порядку: Январь 24 ... Декабрь 24, Январь 25 ...
+    return [f'{MONTHS[index % 12].split()[0]} {24 + index // 12}' for index in range(count)]
+
+
+def upload(app: ActsApp, path: str, previous: str = '') -> tuple:
+    with tempfile.TemporaryFile() as spool:
+        _write_multipart(spool, path, BOUNDARY)
+        length = spool.tell()
+        spool.seek(0)
+        environ = {
+            'REQUEST_METHOD': 'POST',
+            'PATH_INFO': '/upload',
+            'CONTENT_TYPE': f'multipart/form-data; boundary={BOUNDARY}',
+            'CONTENT_LENGTH': str(length),
+            'HTTP_COOKIE': f'{COOKIE_NAME}={previous}' if previous else '',
+            'wsgi.input': spool,
+        }
+        started = time.perf_counter()
+        response = json.loads(b''.join(app(environ, lambda status, headers: None)))
+        return time.perf_counter() - started, response
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sheets', type=int, default=24, help='листов (месяцев) в книге')
+    parser.add_argument('--rows-per-sheet', type=int, default=20_000, help='строк на листе')
+    parser.add_argument('--skus', type=int, default=5000, help='уникальных артикулов WB')
+    parser.add_argument('--edit', type=int, default=None,
+                        help='номер исправляемого листа с 1 (по умолчанию — средний)')
+    parser.add_argument('--workers', type=int, default=1, help='процессов для разбора листов')
+    args = parser.parse_args(argv)
+
+    sheets = sheet_names(args.sheets)
+    edited = sheets[(args.edit or args.sheets // 2 + 1) - 1]
+    for new_strings, title in CASES:
+        with tempfile.TemporaryDirectory() as workdir:
+            original = os.path.join(workdir, 'original.xlsx')
+            fixed = os.path.join(workdir, 'fixed.xlsx')
+            rows = write_workbook(original, args.rows_per_sheet, sheets, args.skus,
+                                  new_strings=new_strings)
+            write_workbook(fixed, args.rows_per_sheet, sheets, args.skus, edited=[edited],
+                           new_strings=new_strings)
+            print(f'Книга: {rows} строк, {args.sheets} листов, исправлен лист «{edited}», {title}')
+
+            app = ActsApp(ItemsCache(os.path.join(workdir, 'cache')), workers=args.workers)
+            first, response = upload(app, original)
+            again, response = upload(app, fixed, previous=response['upload_id'])
+            cold, _ = upload(ActsApp(ItemsCache(os.path.join(workdir, 'cold')), workers=args.workers),
+                             fixed)
+
+        diff = response['diff']
+        print(f'  Первая загрузка:               {first:7.2f} с ({first / args.sheets:.2f} с на лист)')
+        print(f'  Исправленная, тот же кэш:      {again:7.2f} с ({again / (first / args.sheets):.1f} листа)')
+        print(f'  Исправленная, пустой кэш:      {cold:7.2f} с')
+        print(f'  Разница: без изменений {diff["unchanged"]}, изменено {len(diff["changed"])}')
+        for month in diff['changed']:
+            print(f'    {month["month"]}: +{len(month["added"])} / −{len(month["removed"])} SKU, '
+                  f'изменено {len(month["changed"])}, количество {month["quantity"]:+d}, '
+                  f'сумма {month["totalPrice"]:+,.2f} ₽')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+// Бенчмарк проверки артикулов продавца: прежний попарный обход против SellerArticleIndex.
+//
+//   node benchmarks/seller-articles.js                  # 1 000 … 50 000 SKU
+//   node benchmarks/seller-articles.js --legacy-max 50000
+//   node benchmarks/seller-articles.js --sizes 1000,100000
+//
+// На каждом размере ~1% артикулов продавца повторяется у двух SKU. Прежний
+// алгоритм квадратичный, поэтому по умолчанию замеряется только до 20 000 SKU.
+import { syntheticItems } from './synthetic.js';
+
+// js/acts.js — обычный скрипт для страницы: подключаем его после объявления self
+globalThis.self = globalThis;
+await import('../js/acts.js');
+
+const { SellerArticleIndex } = self.WbActs;
+
+const SIZES = [1000, 5000, 10000, 25000, 50000];
+
+const argValue = (name, fallback) => {
+  const index = process.argv.indexOf(name);
+  return index >= 0 ? Number(process.argv[index + 1]) : fallback;
+};
+
+// Каждый сотый SKU получает артикул продавца предыдущего — конфликт
+const conflictingItems = (count) => syntheticItems(count, { sellerConflictEvery: 100 });
+
+// Прежняя validateSellerArticles без confirm(): filter по всем позициям на каждую позицию
+const legacyInconsistencies = (items) => {
+  const inconsistencies = [];
+  items.forEach(item => {
+    if (item.sellerArticle) {
+      const duplicates = items.filter(i =>
+        i.sellerArticle === item.sellerArticle && i.sku !== item.sku
+      );
+      if (duplicates.length > 0) {
+        const skus = [item.sku, ...duplicates.map(d => d.sku)].join(', ');
+        if (!inconsistencies.some(inc => inc.sellerArticle === item.sellerArticle)) {
+          inconsistencies.push({ sellerArticle: item.sellerArticle, skus });
+        }
+      }
+    }
+  });
+  return inconsistencies;
+};
+
+const time = (fn) => {
+  const started = process.hrtime.bigint();
+  const result = fn();
+  return { ms: Number(process.hrtime.bigint() - started) / 1e6, result };
+};
+
+const legacyMax = argValue('--legacy-max', 20000);
+const sizes = process.argv.includes('--sizes')
+  ? process.argv[process.argv.indexOf('--sizes') + 1].split(',').map(Number)
+  : SIZES;
+
+// Прогрев JIT, чтобы первый размер не был завышен
+new SellerArticleIndex().add(conflictingItems(1000)).conflicts();
+
+console.log('SKU       индекс, мс   мкс/SKU   конфликтов   попарно, мс');
+for (const size of sizes) {
+  const items = conflictingItems(size);
+  const indexed = time(() => new SellerArticleIndex().add(items).conflicts());
+  let legacy = '—';
+  if (size <= legacyMax) {
+    const run = time(() => legacyInconsistencies(items));
+    if (run.result.length !== indexed.result.length) {
+      throw new Error(`Разное число конфликтов: ${run.result.length} и ${indexed.result.length}`);
+    }
+    legacy = run.ms.toFixed(1);
+  }
+  console.log(
+    `${String(size).padEnd(9)} ${indexed.ms.toFixed(1).padStart(10)} ` +
+    `${(indexed.ms * 1000 / size).toFixed(2).padStart(9)} ` +
+    `${String(indexed.result.length).padStart(12)} ${legacy.padStart(13)}`
+  );
+}
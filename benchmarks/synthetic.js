@@ -0,0 +1,27 @@
+// Синтетические позиции актов для JS-бенчмарков — общий генератор, как
+// benchmarks/synthetic.py для Python-бенчмарков.
+//
+// Позиции — как после extractItemsData: артикулы WB те же, что в
+// synthetic.catalogue(), длинные наименования, три бренда и цвета.
+
+/**
+ * count позиций; sellerConflictEvery — каждая такая позиция получает артикул
+ * продавца предыдущей (конфликт для SellerArticleIndex), 0 — без конфликтов.
+ */
+export const syntheticItems = (count, { sellerConflictEvery = 0 } = {}) => {
+  const items = [];
+  for (let i = 0; i < count; i++) {
+    const quantity = 1 + (i % 7);
+    const article = sellerConflictEvery && i % sellerConflictEvery === sellerConflictEvery - 1 ? i - 1 : i;
+    items.push({
+      sku: String(200000000 + i * 7),
+      name: `Аккумуляторная дрель-шуруповёрт, модель ${i % 300}, комплект ${i % 5 + 1}`,
+      quantity,
+      brand: ['Lithium', 'Magnet', '—'][i % 3],
+      sellerArticle: `ART-${article}`,
+      color: ['чёрный', 'синий', 'зелёный'][i % 3],
+      totalPrice: quantity * (1234.5 + i % 100) * 0.65
+    });
+  }
+  return items;
+};
@@ -0,0 +1,233 @@
+"""Синтетические выгрузки WB для бенчмарков.
+
+Книга пишется потоково (zipfile.open(..., 'w')), поэтому даже миллион строк
+генерируется без заметного расхода памяти. Формат — как у настоящей выгрузки:
+общие строки (sharedStrings.xml), артикулы WB хранятся текстом.
+"""
+from __future__ import annotations
+
+import random
+import zipfile
+from typing import Dict, List, Sequence
+from xml.sax.saxutils import escape
+
+MONTHS = (
+    'Январь 24', 'Февраль 24', 'Март 24', 'Апрель 24', 'Май 24', 'Июнь 24',
+    'Июль 24', 'Август 24', 'Сентябрь 24', 'Октябрь 24', 'Ноябрь 24', 'Декабрь 24',
+)
+
+HEADERS = (
+    'Номер задания', 'Статус задания', 'Артикул Wildberries', 'Наименование',
+    'Стоимость', 'Цвет', 'Артикул продавца', 'Склад',
+)
+
+STATUSES = ('Продано',) * 8 + ('Отменено', 'Возврат')
+COLORS = ('черный', 'синий', 'красный', 'зеленый', 'белый', 'серый')
+WAREHOUSES = ('Коледино', 'Подольск', 'Электросталь', 'Казань')
+
+_CONTENT_TYPES = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>
+<Override PartName="/xl/sharedStrings.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>
+{sheets}
+</Types>'''
+
+_ROOT_RELS = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>
+</Relationships>'''
+
+_SHEET_HEAD = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+               '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+               '<sheetData>')
+_SHEET_TAIL = '</sheetData></worksheet>'
+
+
+def _column(index: int) -> str:
+    name = ''
+    index += 1
+    while index:
+        index, rest = divmod(index - 1, 26)
+        name = chr(65 + rest) + name
+    return name
+
+
+class _SharedStrings:
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self.count = 0
+
+    def __call__(self, text: str) -> int:
+        self.count += 1
+        position = self.index.get(text)
+        if position is None:
+            position = self.index[text] = len(self.index)
+        return position
+
+    def xml(self) -> str:
+        items = ''.join(f'<si><t>{escape(text)}</t></si>' for text in self.index)
+        return ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+                f'count="{self.count}" uniqueCount="{len(self.index)}">{items}</sst>')
+
+
+def catalogue(skus: int, seed: int = 1) -> List[dict]:
+    """Справочник товаров: артикул WB, наименование, цвет, артикул продавца, цена."""
+    rng = random.Random(seed)
+    return [{
+        'sku': str(200000000 + index * 7),
+        'name': f'Товар {index} {rng.choice(("аккумулятор", "дрель", "зарядное устройство", "шуруповерт"))}',
+        'color': rng.choice(COLORS),
+        'seller': f'ART-{index:06d}',
+        'price': rng.randrange(300, 25000),
+    } for index in range(skus)]
+
+
+def _finish_workbook(archive: zipfile.ZipFile, sheets: Sequence[str],
+                     strings: _SharedStrings) -> None:
+    """workbook.xml, связи, общие строки и [Content_Types].xml для листов sheet1..N."""
+    sheet_entries = ''.join(
+        f'<sheet name="{escape(name)}" sheetId="{number}" r:id="rId{number}"/>'
+        for number, name in enumerate(sheets, 1))
+    archive.writestr('xl/workbook.xml', (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        f'<sheets>{sheet_entries}</sheets></workbook>'))
+
+    rels = ''.join(
+        f'<Relationship Id="rId{number}" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        f'Target="worksheets/sheet{number}.xml"/>'
+        for number in range(1, len(sheets) + 1))
+    shared_id = len(sheets) + 1
+    archive.writestr('xl/_rels/workbook.xml.rels', (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        f'{rels}<Relationship Id="rId{shared_id}" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings" '
+        'Target="sharedStrings.xml"/></Relationships>'))
+
+    archive.writestr('xl/sharedStrings.xml', strings.xml())
+    archive.writestr('_rels/.rels', _ROOT_RELS)
+    overrides = '\n'.join(
+        f'<Override PartName="/xl/worksheets/sheet{number}.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        for number in range(1, len(sheets) + 1))
+    archive.writestr('[Content_Types].xml', _CONTENT_TYPES.format(sheets=overrides))
+
+
+NEW_COLOR = 'цвет уточнён'
+
+
+def write_workbook(path: str, rows_per_sheet: int, sheets: Sequence[str] = MONTHS[:1],
+                   skus: int = 5000, seed: int = 1, edited: Sequence[str] = (),
+                   new_strings: bool = False) -> int:
+    """Пишет книгу и возвращает общее число строк данных.
+
+    edited — листы «исправленной выгрузки»: каждая 50-я строка становится
+    возвратом, каждая 97-я дорожает на 100 ₽; остальные листы те же, что без правки.
+    new_strings — общие строки идут в порядке справочника, а не первого
+    появления, и правка вдобавок меняет цвет каждой 61-й строки на NEW_COLOR:
+    новая строка дописывается в конец sharedStrings.xml, XML прочих листов прежний.
+    """
+    rng = random.Random(seed)
+    products = catalogue(skus, seed)
+    strings = _SharedStrings()
+    if new_strings:
+        for text in HEADERS + STATUSES + COLORS + WAREHOUSES:
+            strings(text)
+        for product in products:
+            strings(product['sku'])
+            strings(product['name'])
+            strings(product['seller'])
+        strings.count = 0
+    total = 0
+
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as archive:
+        for number, sheet in enumerate(sheets, 1):
+            edit = sheet in edited
+            with archive.open(f'xl/worksheets/sheet{number}.xml', 'w') as stream:
+                stream.write(_SHEET_HEAD.encode())
+                header = ''.join(
+                    f'<c r="{_column(col)}1" t="s"><v>{strings(title)}</v></c>'
+                    for col, title in enumerate(HEADERS))
+                stream.write(f'<row r="1">{header}</row>'.encode())
+
+                buffer = []
+                for line in range(2, rows_per_sheet + 2):
+                    product = products[rng.randrange(skus)]
+                    status = rng.choice(STATUSES)
+                    price = product['price']
+                    color = product['color']
+                    if edit and line % 50 == 0:
+                        status = 'Возврат'
+                    if edit and line % 97 == 0:
+                        price += 100
+                    if edit and new_strings and line % 61 == 0:
+                        color = NEW_COLOR
+                    buffer.append(
+                        f'<row r="{line}">'
+                        f'<c r="A{line}"><v>{total + line}</v></c>'
+                        f'<c r="B{line}" t="s"><v>{strings(status)}</v></c>'
+                        f'<c r="C{line}" t="s"><v>{strings(product["sku"])}</v></c>'
+                        f'<c r="D{line}" t="s"><v>{strings(product["name"])}</v></c>'
+                        f'<c r="E{line}"><v>{price}</v></c>'
+                        f'<c r="F{line}" t="s"><v>{strings(color)}</v></c>'
+                        f'<c r="G{line}" t="s"><v>{strings(product["seller"])}</v></c>'
+                        f'<c r="H{line}" t="s"><v>{strings(rng.choice(WAREHOUSES))}</v></c>'
+                        '</row>')
+                    if len(buffer) >= 2000:
+                        stream.write(''.join(buffer).encode())
+                        buffer.clear()
+                stream.write(''.join(buffer).encode())
+                stream.write(_SHEET_TAIL.encode())
+            total += rows_per_sheet
+
+        _finish_workbook(archive, sheets, strings)
+
+    return total
+
+
+BRANDS = tuple(f'Бренд {index:02d}' for index in range(40))
+
+
+def write_brands_workbook(path: str, rows: int, seed: int = 1) -> int:
+    """Таблица брендов как у handleBrandsFileUpload: две строки шапки,
+    затем заголовки «Бренд», «Артикул WB», «Артикул продавца»."""
+    rng = random.Random(seed)
+    strings = _SharedStrings()
+    preamble = ('Каталог брендов', 'Выгрузка для генератора актов')
+    header = ('Бренд', 'Артикул WB', 'Артикул продавца')
+
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as archive:
+        with archive.open('xl/worksheets/sheet1.xml', 'w') as stream:
+            stream.write(_SHEET_HEAD.encode())
+            for line, title in enumerate(preamble, 1):
+                stream.write(f'<row r="{line}"><c r="A{line}" t="s"><v>{strings(title)}</v></c></row>'.encode())
+            line = len(preamble) + 1
+            cells = ''.join(f'<c r="{_column(col)}{line}" t="s"><v>{strings(title)}</v></c>'
+                            for col, title in enumerate(header))
+            stream.write(f'<row r="{line}">{cells}</row>'.encode())
+
+            buffer = []
+            for index in range(rows):
+                line += 1
+                # Артикулы WB — числами, как в настоящих таблицах; те же, что в catalogue()
+                buffer.append(
+                    f'<row r="{line}">'
+                    f'<c r="A{line}" t="s"><v>{strings(rng.choice(BRANDS))}</v></c>'
+                    f'<c r="B{line}"><v>{200000000 + index * 7}</v></c>'
+                    f'<c r="C{line}" t="s"><v>{strings(f"ART-{index:06d}")}</v></c>'
+                    '</row>')
+                if len(buffer) >= 2000:
+                    stream.write(''.join(buffer).encode())
+                    buffer.clear()
+            stream.write(''.join(buffer).encode())
+            stream.write(_SHEET_TAIL.encode())
+
+        _finish_workbook(archive, ['Бренды'], strings)
+
+    return rows
@@ -0,0 +1,130 @@
+"""Бенчмарк POST /upload: пиковая память (RSS) и скорость в строках в секунду.
+
+    python3 -m benchmarks.upload                 # 500 000 строк, 12 листов
+    python3 -m benchmarks.upload --rows 100000 --sheets 1
+    python3 -m benchmarks.upload --workers 4     # листы в пуле из 4 процессов
+
+Замер идёт в отдельном процессе, чтобы генерация книги не попала в пик RSS.
+По умолчанию листы разбираются в том же процессе (--workers 1), и пиковый RSS
+этого процесса — вся память запроса. С пулом листы разбирают дочерние
+процессы: тогда отдельно выводится пик самого большого из них.
+Запрос проходит весь путь: multipart -> временный файл -> потоковый разбор -> агрегация.
+Затем тот же файл загружается повторно — все месяцы должны найтись в кэше.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from .synthetic import MONTHS, write_workbook
+
+
+def _peak_rss_mb(who: int = resource.RUSAGE_SELF) -> float:
+    """RUSAGE_SELF — этот процесс; RUSAGE_CHILDREN — самый большой из
+    завершившихся дочерних (вместе с их потомками)."""
+    # В Linux ru_maxrss в килобайтах, в macOS — в байтах
+    peak = resource.getrusage(who).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _write_multipart(target, path: str, boundary: str) -> None:
+    target.write((f'--{boundary}\r\n'
+                  'Content-Disposition: form-data; name="file"; filename="bench.xlsx"\r\n'
+                  'Content-Type: application/octet-stream\r\n\r\n').encode())
+    with open(path, 'rb') as source:
+        shutil.copyfileobj(source, target)
+    target.write(f'\r\n--{boundary}--\r\n'.encode())
+
+
+def _upload(app, spool, length: int, boundary: str) -> float:
+    spool.seek(0)
+    environ = {
+        'REQUEST_METHOD': 'POST',
+        'PATH_INFO': '/upload',
+        'CONTENT_TYPE': f'multipart/form-data; boundary={boundary}',
+        'CONTENT_LENGTH': str(length),
+        'wsgi.input': spool,
+    }
+    started = time.perf_counter()
+    body = b''.join(app(environ, lambda status, headers: None))
+    elapsed = time.perf_counter() - started
+    response = json.loads(body)
+    if 'error' in response:
+        raise SystemExit(response['error'])
+    return elapsed
+
+
+def measure(path: str, data_dir: str, workers: int = 1) -> dict:
+    from wb_acts.cache import ItemsCache
+    from wb_acts.server import ActsApp
+
+    app = ActsApp(ItemsCache(data_dir), workers=workers)
+    boundary = 'benchboundary'
+    spool = tempfile.TemporaryFile()
+    _write_multipart(spool, path, boundary)
+    length = spool.tell()
+    baseline = _peak_rss_mb()
+
+    seconds = _upload(app, spool, length, boundary)
+    peak = _peak_rss_mb()
+    # Повторная загрузка с новым экземпляром кэша: памяти нет, записи читаются с диска
+    cached_seconds = _upload(ActsApp(ItemsCache(data_dir), workers=workers), spool, length, boundary)
+    return {
+        'seconds': seconds,
+        'cached_seconds': cached_seconds,
+        'baseline_rss_mb': baseline,
+        'peak_rss_mb': peak,
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=500_000, help='всего строк в книге')
+    parser.add_argument('--sheets', type=int, default=12, help='число листов (месяцев)')
+    parser.add_argument('--skus', type=int, default=5000, help='уникальных артикулов WB')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='процессов для разбора листов; 1 — без пула')
+    parser.add_argument('--measure', metavar='XLSX', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.measure:
+        with tempfile.TemporaryDirectory() as data_dir:
+            print(json.dumps(measure(args.measure, data_dir, args.workers)))
+        return
+
+    sheets = [MONTHS[index % len(MONTHS)] + ('' if index < len(MONTHS) else f' ({index})')
+              for index in range(args.sheets)]
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'bench.xlsx')
+        started = time.perf_counter()
+        rows = write_workbook(path, args.rows // args.sheets, sheets, args.skus)
+        print(f'Книга: {rows} строк, {args.sheets} листов, {args.skus} SKU, '
+              f'{os.path.getsize(path) / 1e6:.1f} МБ '
+              f'(сгенерирована за {time.perf_counter() - started:.1f} с)')
+
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.upload', '--measure', path, '--workers', str(args.workers)],
+            check=True, capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        result = json.loads(output.stdout)
+        # Процесс замера и его пул уже завершены: здесь виден пик самого большого из них
+        children_peak = _peak_rss_mb(resource.RUSAGE_CHILDREN)
+
+    print(f'Время /upload:  {result["seconds"]:.2f} с')
+    print(f'Скорость:       {rows / result["seconds"]:,.0f} строк/с')
+    print(f'Пиковый RSS процесса запроса (workers={args.workers}): {result["peak_rss_mb"]:.1f} МБ '
+          f'(после импорта {result["baseline_rss_mb"]:.1f} МБ)')
+    if args.workers > 1:
+        print(f'Пиковый RSS самого большого процесса, включая пул: {children_peak:.1f} МБ')
+    print(f'Повторная загрузка (кэш): {result["cached_seconds"]:.2f} с')
+
+
+if __name__ == '__main__':
+    main()
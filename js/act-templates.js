@@ -0,0 +1,370 @@
+// Шаблоны актов: общий HTML-каркас, макеты таблиц и построчная сборка.
+// Каждый макет компилируется один раз (при первом использовании): каркас
+// делится на статические куски и подстановки, строки таблицы собираются из
+// заранее готовых открывающих тегов ячеек. Стили ячеек — классы в <style>
+// (Word их учитывает), а не style="..." в каждой ячейке. Документ отдаётся
+// массивом кусков (ChunkBuilder) — из него сразу собирается Blob или байты
+// для ZIP, без одной гигантской строки. То же — в wb_acts/render.py.
+(function (root) {
+  // Примерный размер куска документа в символах
+  const CHUNK_SIZE = 64 * 1024;
+
+  // Стоимость услуг: 60 рублей за единицу товара
+  const SERVICE_COST_PER_ITEM = 60;
+
+  const HTML_ESCAPES = { '&': '&amp;', '<': '&lt;', '>': '&gt;' };
+
+  const escapeHtml = (value) => {
+    const text = String(value);
+    return /[&<>]/.test(text) ? text.replace(/[&<>]/g, char => HTML_ESCAPES[char]) : text;
+  };
+
+  // Шаблон с подстановками {{имя}} -> функция (data, out), дописывающая куски в out
+  const compileTemplate = (source) => {
+    // Чётные элементы — статический текст, нечётные — имена подстановок
+    const parts = source.split(/\{\{(\w+)\}\}/);
+    return (data, out) => {
+      for (let i = 0; i < parts.length; i++) {
+        if (i % 2) out.push(String(data[parts[i]]));
+        else if (parts[i]) out.push(parts[i]);
+      }
+      return out;
+    };
+  };
+
+  // Накопитель документа: мелкие строки склеиваются в куски по CHUNK_SIZE символов
+  class ChunkBuilder {
+    constructor(chunkSize = CHUNK_SIZE) {
+      this.chunkSize = chunkSize;
+      this.chunks = [];
+      this.parts = [];
+      this.length = 0;
+    }
+
+    push(text) {
+      this.parts.push(text);
+      this.length += text.length;
+      if (this.length >= this.chunkSize) this.flush();
+    }
+
+    flush() {
+      if (this.parts.length) {
+        this.chunks.push(this.parts.join(''));
+        this.parts = [];
+        this.length = 0;
+      }
+    }
+
+    finish() {
+      this.flush();
+      return this.chunks;
+    }
+  }
+
+  // Куски документа в UTF-8 одним массивом байт (для записи в ZIP)
+  const encodeChunks = (chunks, prefix = '') => {
+    const encoder = new TextEncoder();
+    const parts = [prefix, ...chunks].map(chunk => encoder.encode(chunk));
+    const bytes = new Uint8Array(parts.reduce((sum, part) => sum + part.length, 0));
+    let offset = 0;
+    for (const part of parts) {
+      bytes.set(part, offset);
+      offset += part.length;
+    }
+    return bytes;
+  };
+
+  // Реквизиты сторон: строка из нескольких частей — один абзац с переносами
+  const EXECUTOR = {
+    title: 'Исполнитель',
+    lines: [
+      'Индивидуальный предприниматель Мирошниченко Михаил Михайлович',
+      'ИНН: 771994433911',
+      'Банк: МОСКОВСКИЙ ФИЛИАЛ АО КБ "МОДУЛЬБАНК"',
+      'БИК: 044525092',
+      'к/с: 30101810645250000092',
+      'Счет: 40802810670010452146'
+    ]
+  };
+
+  const CUSTOMER_BANK = [
+    'Банк: МОСКОВСКИЙ ФИЛИАЛ АО КБ "МОДУЛЬБАНК"',
+    'БИК: 044525092',
+    'к/с: 30101810645250000092',
+    'Счет: 40802810470010467690'
+  ];
+
+  const REQUISITES = {
+    // Реквизиты для акта приема-передачи
+    acceptance: [EXECUTOR, {
+      title: 'Заказчик',
+      lines: [
+        'ИП Гаряев Руслан Асланович',
+        'ИНН: 910303241077',
+        'ОГРНИП: 320911200033071',
+        ...CUSTOMER_BANK,
+        ['Адрес: 427112, Удмуртская Республика,', 'р-н. Якшур-Бодьинский,', 'с. Старые Зятцы, ул. Советская, д. 43']
+      ]
+    }],
+    // Новые реквизиты по образцу (без ОГРНИП и адреса у заказчика)
+    services: [EXECUTOR, {
+      title: 'Заказчик',
+      lines: [
+        ['Индивидуальный предприниматель', 'Гаряев Руслан Асланович'],
+        'ИНН: 910303241077',
+        ...CUSTOMER_BANK
+      ]
+    }]
+  };
+
+  const requisitesHtml = (parties) => {
+    const cell = (party) => `      <td style="border: none; width: 50%; vertical-align: top; padding: 10px; font-size: 10pt;">
+        <p style="font-weight: bold; margin: 5px 0;">${party.title}</p>
+        <br>
+${party.lines.map(line => `        <p style="margin: 5px 0;">${[].concat(line).join('<br>\n        ')}</p>`).join('\n')}
+        <br><br>
+        <p style="margin: 5px 0;">_________________________</p>
+      </td>`;
+    return `
+  <table style="border: none; width: 100%; border-collapse: collapse; table-layout: fixed; margin-top: 30px;">
+    <tr>
+${parties.map(cell).join('\n')}
+    </tr>
+  </table>`;
+  };
+
+  const getRequisitesHtml = () => requisitesHtml(REQUISITES.acceptance);
+
+  const getRequisitesHtmlNew = () => requisitesHtml(REQUISITES.services);
+
+  // Общий каркас обоих актов; {{rows}} — место строк таблицы.
+  // Ячейки таблицы: 7pt, перенос слов; .c — по центру, .r — по правому краю.
+  const ACT_SHELL = `<!DOCTYPE html>
+<html xmlns:o="urn:schemas-microsoft-com:office:office" xmlns:w="urn:schemas-microsoft-com:office:word">
+<head>
+  <meta charset="UTF-8">
+  <title>{{title}}</title>
+  <!--[if gte mso 9]>
+  <xml>
+    <w:WordDocument>
+      <w:View>Print</w:View>
+      <w:Zoom>100</w:Zoom>
+    </w:WordDocument>
+  </xml>
+  <![endif]-->
+  <style>
+    @page { size: A4; margin: 2cm 1.5cm 2cm 2cm; }
+    body { font-family: {{font}}; font-size: 11pt; line-height: 1.3; margin: 0; padding: 0; }
+    .right-text { text-align: right; }
+    .center-text { text-align: center; }
+    .bold { font-weight: bold; }
+    p { margin: 4px 0;{{paragraph}} }
+    td, th { word-wrap: break-word; word-break: break-word; overflow-wrap: break-word; white-space: normal; vertical-align: top; }
+    td { font-size: 7pt; }
+    th { background-color: #f0f0f0; font-size: 7pt; text-align: center; }
+    .c { text-align: center; }
+    .r { text-align: right; }
+  </style>
+</head>
+<body>
+{{heading}}
+  <table width="{{tableWidth}}" border="1" cellpadding="1" cellspacing="0" align="center" style="border-collapse: collapse; table-layout: fixed; margin: 10px auto;">
+{{tableHead}}
+{{rows}}    <tr>
+      <td colspan="{{totalColspan}}" class="r"><strong>Итого</strong></td>
+      <td class="r"><strong>{{total}}</strong></td>
+    </tr>
+  </table>
+{{footer}}
+  <br><br>
+  {{requisites}}
+</body>
+</html>`;
+
+  const INTRO = 'Индивидуальный предприниматель Гаряев Руслан Асланович, ИНН 910303241077 именуемый в дальнейшем Заказчик с одной стороны и ';
+  const CONTRACT = 'договора по оказанию транспортных услуг и услуг Фулфилмента №11/3/24 от 11.03.2024 г.';
+
+  // Текст акта блоками — из них собираются и HTML (.doc), и DOCX:
+  // p — абзац (bold, align: 'right'), h2 — заголовок по центру, br — пустая строка
+  const BR = { tag: 'br' };
+  const p = (text, options = {}) => ({ tag: 'p', text, ...options });
+
+  const blocksHtml = (blocks) => blocks.map(block => {
+    if (block.tag === 'br') return '  <br>';
+    if (block.tag === 'h2') return `  <h2 class="center-text">${block.text}</h2>`;
+    const text = block.bold ? `<strong>${block.text}</strong>` : block.text;
+    return `  <p${block.align ? ` class="${block.align}-text"` : ''}>${text}</p>`;
+  }).join('\n');
+
+  // Макеты актов. Первая и последняя колонки — на две строки шапки,
+  // остальные — под общим заголовком «Товар».
+  const ACT_LAYOUTS = {
+    acceptance: {
+      title: 'Акт приема-передачи',
+      font: 'Arial, sans-serif',
+      justify: false,
+      tableWidth: 100,
+      heading: [
+        p('{{date}}', { bold: true }),
+        p('Приложение № 1', { align: 'right' }),
+        p('к договору по оказанию транспортных услуг', { align: 'right' }),
+        p('и услуг Фулфилмента №11/3/24 от 11.03.2024', { align: 'right' }),
+        BR,
+        { tag: 'h2', text: 'АКТ ПРИЕМА-ПЕРЕДАЧИ' },
+        BR,
+        p(`${INTRO}Индивидуальный предприниматель Зверева Юлиана Владимировна, ИНН 623406499402, именуемая в дальнейшем Исполнитель, а совместно именуемые Стороны, заключили настоящий акт, о нижеследующем:`),
+        BR,
+        p(`1. В рамках исполнения ${CONTRACT} Заказчик передал, а Исполнитель принял следующий товар:`),
+        BR
+      ],
+      footer: [
+        BR,
+        p('2. Особые отметки: внешних повреждений тары (упаковки) товара не выявлено.'),
+        BR,
+        p('3. Настоящий акт составлен в двух экземплярах, имеющих одинаковую юридическую силу, по одному для каждой из Сторон.'),
+        BR,
+        p(`4. Настоящий акт является неотъемлемой частью ${CONTRACT}`)
+      ],
+      requisites: REQUISITES.acceptance,
+      columns: [
+        { title: '№', width: 3, align: 'c', value: (item, index) => index + 1 },
+        { title: 'Наименование', width: 37, value: item => escapeHtml(item.name) },
+        { title: 'Кол', width: 6, align: 'c', value: item => item.quantity },
+        { title: 'Бренд', width: 15, value: item => escapeHtml(item.brand) },
+        { title: 'Артикул', width: 15, value: item => escapeHtml(item.sellerArticle || '') },
+        { title: 'Цвет', width: 14, value: item => escapeHtml(item.color) },
+        { title: 'Сумма', width: 10, align: 'r', value: item => item.totalPrice.toFixed(2) }
+      ],
+      total: items => items.reduce((sum, item) => sum + item.totalPrice, 0).toFixed(2)
+    },
+    services: {
+      title: 'Акт оказания услуг',
+      font: 'Verdana, Arial, sans-serif',
+      justify: true,
+      tableWidth: 104,
+      heading: [
+        { tag: 'h2', text: 'АКТ ОКАЗАНИЯ УСЛУГ ОТ {{date}} г.' },
+        BR,
+        p(`${INTRO}Индивидуальный предприниматель Мирошниченко Михаил Михайлович, ИНН 771994433911, именуемый в дальнейшем Исполнитель с другой стороны, а совместно именуемые Стороны, заключили настоящий акт, о нижеследующем:`),
+        BR,
+        p(`1. В рамках исполнения ${CONTRACT} Исполнитель за период с {{periodStart}} по {{periodEnd}}, согласно сборочным заданиям, поставил на маркетплейс Wildberries следующие товары:`),
+        BR
+      ],
+      footer: [
+        BR,
+        p('2. Настоящий акт составлен в двух экземплярах, имеющих одинаковую юридическую силу, по одному для каждой из Сторон.'),
+        BR,
+        p(`3. Настоящий акт является неотъемлемой частью ${CONTRACT}`)
+      ],
+      requisites: REQUISITES.services,
+      columns: [
+        { title: '№', width: 3, align: 'c', value: (item, index) => index + 1 },
+        { title: 'Наименование', width: 29, value: item => escapeHtml(item.name) },
+        { title: 'Кол-во', width: 5, align: 'c', value: item => item.quantity },
+        { title: 'Бренд', width: 13, value: item => escapeHtml(item.brand) },
+        { title: 'Артикул', width: 14, value: item => escapeHtml(item.sellerArticle || '') },
+        { title: 'Цвет', width: 14, value: item => escapeHtml(item.color) },
+        { title: 'SKU', width: 14, value: item => escapeHtml(item.sku) },
+        { title: 'Стоимость услуг', width: 8, align: 'r', value: item => item.quantity * SERVICE_COST_PER_ITEM }
+      ],
+      total: items => items.reduce((sum, item) => sum + item.quantity, 0) * SERVICE_COST_PER_ITEM
+    }
+  };
+
+  // Данные акта для подстановок: дата, период (для услуг) и итог
+  const actData = (kind, items, actDate, month) => {
+    const { formatDate, getPeriodDates } = root.WbActs;
+    const period = kind === 'services' ? getPeriodDates(month) : { start: '', end: '' };
+    return {
+      date: formatDate(actDate),
+      periodStart: period.start,
+      periodEnd: period.end,
+      total: ACT_LAYOUTS[kind].total(items)
+    };
+  };
+
+  const compileLayout = (layout) => {
+    const { columns } = layout;
+    const th = (column, attributes) => `<th width="${column.width}%"${attributes}>${column.title}</th>`;
+    const outer = [columns[0], columns[columns.length - 1]];
+    const inner = columns.slice(1, -1);
+    const tableHead = `    <tr>
+      ${th(outer[0], ' rowspan="2"')}
+      <th colspan="${inner.length}">Товар</th>
+      ${th(outer[1], ' rowspan="2"')}
+    </tr>
+    <tr>
+${inner.map(column => `      ${th(column, '')}`).join('\n')}
+    </tr>`;
+
+    const [head, tail] = ACT_SHELL.split('{{rows}}');
+    const shell = {
+      title: layout.title,
+      font: layout.font,
+      paragraph: layout.justify ? ' text-align: justify;' : '',
+      tableWidth: `${layout.tableWidth}%`,
+      tableHead,
+      totalColspan: columns.length - 1,
+      requisites: requisitesHtml(layout.requisites)
+    };
+    // Статические подстановки каркаса вписываем сразу — остаются только данные акта
+    const bake = (source) => source.replace(/\{\{(\w+)\}\}/g, (match, name) => (name in shell ? shell[name] : match));
+    return {
+      head: compileTemplate(bake(head).replace('{{heading}}', blocksHtml(layout.heading))),
+      tail: compileTemplate(bake(tail).replace('{{footer}}', blocksHtml(layout.footer))),
+      // Открывающие теги ячеек готовы заранее: в строке остаются только значения
+      cells: columns.map(column => (column.align ? `<td class="${column.align}">` : '<td>')),
+      values: columns.map(column => column.value)
+    };
+  };
+
+  const compiledLayouts = {};
+
+  const getLayout = (kind) => {
+    if (!compiledLayouts[kind]) {
+      if (!ACT_LAYOUTS[kind]) throw new Error(`Неизвестный тип акта: ${kind}`);
+      compiledLayouts[kind] = compileLayout(ACT_LAYOUTS[kind]);
+    }
+    return compiledLayouts[kind];
+  };
+
+  // Акт кусками строк; actDate — 'ГГГГ-ММ-ДД', month — название листа (для периода услуг)
+  const renderActChunks = (kind, items, actDate, month = '') => {
+    const layout = getLayout(kind);
+    const data = actData(kind, items, actDate, month);
+
+    const out = new ChunkBuilder();
+    layout.head(data, out);
+    const { cells, values } = layout;
+    for (let index = 0; index < items.length; index++) {
+      const item = items[index];
+      let row = '<tr>';
+      for (let i = 0; i < cells.length; i++) {
+        row += cells[i] + values[i](item, index) + '</td>';
+      }
+      out.push(row + '</tr>\n');
+    }
+    layout.tail(data, out);
+    return out.finish();
+  };
+
+  const renderAcceptanceAct = (items, acceptanceDate) =>
+    renderActChunks('acceptance', items, acceptanceDate).join('');
+
+  const renderServicesAct = (items, servicesDate, selectedMonth) =>
+    renderActChunks('services', items, servicesDate, selectedMonth).join('');
+
+  root.WbActs = Object.assign(root.WbActs || {}, {
+    ACT_LAYOUTS,
+    REQUISITES,
+    actData,
+    compileTemplate,
+    ChunkBuilder,
+    encodeChunks,
+    getRequisitesHtml,
+    getRequisitesHtmlNew,
+    renderActChunks,
+    renderAcceptanceAct,
+    renderServicesAct
+  });
+})(typeof self !== 'undefined' ? self : this);
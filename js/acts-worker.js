@@ -0,0 +1,67 @@
+// Воркер пакетной генерации: разбирает один лист и готовит оба акта для ZIP.
+// Книга приходит один раз в сообщении init — как File/Blob, без копии байтов.
+// Каталог ZIP и общие строки читаются один раз на воркер, дальше каждый месяц
+// распаковывает только свой лист (js/xlsx-stream.js), и его строки сразу
+// сворачиваются в позиции — SheetJS воркеру не нужен.
+importScripts(
+  'brands.js',
+  'xlsx-stream.js',
+  'acts.js',
+  'act-templates.js',
+  'zip.js',
+  'docx.js',
+  'batch.js'
+);
+
+let file = null;
+let brandsResolver = null;
+let readerPromise = null;
+
+// Без DecompressionStream или для старого .xls воркер отказывается — batch.js
+// разберёт такие месяцы на странице
+const openReader = () => {
+  if (!readerPromise) {
+    readerPromise = (async () => {
+      if (!WbActs.XlsxStreamReader.supported || !(await WbActs.XlsxStreamReader.isZip(file))) {
+        throw new Error('Потоковое чтение книги в воркере недоступно');
+      }
+      return WbActs.XlsxStreamReader.open(file);
+    })();
+  }
+  return readerPromise;
+};
+
+// Позиции месяца: пачки строк агрегируются по мере распаковки листа
+const readItems = async (month) => {
+  const reader = await openReader();
+  const aggregator = new WbActs.ItemsAggregator(month, brandsResolver);
+  for await (const batch of reader.rowBatches(month)) aggregator.addRows(batch);
+  return aggregator.items();
+};
+
+self.onmessage = async ({ data: message }) => {
+  if (message.type === 'init') {
+    file = message.file;
+    brandsResolver = WbActs.BrandResolver.fromJSON(message.brands);
+    return;
+  }
+
+  const { month, cachedItems, format, dates } = message;
+  try {
+    const items = cachedItems || await readItems(month);
+
+    const files = await WbActs.renderMonthFiles(items, month, format, dates);
+    self.postMessage({
+      month,
+      files,
+      // Позиции возвращаем только свежеразобранные — страница положит их в кэш
+      items: cachedItems ? null : items,
+      // Для индекса артикулов продавца на странице хватает пары артикулов
+      articles: items
+        .filter(item => item.sellerArticle)
+        .map(({ sku, sellerArticle }) => ({ sku, sellerArticle }))
+    }, files.map(file => file.data.buffer));
+  } catch (error) {
+    self.postMessage({ month, error: error.message });
+  }
+};
@@ -0,0 +1,254 @@
+// Общая логика актов: агрегация позиций, даты и имена файлов
+// (бренды — js/brands.js, HTML-шаблоны — js/act-templates.js).
+// Подключается на странице (<script src>) и в воркерах (importScripts),
+// поэтому не зависит от React и DOM.
+(function (root) {
+  const extractItemsData = (sheet, selectedMonth, resolver) => {
+    const data = XLSX.utils.sheet_to_json(sheet);
+
+    console.log('Всего строк в Excel:', data.length);
+    console.log('Размер каталога брендов:', resolver.size);
+
+    const itemsMap = {};
+    let uniqueCount = 0;
+
+    const soldItems = data.filter(row => row['Статус задания'] === 'Продано');
+    console.log('Строк со статусом Продано:', soldItems.length);
+
+    soldItems.forEach(row => {
+      const wbArticle = row['Артикул Wildberries'] || '';
+      const price = parseFloat(row['Стоимость']) || 0;
+      const reducedPrice = price * 0.65;
+      const sellerArticleFromExcel = row['Артикул продавца'] || '';
+
+      if (!itemsMap[wbArticle]) {
+        const { brand, sellerArticle: sellerArticleFromBrands } = resolver.resolve(wbArticle, selectedMonth);
+
+        if (uniqueCount < 3) {
+          console.log('Артикул WB:', wbArticle);
+          console.log('Итоговый бренд:', brand);
+          console.log('Артикул продавца из Excel:', sellerArticleFromExcel);
+          console.log('Артикул продавца из каталога брендов:', sellerArticleFromBrands);
+        }
+
+        itemsMap[wbArticle] = {
+          name: row['Наименование'] || '',
+          quantity: 0,
+          brand: brand,
+          color: row['Цвет'] || '',
+          sku: wbArticle,
+          sellerArticle: sellerArticleFromBrands || sellerArticleFromExcel,
+          price: reducedPrice,
+          totalPrice: 0
+        };
+        uniqueCount += 1;
+      }
+
+      itemsMap[wbArticle].quantity += 1;
+      itemsMap[wbArticle].totalPrice += reducedPrice;
+    });
+
+    const items = Object.values(itemsMap).sort((a, b) => a.sku.localeCompare(b.sku));
+    console.log('Итого уникальных товаров:', items.length);
+
+    return items;
+  };
+
+  const cellText = (value) => (value ? String(value) : '');
+
+  // Агрегация строк листа по мере чтения — как wb_acts/aggregate.py: первая
+  // строка — шапка, дальше в памяти держатся только позиции, а не строки листа.
+  // rows — массивы значений (XlsxStreamReader.rowBatches)
+  class ItemsAggregator {
+    constructor(month, resolver) {
+      this.month = month;
+      this.resolver = resolver;
+      // undefined — шапки ещё не было, null — в шапке нет колонки статуса
+      this.columns = undefined;
+      this.itemsMap = new Map();
+    }
+
+    readHeader(header) {
+      const columns = new Map();
+      for (let index = 0; index < header.length; index++) {
+        const title = header[index];
+        if (title != null && !columns.has(String(title))) columns.set(String(title), index);
+      }
+      if (!columns.has('Статус задания')) return null;
+      const column = (title) => (columns.has(title) ? columns.get(title) : -1);
+      return {
+        status: columns.get('Статус задания'),
+        article: column('Артикул Wildberries'),
+        name: column('Наименование'),
+        price: column('Стоимость'),
+        color: column('Цвет'),
+        seller: column('Артикул продавца')
+      };
+    }
+
+    addRows(rows) {
+      for (const row of rows) {
+        if (this.columns === undefined) {
+          this.columns = this.readHeader(row);
+          continue;
+        }
+        if (!this.columns) return;
+        const { status, article, name, price, color, seller } = this.columns;
+        if (row[status] !== 'Продано') continue;
+
+        const sku = cellText(row[article]);
+        const reducedPrice = (parseFloat(row[price]) || 0) * 0.65;
+        let item = this.itemsMap.get(sku);
+        if (!item) {
+          const { brand, sellerArticle } = this.resolver.resolve(sku, this.month);
+          item = {
+            name: cellText(row[name]),
+            quantity: 0,
+            brand,
+            color: cellText(row[color]),
+            sku,
+            sellerArticle: sellerArticle || cellText(row[seller]),
+            price: reducedPrice,
+            totalPrice: 0
+          };
+          this.itemsMap.set(sku, item);
+        }
+        item.quantity += 1;
+        item.totalPrice += reducedPrice;
+      }
+    }
+
+    items() {
+      return Array.from(this.itemsMap.values()).sort((a, b) => a.sku.localeCompare(b.sku));
+    }
+  }
+
+  // Индекс артикул продавца -> артикулы WB -> месяцы. Строится за один проход
+  // по позициям и пополняется листами книги, поэтому конфликт между любыми
+  // месяцами находится один раз, без попарного сравнения позиций.
+  class SellerArticleIndex {
+    constructor() {
+      this.articles = new Map();
+      this.months = new Set();
+    }
+
+    // Повторное добавление того же месяца ничего не меняет; позиции без
+    // месяца добавляются всегда — их нечем отличить друг от друга
+    add(items, month = '') {
+      if (month) {
+        if (this.months.has(month)) return this;
+        this.months.add(month);
+      }
+
+      for (const item of items) {
+        if (!item.sellerArticle) continue;
+        let skus = this.articles.get(item.sellerArticle);
+        if (!skus) {
+          skus = new Map();
+          this.articles.set(item.sellerArticle, skus);
+        }
+        const sku = String(item.sku);
+        let months = skus.get(sku);
+        if (!months) {
+          months = new Set();
+          skus.set(sku, months);
+        }
+        months.add(month);
+      }
+      return this;
+    }
+
+    // Конфликты: [{ sellerArticle, skus: [...], months: [...] }];
+    // с month — только затрагивающие этот месяц
+    conflicts(month) {
+      const conflicts = [];
+      for (const [sellerArticle, skus] of this.articles) {
+        if (skus.size < 2) continue;
+        const months = new Set();
+        skus.forEach(skuMonths => skuMonths.forEach(m => months.add(m)));
+        if (month !== undefined && !months.has(month)) continue;
+        conflicts.push({
+          sellerArticle,
+          skus: Array.from(skus.keys()).sort(),
+          months: Array.from(months).filter(Boolean)
+        });
+      }
+      return conflicts;
+    }
+  }
+
+  const formatDate = (dateString) => {
+    const date = new Date(dateString);
+    const day = String(date.getDate()).padStart(2, '0');
+    const month = String(date.getMonth() + 1).padStart(2, '0');
+    const year = date.getFullYear();
+    return `${day}.${month}.${year}`;
+  };
+
+  const getPeriodDates = (monthName) => {
+    const monthMap = {
+      'янв': { month: 0, name: 'января' },
+      'фев': { month: 1, name: 'февраля' },
+      'мар': { month: 2, name: 'марта' },
+      'апр': { month: 3, name: 'апреля' },
+      'май': { month: 4, name: 'мая' },
+      'июн': { month: 5, name: 'июня' },
+      'июл': { month: 6, name: 'июля' },
+      'авг': { month: 7, name: 'августа' },
+      'сен': { month: 8, name: 'сентября' },
+      'окт': { month: 9, name: 'октября' },
+      'ноя': { month: 10, name: 'ноября' },
+      'дек': { month: 11, name: 'декабря' }
+    };
+
+    const lowerMonth = monthName.toLowerCase();
+    let foundMonth = null;
+    let year = 2024;
+
+    // Ищем год в названии
+    const yearMatch = monthName.match(/(\d{2,4})/);
+    if (yearMatch) {
+      year = yearMatch[1].length === 2 ? 2000 + parseInt(yearMatch[1]) : parseInt(yearMatch[1]);
+    }
+
+    // Ищем месяц
+    for (const [key, value] of Object.entries(monthMap)) {
+      if (lowerMonth.includes(key)) {
+        foundMonth = value;
+        break;
+      }
+    }
+
+    if (!foundMonth) return { start: '__________', end: '__________' };
+
+    const lastDay = new Date(year, foundMonth.month + 1, 0).getDate();
+    const startDate = `01.${String(foundMonth.month + 1).padStart(2, '0')}.${year}`;
+    const endDate = `${lastDay}.${String(foundMonth.month + 1).padStart(2, '0')}.${year}`;
+
+    // endIso — дата акта по умолчанию для пакетной генерации (последний день месяца)
+    const endIso = `${year}-${String(foundMonth.month + 1).padStart(2, '0')}-${String(lastDay).padStart(2, '0')}`;
+
+    return { start: startDate, end: endDate, endIso };
+  };
+
+  const ACT_TITLES = {
+    acceptance: 'Акт ПП',
+    services: 'Акт ОУ'
+  };
+
+  // Формируем название: "Акт ПП (месяц год) ИП Гаряев"
+  const getActFileName = (kind, selectedMonth, actDate) => {
+    const year = new Date(actDate).getFullYear();
+    return `${ACT_TITLES[kind]} (${selectedMonth} ${year}) ИП Гаряев`;
+  };
+
+  root.WbActs = Object.assign(root.WbActs || {}, {
+    extractItemsData,
+    ItemsAggregator,
+    SellerArticleIndex,
+    formatDate,
+    getPeriodDates,
+    ACT_TITLES,
+    getActFileName
+  });
+})(typeof self !== 'undefined' ? self : this);
@@ -0,0 +1,142 @@
+// Пакетная генерация: оба акта за каждый месяц книги в одном ZIP.
+// Листы раздаются пулу Web Worker'ов (js/acts-worker.js); если воркеры
+// недоступны (например, страница открыта как file://), месяцы обрабатываются
+// на странице по одному с передачей управления браузеру между ними.
+(function (root) {
+  const ACT_KINDS = ['acceptance', 'services'];
+  const BOM = '\uFEFF';
+
+  const today = () => new Date().toISOString().slice(0, 10);
+
+  // Оба акта за месяц; дата — последний день периода, как в getPeriodDates.
+  // format — 'doc' (HTML с BOM, как раньше) или 'docx';
+  // dates — { вид: дата }: только эти акты и с этими датами (перегенерация устаревших)
+  const renderMonthFiles = async (items, month, format = 'doc', dates = null) => {
+    const { getPeriodDates, renderActChunks, renderDocx, encodeChunks, getActFileName, createZipEntry } = root.WbActs;
+    const defaultDate = getPeriodDates(month).endIso || today();
+    const files = [];
+
+    for (const kind of dates ? ACT_KINDS.filter(kind => dates[kind]) : ACT_KINDS) {
+      const actDate = dates ? dates[kind] : defaultDate;
+      const bytes = format === 'docx'
+        ? await renderDocx(kind, items, actDate, month)
+        : encodeChunks(renderActChunks(kind, items, actDate, month), BOM);
+      const fileName = `${getActFileName(kind, month, actDate)}.${format}`;
+      files.push(await createZipEntry(fileName, bytes));
+    }
+    return files;
+  };
+
+  const poolSize = (tasks) => {
+    const cores = (root.navigator && root.navigator.hardwareConcurrency) || 2;
+    // Одно ядро оставляем странице, чтобы интерфейс не подвисал
+    return Math.max(1, Math.min(tasks, cores - 1));
+  };
+
+  const createWorker = (url) => {
+    if (typeof Worker === 'undefined') return null;
+    try {
+      return new Worker(url);
+    } catch (error) {
+      return null;
+    }
+  };
+
+  const yieldToBrowser = () => new Promise(resolve => setTimeout(resolve, 0));
+
+  /**
+   * file — книга (File или Blob): воркерам уходит ссылка на те же байты, без копии;
+   * months — листы книги; getCachedItems(month) — позиции из кэша или null;
+   * getItems(month) — позиции с разбором на странице (запасной путь);
+   * onItems(month, items) — позиции, разобранные воркером, для кэша;
+   * onProgress(done, total, month) — после каждого месяца;
+   * sellerIndex — общий SellerArticleIndex книги, пополняется всеми листами;
+   * format — 'doc' или 'docx';
+   * actDates — { месяц: { вид: дата } }: только эти акты с этими датами.
+   * Результат: { blob, conflicts } — конфликты артикулов продавца по всей книге.
+   */
+  const generateAllActs = async ({
+    file, months, brandsResolver, getCachedItems, getItems, onItems, onProgress,
+    sellerIndex = new root.WbActs.SellerArticleIndex(),
+    format = 'doc',
+    actDates = null,
+    workerUrl = 'js/acts-worker.js'
+  }) => {
+    const zip = new root.WbActs.ZipWriter();
+    // Результаты приходят в любом порядке, в архив пишем в порядке листов
+    const finished = new Array(months.length);
+    let written = 0;
+    let done = 0;
+    let next = 0;
+    const dates = (month) => (actDates ? actDates[month] : null);
+
+    const complete = (index, result) => {
+      finished[index] = result.files;
+      sellerIndex.add(result.articles, months[index]);
+      while (written < months.length && finished[written]) {
+        finished[written].forEach(file => zip.add(file));
+        finished[written] = [];
+        written += 1;
+      }
+      done += 1;
+      if (onProgress) onProgress(done, months.length, months[index]);
+    };
+
+    const runInPage = async (month) => {
+      await yieldToBrowser();
+      const items = await getItems(month);
+      return { files: await renderMonthFiles(items, month, format, dates(month)), articles: items };
+    };
+
+    const runInWorker = async (worker, month) => {
+      const cachedItems = await getCachedItems(month);
+      const result = await new Promise((resolve, reject) => {
+        worker.onmessage = ({ data }) => (data.error ? reject(new Error(data.error)) : resolve(data));
+        worker.onerror = (event) => {
+          event.preventDefault();
+          reject(new Error(event.message || 'Воркер завершился с ошибкой'));
+        };
+        worker.postMessage({ month, cachedItems, format, dates: dates(month) });
+      });
+      if (result.items && onItems) await onItems(month, result.items);
+      return result;
+    };
+
+    const workers = [];
+    // Каталог брендов сериализуется один раз на все воркеры
+    const brands = brandsResolver.toJSON();
+    for (let i = 0; i < poolSize(months.length); i++) {
+      const worker = createWorker(workerUrl);
+      if (!worker) break;
+      worker.postMessage({ type: 'init', file, brands });
+      workers.push(worker);
+    }
+
+    const lane = async (worker) => {
+      while (next < months.length) {
+        const index = next++;
+        let result = null;
+        if (worker) {
+          try {
+            result = await runInWorker(worker, months[index]);
+          } catch (error) {
+            console.warn('Воркер недоступен, месяц обрабатывается на странице:', error);
+            worker.terminate();
+            worker = null;
+          }
+        }
+        complete(index, result || await runInPage(months[index]));
+      }
+    };
+
+    try {
+      await Promise.all(workers.length ? workers.map(lane) : [lane(null)]);
+    } finally {
+      workers.forEach(worker => worker.terminate());
+    }
+
+    return { blob: zip.finish(), conflicts: sellerIndex.conflicts() };
+  };
+
+  root.WbActs = Object.assign(root.WbActs || {}, { renderMonthFiles, generateAllActs });
+})(typeof self !== 'undefined' ? self : this);
@@ -0,0 +1,294 @@
+// Бренды и артикулы продавца по артикулу WB.
+// Встроенный список, таблица брендов и правила по месяцам компилируются в один
+// BrandResolver: Map артикул WB -> индекс записи, бренды — через таблицу строк.
+// Резолвер сериализуется в компактный файл (JSON, сжатый gzip) того же формата,
+// что и wb_acts/brands.py, поэтому большой каталог не нужно разбирать из XLSX заново.
+(function (root) {
+  const FORMAT = 'wb-brands';
+  const FORMAT_VERSION = 1;
+
+  // Специальный список из 119 артикулов
+  const brandArticles = [
+    '236072463', '236072422', '236072464', '236072423', '236072500', '223409272',
+    '236072483', '236072420', '236072482', '236072466', '236072491', '236072502',
+    '236072529', '236072503', '236072444', '236072419', '230352568', '236072458',
+    '236072462', '236062809', '236072465', '236072515', '236072498', '236072442',
+    '236072508', '236072424', '236072450', '236072430', '236072475', '236072504',
+    '236072519', '236072426', '223861203', '236072433', '236072428', '236072518',
+    '236072448', '236072506', '236072436', '236072474', '236072471', '236072441',
+    '236072457', '236370991', '236072461', '236072520', '236072456', '236072486',
+    '236072455', '236072509', '223852788', '223402737', '236370968', '259042881',
+    '223402744', '223859054', '265591355', '265591354', '265591356', '223402739',
+    '216140144', '265591358', '265591564', '271711799', '223402760', '265591551',
+    '262696091', '236370990', '270538626', '230397965', '223402740', '236371005',
+    '223805238', '236370989', '223861200', '230231239', '230226603', '236370972',
+    '230359539', '236370969', '236294431', '223861204', '230353708', '223859052',
+    '236382828', '236370973', '254558872', '223805243', '265591566', '223834349',
+    '236072410', '223402720', '265591544', '273683311', '230229479', '278091287',
+    '278414535', '278494215', '262683102', '278139912', '236072412', '236370966',
+    '223861184', '236072414', '230226894', '275509508', '279082730', '223834347',
+    '254318877', '236382935', '236370965', '236382814', '265591559', '236370959',
+    '268543019', '277834382', '236382805', '236063560', '278479657'
+  ];
+
+  const BRAND_PALETTE = ['Lithium', 'Magnet', '—'];
+
+  // Бренд встроенного артикула — по сумме кодов символов
+  const builtinBrand = (articleStr) => {
+    let hash = 0;
+    for (let i = 0; i < articleStr.length; i++) hash += articleStr.charCodeAt(i);
+    return BRAND_PALETTE[hash % BRAND_PALETTE.length];
+  };
+
+  // Правила по месяцам: если название месяца (в нижнем регистре) содержит все
+  // подстроки contains, бренд для всех артикулов — brand. Апрель 24 — без брендов.
+  const MONTH_RULES = [{ contains: ['апр', '24'], brand: '' }];
+
+  class BrandResolver {
+    // loaded — сколько артикулов пришло из таблицы брендов (без встроенного списка)
+    constructor({
+      skus = [], brandIds = [], brands = [''], sellerArticles = [], monthRules = MONTH_RULES, loaded = 0, index = null
+    } = {}) {
+      this.skus = skus;
+      this.loaded = loaded;
+      this.brandIds = brandIds;
+      this.brands = brands;
+      this.sellerArticles = sellerArticles;
+      this.monthRules = monthRules;
+      this.index = index;
+      if (!this.index) {
+        this.index = new Map();
+        for (let i = 0; i < skus.length; i++) this.index.set(skus[i], i);
+      }
+      this.monthCache = new Map();
+    }
+
+    get size() {
+      return this.skus.length;
+    }
+
+    // Бренд, заданный правилом для месяца, или undefined
+    monthBrand(month) {
+      if (!month) return undefined;
+      if (!this.monthCache.has(month)) {
+        const lower = month.toLowerCase();
+        const rule = this.monthRules.find(r => r.contains.every(part => lower.includes(part)));
+        this.monthCache.set(month, rule ? rule.brand : undefined);
+      }
+      return this.monthCache.get(month);
+    }
+
+    resolve(wbArticle, month) {
+      const i = this.index.get(String(wbArticle));
+      const override = this.monthBrand(month);
+      if (i === undefined) {
+        return { brand: override !== undefined ? override : '', sellerArticle: '' };
+      }
+      return {
+        brand: override !== undefined ? override : this.brands[this.brandIds[i]],
+        sellerArticle: this.sellerArticles[i]
+      };
+    }
+
+    toJSON() {
+      return {
+        format: FORMAT,
+        version: FORMAT_VERSION,
+        loaded: this.loaded,
+        monthRules: this.monthRules,
+        brands: this.brands,
+        skus: this.skus,
+        brandIds: Array.from(this.brandIds),
+        sellerArticles: this.sellerArticles
+      };
+    }
+
+    static fromJSON(data) {
+      if (!data || data.format !== FORMAT || data.version !== FORMAT_VERSION) {
+        throw new Error('Неизвестный формат каталога брендов');
+      }
+      return new BrandResolver({
+        skus: data.skus,
+        brandIds: Int32Array.from(data.brandIds),
+        brands: data.brands,
+        sellerArticles: data.sellerArticles,
+        monthRules: data.monthRules,
+        loaded: data.loaded
+      });
+    }
+
+    // Компактный файл: JSON, сжатый gzip, если браузер это умеет
+    async serialize() {
+      const bytes = new TextEncoder().encode(JSON.stringify(this));
+      if (typeof CompressionStream === 'undefined') return bytes;
+      const stream = new Blob([bytes]).stream().pipeThrough(new CompressionStream('gzip'));
+      return new Uint8Array(await new Response(stream).arrayBuffer());
+    }
+
+    static async deserialize(buffer) {
+      let bytes = new Uint8Array(buffer);
+      // 1f 8b — сигнатура gzip
+      if (bytes[0] === 0x1F && bytes[1] === 0x8B) {
+        const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+        bytes = new Uint8Array(await new Response(stream).arrayBuffer());
+      }
+      return BrandResolver.fromJSON(JSON.parse(new TextDecoder().decode(bytes)));
+    }
+  }
+
+  // Сборка резолвера из строк таблицы брендов: первая запись артикула побеждает,
+  // встроенный список перекрывает бренд, но не артикул продавца
+  class BrandResolverBuilder {
+    constructor() {
+      this.skus = [];
+      this.brandIds = [];
+      this.sellerArticles = [];
+      this.brands = [''];
+      this.brandIndex = new Map([['', 0]]);
+      this.index = new Map();
+    }
+
+    get size() {
+      return this.skus.length;
+    }
+
+    brandId(brand) {
+      let id = this.brandIndex.get(brand);
+      if (id === undefined) {
+        id = this.brands.length;
+        this.brands.push(brand);
+        this.brandIndex.set(brand, id);
+      }
+      return id;
+    }
+
+    add(wbArticle, brand, sellerArticle) {
+      const articleStr = String(wbArticle).trim();
+      if (!articleStr || this.index.has(articleStr)) return;
+      this.index.set(articleStr, this.skus.length);
+      this.skus.push(articleStr);
+      this.brandIds.push(this.brandId(brand ? String(brand).trim() : ''));
+      this.sellerArticles.push(sellerArticle ? String(sellerArticle).trim() : '');
+    }
+
+    build() {
+      const loaded = this.skus.length;
+      for (const articleStr of brandArticles) {
+        const id = this.brandId(builtinBrand(articleStr));
+        const i = this.index.get(articleStr);
+        if (i === undefined) {
+          this.index.set(articleStr, this.skus.length);
+          this.skus.push(articleStr);
+          this.brandIds.push(id);
+          this.sellerArticles.push('');
+        } else {
+          this.brandIds[i] = id;
+        }
+      }
+      return new BrandResolver({
+        skus: this.skus,
+        brandIds: Int32Array.from(this.brandIds),
+        brands: this.brands,
+        sellerArticles: this.sellerArticles,
+        loaded,
+        index: this.index
+      });
+    }
+  }
+
+  // Резолвер из объекта brandsMap ({ артикул: { brand, sellerArticle } })
+  const compileBrands = (brandsMap = {}) => {
+    const builder = new BrandResolverBuilder();
+    Object.keys(brandsMap).forEach(article => {
+      builder.add(article, brandsMap[article].brand, brandsMap[article].sellerArticle);
+    });
+    return builder.build();
+  };
+
+  const findColumn = (header, title) => header.findIndex(cell => String(cell).includes(title));
+
+  const isHeaderRow = (row) =>
+    row.some(cell => String(cell).includes('Бренд')) && row.some(cell => String(cell).includes('Артикул WB'));
+
+  // Таблица брендов построчно: строка заголовков ищется среди первых десяти,
+  // дальше строки сразу идут в BrandResolverBuilder — массив всех строк не нужен
+  class BrandsTableReader {
+    constructor() {
+      this.builder = new BrandResolverBuilder();
+      this.head = [];
+      this.columns = null;
+      this.rows = 0;
+    }
+
+    setHeader(header) {
+      this.columns = {
+        brand: findColumn(header, 'Бренд'),
+        article: findColumn(header, 'Артикул WB'),
+        sellerArticle: findColumn(header, 'Артикул продавца')
+      };
+      console.log('Колонки таблицы брендов:', this.columns);
+    }
+
+    addRow(row) {
+      const { brand, article, sellerArticle } = this.columns;
+      const wbArticle = row[article];
+      if (wbArticle) {
+        this.builder.add(wbArticle, row[brand], sellerArticle >= 0 ? row[sellerArticle] : '');
+      }
+    }
+
+    // Без явных заголовков первой считается первая строка
+    useFirstRow() {
+      const [header, ...rows] = this.head;
+      this.head = [];
+      this.setHeader(header);
+      rows.forEach(row => this.addRow(row));
+    }
+
+    push(rows) {
+      for (const row of rows) {
+        if (!row) continue;
+        this.rows++;
+        if (this.columns) {
+          this.addRow(row);
+        } else if (isHeaderRow(row)) {
+          this.head = [];
+          this.setHeader(row);
+        } else {
+          this.head.push(row);
+          if (this.head.length === 10) this.useFirstRow();
+        }
+      }
+    }
+
+    build() {
+      if (!this.columns && this.head.length) this.useFirstRow();
+      return this.builder.build();
+    }
+  }
+
+  // Таблица брендов из XLSX потоком (js/xlsx-stream.js): файл не читается в память
+  // целиком, строки первого листа пачками попадают в каталог.
+  // onProgress({ loaded, total, rows }) — сжатые байты и прочитанные строки; signal — отмена.
+  const loadBrandsTable = async (blob, { signal, onProgress } = {}) => {
+    const xlsx = await root.WbActs.XlsxStreamReader.open(blob);
+    const table = new BrandsTableReader();
+    const batches = xlsx.rowBatches(xlsx.sheetNames[0], {
+      signal,
+      onProgress: onProgress && (progress => onProgress({ ...progress, rows: table.rows }))
+    });
+    for await (const rows of batches) {
+      table.push(rows);
+    }
+    return table.build();
+  };
+
+  root.WbActs = Object.assign(root.WbActs || {}, {
+    brandArticles,
+    BrandResolver,
+    BrandResolverBuilder,
+    BrandsTableReader,
+    compileBrands,
+    loadBrandsTable
+  });
+})(typeof self !== 'undefined' ? self : this);
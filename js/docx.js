@@ -0,0 +1,253 @@
+// Акты в формате Word 2007+ (.docx, OOXML).
+// Макеты те же, что у HTML-актов (ACT_LAYOUTS в act-templates.js). word/document.xml
+// собирается построчно и кусками уходит в ZIP через createStreamedZipEntry — весь
+// XML в памяти не держится. Таблица — с фиксированной сеткой колонок (tblGrid,
+// tblLayout fixed), Word не пересчитывает ширины по содержимому, а шапка
+// повторяется на каждой странице (tblHeader).
+(function (root) {
+  const CHUNK_SIZE = 64 * 1024;
+
+  const DOCX_MIME = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document';
+
+  // A4 и поля как в @page HTML-акта (2cm 1.5cm 2cm 2cm), в твипах
+  const PAGE = { width: 11906, height: 16838, top: 1134, right: 850, bottom: 1134, left: 1134 };
+  const TEXT_WIDTH = PAGE.width - PAGE.left - PAGE.right;
+
+  const XML_HEADER = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n';
+  const W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main';
+
+  // Символы, недопустимые в XML 1.0 (из ячеек Excel попадают управляющие)
+  const INVALID_XML = /[\u0000-\u0008\u000B\u000C\u000E-\u001F\uFFFE\uFFFF]/g;
+
+  // Для текста из макета (он не экранирован); значения колонок уже прошли escapeHtml
+  const escapeXml = (text) => String(text)
+    .replace(/&/g, '&amp;')
+    .replace(/</g, '&lt;')
+    .replace(/>/g, '&gt;')
+    .replace(INVALID_XML, '');
+
+  const run = (text, bold = false) =>
+    `<w:r>${bold ? '<w:rPr><w:b/></w:rPr>' : ''}<w:t xml:space="preserve">${text}</w:t></w:r>`;
+
+  const paragraphProps = (style) => (style ? `<w:pPr><w:pStyle w:val="${style}"/></w:pPr>` : '');
+
+  const paragraph = (content, style = '') => `<w:p>${paragraphProps(style)}${content}</w:p>`;
+
+  const EMPTY_LINE = paragraph('', 'Body');
+
+  // Блоки текста акта: p — абзац, h2 — заголовок, br — пустая строка
+  const blocksXml = (blocks) => blocks.map(block => {
+    if (block.tag === 'br') return EMPTY_LINE;
+    if (block.tag === 'h2') return paragraph(run(escapeXml(block.text)), 'ActTitle');
+    return paragraph(run(escapeXml(block.text), block.bold), block.align === 'right' ? 'Right' : 'Body');
+  }).join('\n');
+
+  // Ширины колонок в твипах; округление добирает последняя колонка
+  const gridWidths = (columns, tableWidth) => {
+    const widths = columns.map(column => Math.round(tableWidth * column.width / 100));
+    widths[widths.length - 1] += tableWidth - widths.reduce((sum, width) => sum + width, 0);
+    return widths;
+  };
+
+  const CELL_STYLES = { c: 'CellC', r: 'CellR' };
+
+  // Пробелы по краям значения не сохраняются — как и в HTML-акте
+  const CELL_END = '</w:t></w:r></w:p></w:tc>';
+
+  const headCell = (title, width, extra = '') =>
+    `<w:tc><w:tcPr><w:tcW w:w="${width}" w:type="dxa"/>${extra}<w:shd w:val="clear" w:color="auto" w:fill="F0F0F0"/></w:tcPr>` +
+    `${paragraph(title ? run(escapeXml(title)) : '', 'CellHead')}</w:tc>`;
+
+  // Реквизиты — таблица без рамок на две колонки
+  const requisitesXml = (parties) => {
+    const width = Math.round(TEXT_WIDTH / parties.length);
+    const cell = (party) => [
+      `<w:tc><w:tcPr><w:tcW w:w="${width}" w:type="dxa"/></w:tcPr>`,
+      paragraph(run(escapeXml(party.title), true), 'Requisites'),
+      paragraph('', 'Requisites'),
+      ...party.lines.map(line =>
+        paragraph([].concat(line).map(part => run(escapeXml(part))).join('<w:r><w:br/></w:r>'), 'Requisites')),
+      paragraph('', 'Requisites'),
+      paragraph('', 'Requisites'),
+      paragraph(run('_________________________'), 'Requisites'),
+      '</w:tc>'
+    ].join('');
+    return [
+      '<w:tbl><w:tblPr><w:tblW w:w="5000" w:type="pct"/><w:tblLayout w:type="fixed"/>',
+      '<w:tblCellMar><w:top w:w="150" w:type="dxa"/><w:left w:w="150" w:type="dxa"/>',
+      '<w:bottom w:w="150" w:type="dxa"/><w:right w:w="150" w:type="dxa"/></w:tblCellMar></w:tblPr>',
+      `<w:tblGrid>${parties.map(() => `<w:gridCol w:w="${width}"/>`).join('')}</w:tblGrid>`,
+      `<w:tr>${parties.map(cell).join('')}</w:tr></w:tbl>`
+    ].join('\n');
+  };
+
+  // Статические части document.xml; {{date}}, {{total}} и т. п. — данные акта
+  const compileDocxLayout = (layout) => {
+    const { compileTemplate } = root.WbActs;
+    const { columns } = layout;
+    const tableWidth = Math.round(TEXT_WIDTH * layout.tableWidth / 100);
+    const widths = gridWidths(columns, tableWidth);
+    const last = columns.length - 1;
+    const innerWidth = widths.slice(1, -1).reduce((sum, width) => sum + width, 0);
+    const headerRow = '<w:tr><w:trPr><w:tblHeader/></w:trPr>';
+
+    const head = [
+      XML_HEADER + `<w:document xmlns:w="${W_NS}"><w:body>`,
+      blocksXml(layout.heading),
+      `<w:tbl><w:tblPr><w:tblStyle w:val="ActTable"/><w:tblW w:w="${tableWidth}" w:type="dxa"/>` +
+        '<w:jc w:val="center"/><w:tblLayout w:type="fixed"/></w:tblPr>',
+      `<w:tblGrid>${widths.map(width => `<w:gridCol w:w="${width}"/>`).join('')}</w:tblGrid>`,
+      // Первая и последняя колонки — на две строки шапки, остальные — под «Товар»
+      headerRow + headCell(columns[0].title, widths[0], '<w:vMerge w:val="restart"/>') +
+        headCell('Товар', innerWidth, `<w:gridSpan w:val="${last - 1}"/>`) +
+        headCell(columns[last].title, widths[last], '<w:vMerge w:val="restart"/>') + '</w:tr>',
+      headerRow + headCell('', widths[0], '<w:vMerge/>') +
+        columns.slice(1, -1).map((column, i) => headCell(column.title, widths[i + 1])).join('') +
+        headCell('', widths[last], '<w:vMerge/>') + '</w:tr>',
+      ''
+    ].join('\n');
+
+    const tail = [
+      `<w:tr><w:tc><w:tcPr><w:gridSpan w:val="${last}"/></w:tcPr>${paragraph(run('Итого', true), 'CellR')}</w:tc>` +
+        `<w:tc>${paragraph(run('{{total}}', true), 'CellR')}</w:tc></w:tr>`,
+      '</w:tbl>',
+      blocksXml(layout.footer),
+      EMPTY_LINE + '\n' + EMPTY_LINE,
+      requisitesXml(layout.requisites),
+      `<w:sectPr><w:pgSz w:w="${PAGE.width}" w:h="${PAGE.height}"/>` +
+        `<w:pgMar w:top="${PAGE.top}" w:right="${PAGE.right}" w:bottom="${PAGE.bottom}" w:left="${PAGE.left}" ` +
+        'w:header="709" w:footer="709" w:gutter="0"/></w:sectPr>',
+      '</w:body></w:document>'
+    ].join('\n');
+
+    return {
+      head: compileTemplate(head),
+      tail: compileTemplate(tail),
+      // Ячейка строки — готовые начало и конец, между ними только значение
+      cells: columns.map(column =>
+        `<w:tc><w:p>${paragraphProps(CELL_STYLES[column.align])}<w:r><w:t>`),
+      values: columns.map(column => column.value)
+    };
+  };
+
+  // Стиль по умолчанию (Normal) — текст ячеек таблицы: ячеек в акте тысячи, и в каждой
+  // не нужны свойства абзаца. Текст акта — стиль Body и основанные на нём
+  const styleXml = (layout) => {
+    const font = layout.font.split(',')[0].trim();
+    const style = (id, { basedOn = '', pPr = '', rPr = '' }) =>
+      `<w:style w:type="paragraph"${id === 'Normal' ? ' w:default="1"' : ' w:customStyle="1"'} w:styleId="${id}">` +
+      `<w:name w:val="${id}"/>${basedOn ? `<w:basedOn w:val="${basedOn}"/>` : ''}` +
+      `${pPr ? `<w:pPr>${pPr}</w:pPr>` : ''}${rPr ? `<w:rPr>${rPr}</w:rPr>` : ''}</w:style>`;
+    return [
+      XML_HEADER + `<w:styles xmlns:w="${W_NS}">`,
+      `<w:docDefaults><w:rPrDefault><w:rPr><w:rFonts w:ascii="${font}" w:hAnsi="${font}" w:cs="${font}" w:eastAsia="${font}"/>` +
+        '<w:sz w:val="22"/><w:szCs w:val="22"/><w:lang w:val="ru-RU"/></w:rPr></w:rPrDefault>' +
+        '<w:pPrDefault><w:pPr><w:spacing w:before="60" w:after="60" w:line="312" w:lineRule="auto"/></w:pPr></w:pPrDefault></w:docDefaults>',
+      style('Normal', {
+        pPr: '<w:spacing w:before="0" w:after="0" w:line="240" w:lineRule="auto"/><w:jc w:val="left"/>',
+        rPr: '<w:sz w:val="14"/><w:szCs w:val="14"/>'
+      }),
+      style('CellC', { basedOn: 'Normal', pPr: '<w:jc w:val="center"/>' }),
+      style('CellR', { basedOn: 'Normal', pPr: '<w:jc w:val="right"/>' }),
+      style('CellHead', { basedOn: 'Normal', pPr: '<w:jc w:val="center"/>', rPr: '<w:b/>' }),
+      style('Body', { pPr: layout.justify ? '<w:jc w:val="both"/>' : '' }),
+      style('Right', { basedOn: 'Body', pPr: '<w:jc w:val="right"/>' }),
+      style('ActTitle', {
+        basedOn: 'Body',
+        pPr: '<w:keepNext/><w:spacing w:before="240" w:after="240"/><w:jc w:val="center"/>',
+        rPr: '<w:b/><w:sz w:val="32"/><w:szCs w:val="32"/>'
+      }),
+      style('Requisites', {
+        pPr: '<w:spacing w:before="75" w:after="75" w:line="240" w:lineRule="auto"/><w:jc w:val="left"/>',
+        rPr: '<w:sz w:val="20"/><w:szCs w:val="20"/>'
+      }),
+      '<w:style w:type="table" w:customStyle="1" w:styleId="ActTable"><w:name w:val="ActTable"/><w:tblPr>' +
+        ['top', 'left', 'bottom', 'right', 'insideH', 'insideV']
+          .map(side => `<w:${side} w:val="single" w:sz="4" w:space="0" w:color="000000"/>`)
+          .reduce((borders, border) => borders + border, '<w:tblBorders>') + '</w:tblBorders>' +
+        '<w:tblCellMar><w:top w:w="15" w:type="dxa"/><w:left w:w="15" w:type="dxa"/>' +
+        '<w:bottom w:w="15" w:type="dxa"/><w:right w:w="15" w:type="dxa"/></w:tblCellMar></w:tblPr></w:style>',
+      '</w:styles>'
+    ].join('\n');
+  };
+
+  const CONTENT_TYPES = XML_HEADER +
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">' +
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>' +
+    '<Default Extension="xml" ContentType="application/xml"/>' +
+    '<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>' +
+    '<Override PartName="/word/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>' +
+    '<Override PartName="/docProps/core.xml" ContentType="application/vnd.openxmlformats-package.core-properties+xml"/>' +
+    '</Types>';
+
+  const PACKAGE_RELS = XML_HEADER +
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">' +
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>' +
+    '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/package/2006/relationships/metadata/core-properties" Target="docProps/core.xml"/>' +
+    '</Relationships>';
+
+  const DOCUMENT_RELS = XML_HEADER +
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">' +
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>' +
+    '</Relationships>';
+
+  const coreXml = (title) => XML_HEADER +
+    '<cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" ' +
+    'xmlns:dc="http://purl.org/dc/elements/1.1/">' +
+    `<dc:title>${escapeXml(title)}</dc:title><dc:language>ru-RU</dc:language></cp:coreProperties>`;
+
+  const compiledLayouts = {};
+
+  const getDocxLayout = (kind) => {
+    if (!compiledLayouts[kind]) {
+      const layout = root.WbActs.ACT_LAYOUTS[kind];
+      if (!layout) throw new Error(`Неизвестный тип акта: ${kind}`);
+      compiledLayouts[kind] = { ...compileDocxLayout(layout), styles: styleXml(layout), title: layout.title };
+    }
+    return compiledLayouts[kind];
+  };
+
+  // word/document.xml кусками примерно по CHUNK_SIZE символов — генератор,
+  // следующий кусок строится только когда предыдущий уже ушёл в сжатие
+  function* documentXmlChunks(kind, items, actDate, month = '') {
+    const layout = getDocxLayout(kind);
+    const data = root.WbActs.actData(kind, items, actDate, month);
+    const { cells, values } = layout;
+    let parts = [];
+    layout.head(data, parts);
+    let length = 0;
+    for (let index = 0; index < items.length; index++) {
+      const item = items[index];
+      let row = '<w:tr>';
+      for (let i = 0; i < cells.length; i++) {
+        row += cells[i] + String(values[i](item, index)).replace(INVALID_XML, '') + CELL_END;
+      }
+      parts.push(row + '</w:tr>\n');
+      length += row.length;
+      if (length >= CHUNK_SIZE) {
+        yield parts.join('');
+        parts = [];
+        length = 0;
+      }
+    }
+    layout.tail(data, parts);
+    yield parts.join('');
+  }
+
+  // Готовый .docx байтами (для ZIP с актами) — части пакета, document.xml потоком
+  const renderDocx = async (kind, items, actDate, month = '') => {
+    const { createZipEntry, createStreamedZipEntry, ZipWriter } = root.WbActs;
+    const layout = getDocxLayout(kind);
+    const encoder = new TextEncoder();
+    const zip = new ZipWriter();
+    zip.add(await createZipEntry('[Content_Types].xml', encoder.encode(CONTENT_TYPES)));
+    zip.add(await createZipEntry('_rels/.rels', encoder.encode(PACKAGE_RELS)));
+    zip.add(await createZipEntry('docProps/core.xml', encoder.encode(coreXml(layout.title))));
+    zip.add(await createStreamedZipEntry('word/document.xml', documentXmlChunks(kind, items, actDate, month)));
+    zip.add(await createZipEntry('word/styles.xml', encoder.encode(layout.styles)));
+    zip.add(await createZipEntry('word/_rels/document.xml.rels', encoder.encode(DOCUMENT_RELS)));
+    return new Uint8Array(await zip.finish().arrayBuffer());
+  };
+
+  root.WbActs = Object.assign(root.WbActs || {}, { DOCX_MIME, documentXmlChunks, renderDocx });
+})(typeof self !== 'undefined' ? self : this);
@@ -0,0 +1,255 @@
+// Кэш агрегированных позиций по месяцам.
+// Ключ — отпечаток содержимого листа (js/workbook-diff.js; для .xls — SHA-256
+// книги), отпечаток таблицы брендов и имя листа: неизменённый лист исправленной
+// выгрузки находит свои позиции и в новой книге.
+// В памяти — LRU с ограничением по размеру, между перезагрузками — IndexedDB.
+(function (root) {
+  // Меняется при изменении логики агрегации — старые записи перестают совпадать
+  const CACHE_VERSION = 1;
+  const DB_NAME = 'wb-acts-cache';
+  const ITEMS_STORE = 'items';
+  // Размер и время использования записей всех хранилищ — отдельно от самих записей,
+  // чтобы чистка их не читала. Позиции — под своим ключом, остальное — 'хранилище:ключ'
+  const META_STORE = 'meta';
+  const SHEETS_STORE = 'sheets';
+  // Отпечаток листа по каталогу ZIP -> отпечаток его содержимого
+  const FINGERPRINTS_STORE = 'fingerprints';
+
+  const toHex = (buffer) =>
+    Array.from(new Uint8Array(buffer), (byte) => byte.toString(16).padStart(2, '0')).join('');
+
+  // Без crypto.subtle (небезопасный контекст) кэш просто не используется
+  const sha256 = async (data) => {
+    if (!root.crypto || !root.crypto.subtle) return null;
+    const bytes = typeof data === 'string' ? new TextEncoder().encode(data) : data;
+    return toHex(await root.crypto.subtle.digest('SHA-256', bytes));
+  };
+
+  // Отпечаток скомпилированного каталога брендов (BrandResolver); без каталога — 'none'
+  const brandsFingerprint = async (resolver) => {
+    if (!resolver) return 'none';
+    return sha256(JSON.stringify(resolver));
+  };
+
+  const request = (req) => new Promise((resolve, reject) => {
+    req.onsuccess = () => resolve(req.result);
+    req.onerror = () => reject(req.error);
+  });
+
+  // Переполнение квоты прерывает транзакцию: приходит только abort, без error
+  const done = (tx) => new Promise((resolve, reject) => {
+    tx.oncomplete = () => resolve();
+    tx.onerror = tx.onabort = () => reject(tx.error || new Error('Транзакция прервана'));
+  });
+
+  // Обход курсора; visit возвращает false, чтобы остановиться
+  const each = (req, visit) => new Promise((resolve, reject) => {
+    req.onsuccess = () => {
+      const cursor = req.result;
+      if (!cursor || visit(cursor) === false) return resolve();
+      cursor.continue();
+    };
+    req.onerror = () => reject(req.error);
+  });
+
+  const metaKey = (store, id) => (store === ITEMS_STORE ? id : `${store}:${id}`);
+
+  class ItemsCache {
+    constructor({ maxMemoryBytes = 64 * 1024 * 1024, maxStoredBytes = 256 * 1024 * 1024 } = {}) {
+      this.maxMemoryBytes = maxMemoryBytes;
+      this.maxStoredBytes = maxStoredBytes;
+      this.memory = new Map();
+      this.memoryBytes = 0;
+      this.dbPromise = null;
+      // Байт в IndexedDB по таблице meta; null — ещё не считали.
+      // Таблица целиком обходится один раз, дальше сумма ведётся при записи
+      this.storedBytes = null;
+      this.storedBytesPromise = null;
+    }
+
+    key(sheetKey, brandsHash, sheetName) {
+      if (!sheetKey || !brandsHash) return null;
+      return `${CACHE_VERSION}:${sheetKey}:${brandsHash}:${sheetName}`;
+    }
+
+    db() {
+      if (!this.dbPromise) {
+        this.dbPromise = new Promise((resolve) => {
+          if (!root.indexedDB) return resolve(null);
+          const open = root.indexedDB.open(DB_NAME, 3);
+          open.onupgradeneeded = (event) => {
+            // Версия 1 — без хранилища отпечатков листов
+            if (event.oldVersion < 1) {
+              open.result.createObjectStore(ITEMS_STORE, { keyPath: 'key' });
+              const meta = open.result.createObjectStore(META_STORE, { keyPath: 'key' });
+              meta.createIndex('usedAt', 'usedAt');
+              open.result.createObjectStore(SHEETS_STORE, { keyPath: 'workbookHash' });
+            }
+            if (event.oldVersion < 2) {
+              open.result.createObjectStore(FINGERPRINTS_STORE, { keyPath: 'raw' });
+            }
+            // До версии 3 списки листов и отпечатки не учитывались в meta и не чистились
+            if (event.oldVersion >= 1 && event.oldVersion < 3) {
+              open.transaction.objectStore(SHEETS_STORE).clear();
+              open.transaction.objectStore(FINGERPRINTS_STORE).clear();
+            }
+          };
+          open.onsuccess = () => resolve(open.result);
+          // Приватный режим и т.п. — работаем только с памятью
+          open.onerror = () => resolve(null);
+        });
+      }
+      return this.dbPromise;
+    }
+
+    remember(key, items, size) {
+      const old = this.memory.get(key);
+      if (old) {
+        this.memory.delete(key);
+        this.memoryBytes -= old.size;
+      }
+      if (size > this.maxMemoryBytes) return;
+      this.memory.set(key, { items, size });
+      this.memoryBytes += size;
+      for (const [oldestKey, entry] of this.memory) {
+        if (this.memoryBytes <= this.maxMemoryBytes) break;
+        this.memory.delete(oldestKey);
+        this.memoryBytes -= entry.size;
+      }
+    }
+
+    recall(key) {
+      const entry = this.memory.get(key);
+      if (!entry) return undefined;
+      // Map хранит порядок вставки — переставляем запись в конец
+      this.memory.delete(key);
+      this.memory.set(key, entry);
+      return entry.items;
+    }
+
+    // Чтение записи из IndexedDB с отметкой времени использования
+    async read(store, id) {
+      const db = await this.db();
+      if (!db) return null;
+      try {
+        const tx = db.transaction([store, META_STORE], 'readwrite');
+        const record = await request(tx.objectStore(store).get(id));
+        if (!record) return null;
+        const meta = tx.objectStore(META_STORE);
+        const key = metaKey(store, id);
+        const usage = await request(meta.get(key));
+        if (usage) meta.put({ ...usage, usedAt: Date.now() });
+        return record;
+      } catch (error) {
+        console.warn('Кэш недоступен:', error);
+        return null;
+      }
+    }
+
+    async storedTotal(db) {
+      if (this.storedBytes !== null) return;
+      if (!this.storedBytesPromise) {
+        this.storedBytesPromise = (async () => {
+          const tx = db.transaction(META_STORE, 'readonly');
+          let total = 0;
+          await each(tx.objectStore(META_STORE).openCursor(), (cursor) => {
+            total += cursor.value.size;
+          });
+          return total;
+        })();
+      }
+      const total = await this.storedBytesPromise;
+      if (this.storedBytes === null) this.storedBytes = total;
+    }
+
+    // Запись в IndexedDB вместе с её размером в meta; при переполнении — чистка.
+    // Ошибка (в том числе квота) не мешает работе: запись остаётся только в памяти
+    async write(store, id, record, size) {
+      const db = await this.db();
+      if (!db) return;
+      try {
+        await this.storedTotal(db);
+        const tx = db.transaction([store, META_STORE], 'readwrite');
+        const meta = tx.objectStore(META_STORE);
+        const key = metaKey(store, id);
+        const old = await request(meta.get(key));
+        tx.objectStore(store).put(record);
+        meta.put({ key, store, id, size, usedAt: Date.now() });
+        await done(tx);
+        this.storedBytes += size - (old ? old.size : 0);
+        if (this.storedBytes > this.maxStoredBytes) await this.prune(db);
+      } catch (error) {
+        console.warn('Не удалось сохранить кэш:', error);
+      }
+    }
+
+    async get(key) {
+      if (!key) return null;
+      const cached = this.recall(key);
+      if (cached !== undefined) return cached;
+      const record = await this.read(ITEMS_STORE, key);
+      if (!record) return null;
+      this.remember(key, record.items, JSON.stringify(record.items).length * 2);
+      return record.items;
+    }
+
+    async set(key, items) {
+      if (!key) return;
+      // Приблизительный размер: строки в JS занимают по 2 байта на символ
+      const size = JSON.stringify(items).length * 2;
+      this.remember(key, items, size);
+      await this.write(ITEMS_STORE, key, { key, items }, size);
+    }
+
+    // Удаляет давно не использованные записи всех хранилищ с запасом в десятую
+    // часть предела, чтобы следующие записи не чистили снова
+    async prune(db) {
+      const stores = [ITEMS_STORE, SHEETS_STORE, FINGERPRINTS_STORE, META_STORE];
+      const tx = db.transaction(stores, 'readwrite');
+      const target = this.maxStoredBytes * 0.9;
+      let total = this.storedBytes;
+      // Индекс usedAt отдаёт записи от давно неиспользованных к свежим
+      await each(tx.objectStore(META_STORE).index('usedAt').openCursor(), (cursor) => {
+        if (total <= target) return false;
+        const { store = ITEMS_STORE, id = cursor.value.key, size } = cursor.value;
+        tx.objectStore(store).delete(id);
+        cursor.delete();
+        total -= size;
+      });
+      await done(tx);
+      this.storedBytes = total;
+    }
+
+    async getSheetNames(workbookHash) {
+      if (!workbookHash) return null;
+      const record = await this.read(SHEETS_STORE, workbookHash);
+      return record ? record.sheetNames : null;
+    }
+
+    async setSheetNames(workbookHash, sheetNames) {
+      if (!workbookHash) return;
+      const record = { workbookHash, sheetNames };
+      await this.write(SHEETS_STORE, workbookHash, record, JSON.stringify(record).length * 2);
+    }
+
+    // Отпечатки держатся в той же памяти LRU, что и позиции
+    async getFingerprint(raw) {
+      if (!raw) return null;
+      const cached = this.recall(`${FINGERPRINTS_STORE}:${raw}`);
+      if (cached !== undefined) return cached;
+      const record = await this.read(FINGERPRINTS_STORE, raw);
+      if (!record) return null;
+      this.remember(`${FINGERPRINTS_STORE}:${raw}`, record.content, (raw.length + record.content.length) * 2);
+      return record.content;
+    }
+
+    async setFingerprint(raw, content) {
+      if (!raw || !content) return;
+      const size = (raw.length + content.length) * 2;
+      this.remember(`${FINGERPRINTS_STORE}:${raw}`, content, size);
+      await this.write(FINGERPRINTS_STORE, raw, { raw, content }, size);
+    }
+  }
+
+  root.WbActs = Object.assign(root.WbActs || {}, { ItemsCache, sha256, brandsFingerprint });
+})(typeof self !== 'undefined' ? self : this);
@@ -0,0 +1,180 @@
+// Повторная загрузка исправленной выгрузки: отпечатки листов, разница по месяцам
+// и устаревшие акты.
+//
+// Ключ листа в кэше позиций — отпечаток его содержимого, а не всей книги: правка
+// одного месяца не сбрасывает кэш остальных. Отпечаток из центрального каталога
+// ZIP (CRC-32 и размер XML листа и общих строк) бесплатен, но Excel при сохранении
+// перенумеровывает общие строки, и XML нетронутых листов тоже меняется. Поэтому
+// по нему ищется отпечаток содержимого — SHA-256 значений ячеек. Если правка
+// дописала новые общие строки, CRC sharedStrings.xml меняется у всех листов;
+// тогда нетронутый лист узнаётся по своему XML и тем общим строкам, на которые
+// он ссылается. И только если не нашлось и так, лист читается потоком (без
+// SheetJS и агрегации).
+(function (root) {
+  // Строк в одном куске хэша: результат не зависит от того, как распаковка
+  // нарезала поток, и строка на весь лист не собирается
+  const ROWS_PER_DIGEST = 5000;
+
+  // SHA-256 значений всех строк листа; null — если нет crypto.subtle
+  const contentFingerprint = async (reader, sheetName, { signal } = {}) => {
+    const { sha256 } = root.WbActs;
+    const digests = [];
+    let rows = [];
+    const flush = async () => {
+      digests.push(await sha256(JSON.stringify(rows)));
+      rows = [];
+    };
+    for await (const batch of reader.rowBatches(sheetName, { signal })) {
+      for (const row of batch) {
+        rows.push(row);
+        if (rows.length === ROWS_PER_DIGEST) await flush();
+      }
+    }
+    await flush();
+    if (digests.includes(null)) return null;
+    return digests.length === 1 ? digests[0] : sha256(digests.join(''));
+  };
+
+  // Сколько общих строк затрагивает XML листа — зависит только от самого XML
+  const sharedUsedKey = (reader, sheetName) => `${reader.sheetXmlFingerprint(sheetName)}/shared-used`;
+
+  // Ключ содержимого по XML листа и нужным ему общим строкам; null — не встречался
+  const stringsSheetKey = async (reader, sheetName, cache) => {
+    const used = await cache.getFingerprint(sharedUsedKey(reader, sheetName));
+    if (used == null) return null;
+    const fingerprint = await reader.stringsFingerprint(sheetName, Number(used));
+    return fingerprint ? cache.getFingerprint(fingerprint) : null;
+  };
+
+  /**
+   * Ключи содержимого всех листов книги для ItemsCache.key.
+   * reader — XlsxStreamReader; cache — ItemsCache (отпечатки каталога -> содержимого);
+   * onProgress(done, total, sheetName) — после каждого листа.
+   * Результат: { keys: Map лист -> ключ, scanned: листы, прочитанные потоком }
+   * или null, если браузер не умеет SHA-256.
+   */
+  const fingerprintSheets = async (reader, cache, { signal, onProgress } = {}) => {
+    const keys = new Map();
+    const scanned = [];
+    const names = reader.sheetNames;
+    for (const [index, sheetName] of names.entries()) {
+      const raw = reader.sheetFingerprint(sheetName);
+      let content = await cache.getFingerprint(raw) || await stringsSheetKey(reader, sheetName, cache);
+      if (!content) {
+        content = await contentFingerprint(reader, sheetName, { signal });
+        if (!content) return null;
+        scanned.push(sheetName);
+        await cache.setFingerprint(raw, content);
+        const used = reader.sharedStringsUsed(sheetName);
+        const fingerprint = await reader.stringsFingerprint(sheetName, used);
+        await cache.setFingerprint(sharedUsedKey(reader, sheetName), String(used));
+        if (fingerprint) await cache.setFingerprint(fingerprint, content);
+      }
+      keys.set(sheetName, content);
+      if (onProgress) onProgress(index + 1, names.length, sheetName);
+    }
+    return { keys, scanned };
+  };
+
+  // Копейки: суммы складываются в double, сравниваем с допуском
+  const isZero = (value) => Math.abs(value) < 0.005;
+
+  /**
+   * Разница позиций месяца между загрузками (по SKU).
+   * Результат: { added, removed, changed: [{ sku, name, quantity, totalPrice }],
+   * quantity, totalPrice } — у позиций и в итоге приращения «стало минус было».
+   */
+  const diffItems = (before, after) => {
+    const previous = new Map(before.map(item => [String(item.sku), item]));
+    const diff = { added: [], removed: [], changed: [], quantity: 0, totalPrice: 0 };
+
+    for (const item of after) {
+      const sku = String(item.sku);
+      const old = previous.get(sku);
+      previous.delete(sku);
+      const delta = {
+        sku,
+        name: item.name,
+        quantity: item.quantity - (old ? old.quantity : 0),
+        totalPrice: item.totalPrice - (old ? old.totalPrice : 0)
+      };
+      diff.quantity += delta.quantity;
+      diff.totalPrice += delta.totalPrice;
+      if (!old) diff.added.push(delta);
+      else if (delta.quantity || !isZero(delta.totalPrice)) diff.changed.push(delta);
+    }
+
+    for (const [sku, old] of previous) {
+      diff.removed.push({ sku, name: old.name, quantity: -old.quantity, totalPrice: -old.totalPrice });
+      diff.quantity -= old.quantity;
+      diff.totalPrice -= old.totalPrice;
+    }
+    return diff;
+  };
+
+  const isEmptyDiff = (diff) =>
+    !diff.added.length && !diff.removed.length && !diff.changed.length && isZero(diff.totalPrice);
+
+  // Листы двух загрузок (Map лист -> ключ): новые, удалённые, изменённые и число прочих
+  const compareSheets = (before, after) => {
+    const sheets = { added: [], removed: [], changed: [], unchanged: 0 };
+    for (const [sheetName, key] of after) {
+      if (!before.has(sheetName)) sheets.added.push(sheetName);
+      else if (before.get(sheetName) !== key) sheets.changed.push(sheetName);
+      else sheets.unchanged += 1;
+    }
+    for (const sheetName of before.keys()) {
+      if (!after.has(sheetName)) sheets.removed.push(sheetName);
+    }
+    return sheets;
+  };
+
+  // Сгенерированные акты: вид и месяц -> ключ позиций (ItemsCache.key) и дата акта.
+  // Акт устарел, если ключ позиций его месяца сменился: поменялся лист или каталог брендов
+  class GeneratedActs {
+    constructor() {
+      this.acts = new Map();
+    }
+
+    record(kind, month, itemsKey, actDate) {
+      if (!itemsKey) return;
+      this.acts.set(`${kind}\u0000${month}`, { kind, month, itemsKey, actDate });
+    }
+
+    // Лист месяца сменился, но позиции те же: акты по прежнему ключу не устарели
+    confirm(month, previousKey, itemsKey) {
+      for (const act of this.acts.values()) {
+        if (act.month === month && act.itemsKey === previousKey) act.itemsKey = itemsKey;
+      }
+    }
+
+    // itemsKeyOf(month) — текущий ключ позиций месяца, null — листа больше нет.
+    // У актов удалённых месяцев removed: true — перегенерировать их не из чего
+    stale(itemsKeyOf) {
+      const result = [];
+      for (const act of this.acts.values()) {
+        const itemsKey = itemsKeyOf(act.month);
+        if (itemsKey !== act.itemsKey) result.push({ ...act, removed: !itemsKey });
+      }
+      return result;
+    }
+
+    // { месяц: { вид: дата } } для generateAllActs({ actDates })
+    static datesByMonth(acts) {
+      const dates = {};
+      for (const act of acts) {
+        dates[act.month] = Object.assign(dates[act.month] || {}, { [act.kind]: act.actDate });
+      }
+      return dates;
+    }
+  }
+
+  root.WbActs = Object.assign(root.WbActs || {}, {
+    contentFingerprint,
+    fingerprintSheets,
+    diffItems,
+    isEmptyDiff,
+    compareSheets,
+    GeneratedActs
+  });
+})(typeof self !== 'undefined' ? self : this);
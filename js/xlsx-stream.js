@@ -0,0 +1,496 @@
+// Потоковое чтение XLSX в браузере — аналог wb_acts/xlsx.py.
+// Книга не загружается в память целиком: из File/Blob читается только
+// центральный каталог ZIP, нужные записи распаковываются DecompressionStream
+// и разбираются кусками. Строки листа отдаются пачками по мере распаковки,
+// поэтому в памяти держатся только общие строки и текущая пачка строк.
+(function (root) {
+  const EOCD_SIGNATURE = 0x06054B50;
+  const ZIP64_LOCATOR_SIGNATURE = 0x07064B50;
+  const CENTRAL_SIGNATURE = 0x02014B50;
+  const MAX_U32 = 0xFFFFFFFF;
+
+  const u64 = (view, offset) =>
+    view.getUint32(offset, true) + view.getUint32(offset + 4, true) * 2 ** 32;
+
+  const readBytes = async (blob, start, end) => new DataView(await blob.slice(start, end).arrayBuffer());
+
+  // Центральный каталог ZIP: имя записи -> { method, crc, size, compressedSize, offset }
+  const readZipDirectory = async (blob) => {
+    // Конец каталога (22 байта) + комментарий до 64 КБ + локатор ZIP64 (20 байт)
+    const tailStart = Math.max(0, blob.size - (22 + 0xFFFF + 20));
+    const tail = await readBytes(blob, tailStart, blob.size);
+    let eocd = -1;
+    for (let i = tail.byteLength - 22; i >= 0; i--) {
+      if (tail.getUint32(i, true) === EOCD_SIGNATURE) {
+        eocd = i;
+        break;
+      }
+    }
+    if (eocd < 0) throw new Error('Файл не является книгой XLSX');
+
+    let count = tail.getUint16(eocd + 10, true);
+    let size = tail.getUint32(eocd + 12, true);
+    let offset = tail.getUint32(eocd + 16, true);
+    if (offset === MAX_U32 && eocd >= 20 && tail.getUint32(eocd - 20, true) === ZIP64_LOCATOR_SIGNATURE) {
+      const zip64Offset = u64(tail, eocd - 20 + 8);
+      const zip64 = await readBytes(blob, zip64Offset, zip64Offset + 56);
+      count = u64(zip64, 32);
+      size = u64(zip64, 40);
+      offset = u64(zip64, 48);
+    }
+
+    const directory = await readBytes(blob, offset, offset + size);
+    const decoder = new TextDecoder();
+    const entries = new Map();
+    let pos = 0;
+    for (let n = 0; n < count && directory.getUint32(pos, true) === CENTRAL_SIGNATURE; n++) {
+      const nameLength = directory.getUint16(pos + 28, true);
+      const extraLength = directory.getUint16(pos + 30, true);
+      const commentLength = directory.getUint16(pos + 32, true);
+      const entry = {
+        method: directory.getUint16(pos + 10, true),
+        crc: directory.getUint32(pos + 16, true),
+        size: directory.getUint32(pos + 24, true),
+        compressedSize: directory.getUint32(pos + 20, true),
+        offset: directory.getUint32(pos + 42, true)
+      };
+      const name = decoder.decode(new Uint8Array(directory.buffer, pos + 46, nameLength));
+
+      // Большие записи: размеры и смещение — в дополнительном поле ZIP64
+      let extra = pos + 46 + nameLength;
+      const extraEnd = extra + extraLength;
+      while (extra + 4 <= extraEnd) {
+        const id = directory.getUint16(extra, true);
+        const length = directory.getUint16(extra + 2, true);
+        if (id === 0x0001) {
+          let field = extra + 4;
+          if (entry.size === MAX_U32) {
+            entry.size = u64(directory, field);
+            field += 8;
+          }
+          if (entry.compressedSize === MAX_U32) {
+            entry.compressedSize = u64(directory, field);
+            field += 8;
+          }
+          if (entry.offset === MAX_U32) entry.offset = u64(directory, field);
+        }
+        extra += 4 + length;
+      }
+
+      entries.set(name, entry);
+      pos = extraEnd + commentLength;
+    }
+    return entries;
+  };
+
+  const ENTITIES = { amp: '&', lt: '<', gt: '>', quot: '"', apos: "'" };
+
+  const decodeXml = (text) => (text.indexOf('&') < 0 ? text : text.replace(
+    /&(#x[0-9a-fA-F]+|#\d+|\w+);/g,
+    (match, entity) => {
+      if (entity[0] !== '#') return ENTITIES[entity] || match;
+      return String.fromCodePoint(entity[1] === 'x' ? parseInt(entity.slice(2), 16) : Number(entity.slice(1)));
+    }
+  ));
+
+  // Теги бывают с префиксом (x:row) — сравниваем только локальное имя
+  const localName = (name) => name.slice(name.indexOf(':') + 1);
+
+  const attributePatterns = new Map();
+
+  const attribute = (tag, name) => {
+    let pattern = attributePatterns.get(name);
+    if (!pattern) {
+      pattern = new RegExp(`\\s${name}\\s*=\\s*(?:"([^"]*)"|'([^']*)')`);
+      attributePatterns.set(name, pattern);
+    }
+    const match = pattern.exec(tag);
+    return match ? (match[1] !== undefined ? match[1] : match[2]) : null;
+  };
+
+  // Открывающий тег целиком: значения атрибутов в кавычках могут содержать '>'
+  const TAG = `(?:[^>"']|"[^"]*"|'[^']*')*>`;
+
+  // Конец тега, начатого в from: первый '>' вне кавычек; -1 — тег не закончен
+  const tagEnd = (buffer, from) => {
+    let quote = 0;
+    for (let i = from; i < buffer.length; i++) {
+      const code = buffer.charCodeAt(i);
+      if (quote) {
+        if (code === quote) quote = 0;
+      } else if (code === 62) {
+        return i;
+      } else if (code === 34 || code === 39) {
+        quote = code;
+      }
+    }
+    return -1;
+  };
+
+  // workbook.xml и связи разбираются регулярными выражениями — без комментариев
+  const stripComments = (xml) => xml.replace(/<!--[\s\S]*?-->/g, '');
+
+  // Текст CDATA отдаётся обработчику экранированным, как обычный текст:
+  // обработчики сами раскрывают сущности (decodeXml)
+  const escapeXml = (text) => text.replace(/&/g, '&amp;').replace(/</g, '&lt;');
+
+  // Разбор XML кусками: теги и текст между ними передаются обработчикам.
+  // Комментарии, инструкции обработки и <!DOCTYPE> пропускаются, CDATA — текст.
+  // Незаконченный тег или текст переносится в начало следующего куска.
+  class XmlScanner {
+    constructor({ open, close, text }) {
+      this.open = open;
+      this.close = close;
+      this.text = text;
+      this.rest = '';
+    }
+
+    push(chunk) {
+      const buffer = this.rest + chunk;
+      let pos = 0;
+      while (pos < buffer.length) {
+        const lt = buffer.indexOf('<', pos);
+        if (lt < 0) break;
+        if (lt > pos) this.text(buffer, pos, lt);
+        const first = buffer.charCodeAt(lt + 1);
+        if (first === 33 || first === 63) {
+          // <!-- ... -->, <![CDATA[ ... ]]>, <?...?>, <!DOCTYPE ...>
+          const end = this.special(buffer, lt);
+          if (end < 0) {
+            pos = lt;
+            break;
+          }
+          pos = end;
+          continue;
+        }
+        const gt = first === 47 ? buffer.indexOf('>', lt) : tagEnd(buffer, lt + 1);
+        if (gt < 0) {
+          pos = lt;
+          break;
+        }
+        if (first === 47) {
+          // </name>
+          this.close(localName(buffer.slice(lt + 2, gt).trim()));
+        } else {
+          const selfClosing = buffer.charCodeAt(gt - 1) === 47;
+          const tagEnd = selfClosing ? gt - 1 : gt;
+          // Имя тега — до первого пробельного символа
+          let nameEnd = lt + 1;
+          while (nameEnd < tagEnd && buffer.charCodeAt(nameEnd) > 32) nameEnd++;
+          const name = localName(buffer.slice(lt + 1, nameEnd));
+          this.open(name, buffer.slice(nameEnd, tagEnd));
+          if (selfClosing) this.close(name);
+        }
+        pos = gt + 1;
+      }
+      this.rest = buffer.slice(pos);
+    }
+
+    // Разметка, начатая с '<!' или '<?', в позиции lt: позиция после неё
+    // или -1, если она ещё не дочитана. Текст CDATA передаётся обработчику
+    special(buffer, lt) {
+      if (buffer.startsWith('<!--', lt)) {
+        const end = buffer.indexOf('-->', lt + 4);
+        return end < 0 ? -1 : end + 3;
+      }
+      if (buffer.startsWith('<![CDATA[', lt)) {
+        const end = buffer.indexOf(']]>', lt + 9);
+        if (end < 0) return -1;
+        const text = escapeXml(buffer.slice(lt + 9, end));
+        if (text) this.text(text, 0, text.length);
+        return end + 3;
+      }
+      if (buffer.charCodeAt(lt + 1) === 63) {
+        const end = buffer.indexOf('?>', lt + 2);
+        return end < 0 ? -1 : end + 2;
+      }
+      // Начало ещё не дочитано — нельзя понять, комментарий это или CDATA
+      if (buffer.length - lt < 9 && ('<![CDATA['.startsWith(buffer.slice(lt)) || '<!--'.startsWith(buffer.slice(lt)))) {
+        return -1;
+      }
+      const end = tagEnd(buffer, lt + 2);
+      return end < 0 ? -1 : end + 1;
+    }
+  }
+
+  const columnIndexes = new Map();
+
+  // Индекс колонки по ссылке на ячейку: A1 -> 0, AB12 -> 27
+  const columnIndex = (ref) => {
+    let end = 0;
+    while (end < ref.length && ref.charCodeAt(end) >= 65) end++;
+    const letters = ref.slice(0, end);
+    let index = columnIndexes.get(letters);
+    if (index === undefined) {
+      index = 0;
+      for (let i = 0; i < letters.length; i++) index = index * 26 + letters.charCodeAt(i) - 64;
+      index -= 1;
+      columnIndexes.set(letters, index);
+    }
+    return index;
+  };
+
+  class XlsxStreamReader {
+    constructor(blob, entries, sheets) {
+      this.blob = blob;
+      this.entries = entries;
+      // Имя листа -> путь записи в архиве, в порядке книги
+      this.sheets = sheets;
+      this.sharedStrings = null;
+      // Лист -> сколько первых общих строк он может затрагивать (после rowBatches)
+      this.sharedUsed = new Map();
+      this.sharedDigests = new Map();
+    }
+
+    // DecompressionStream('deflate-raw') нужен для записей, сжатых deflate
+    static get supported() {
+      if (typeof DecompressionStream === 'undefined' || typeof TextDecoderStream === 'undefined') return false;
+      try {
+        new DecompressionStream('deflate-raw');
+        return true;
+      } catch (error) {
+        return false;
+      }
+    }
+
+    // true, если файл — ZIP (XLSX), а не старый двоичный XLS
+    static async isZip(blob) {
+      const head = new Uint8Array(await blob.slice(0, 2).arrayBuffer());
+      return head[0] === 0x50 && head[1] === 0x4B;
+    }
+
+    static async open(blob) {
+      const entries = await readZipDirectory(blob);
+      const reader = new XlsxStreamReader(blob, entries, new Map());
+      if (!entries.has('xl/workbook.xml') || !entries.has('xl/_rels/workbook.xml.rels')) {
+        throw new Error('В книге нет xl/workbook.xml');
+      }
+
+      const targets = new Map();
+      const rels = stripComments(await reader.readText('xl/_rels/workbook.xml.rels'));
+      for (const match of rels.matchAll(new RegExp(`<(?:\\w+:)?Relationship\\b${TAG}`, 'g'))) {
+        targets.set(attribute(match[0], 'Id'), attribute(match[0], 'Target'));
+      }
+      const workbook = stripComments(await reader.readText('xl/workbook.xml'));
+      for (const match of workbook.matchAll(new RegExp(`<(?:\\w+:)?sheet\\b${TAG}`, 'g'))) {
+        const target = targets.get(attribute(match[0], '\\w+:id'));
+        if (!target) continue;
+        const path = target.startsWith('/') ? target.slice(1) : `xl/${target.replace(/^\.\//, '')}`;
+        reader.sheets.set(decodeXml(attribute(match[0], 'name') || ''), path);
+      }
+      return reader;
+    }
+
+    get sheetNames() {
+      return Array.from(this.sheets.keys());
+    }
+
+    // Поток текста записи и число сжатых байт (для прогресса)
+    async openEntry(name, onBytes = () => {}) {
+      const entry = this.entries.get(name);
+      if (!entry) throw new Error(`В книге нет ${name}`);
+      const header = await readBytes(this.blob, entry.offset, entry.offset + 30);
+      const start = entry.offset + 30 + header.getUint16(26, true) + header.getUint16(28, true);
+      let stream = this.blob.slice(start, start + entry.compressedSize).stream()
+        .pipeThrough(new TransformStream({
+          transform(chunk, controller) {
+            onBytes(chunk.byteLength);
+            controller.enqueue(chunk);
+          }
+        }));
+      if (entry.method === 8) stream = stream.pipeThrough(new DecompressionStream('deflate-raw'));
+      return stream.pipeThrough(new TextDecoderStream());
+    }
+
+    // Небольшие служебные записи (workbook.xml, связи) читаем целиком
+    async readText(name) {
+      const reader = (await this.openEntry(name)).getReader();
+      let text = '';
+      for (;;) {
+        const { done, value } = await reader.read();
+        if (done) return text;
+        text += value;
+      }
+    }
+
+    // Перебор кусков текста записи с проверкой отмены между кусками
+    async scan(name, scanner, signal, onBytes) {
+      const reader = (await this.openEntry(name, onBytes)).getReader();
+      try {
+        for (;;) {
+          if (signal) signal.throwIfAborted();
+          const { done, value } = await reader.read();
+          if (done) return;
+          scanner.push(value);
+        }
+      } finally {
+        reader.cancel().catch(() => {});
+      }
+    }
+
+    // Отпечаток записи по центральному каталогу (CRC-32 и размер) — без распаковки
+    entryFingerprint(name) {
+      const entry = this.entries.get(name);
+      return entry ? `${entry.crc.toString(16)}-${entry.size}` : '';
+    }
+
+    // Отпечаток XML листа вместе с общими строками: если он совпал, совпало и
+    // содержимое. Обратное неверно — Excel при сохранении перенумеровывает общие
+    // строки, и XML нетронутых листов тоже меняется (см. js/workbook-diff.js)
+    sheetFingerprint(sheetName) {
+      const path = this.sheets.get(sheetName);
+      if (!path) return '';
+      return `${this.entryFingerprint(path)}/${this.entryFingerprint('xl/sharedStrings.xml')}`;
+    }
+
+    // Отпечаток одного XML листа, без общих строк
+    sheetXmlFingerprint(sheetName) {
+      const path = this.sheets.get(sheetName);
+      return path ? this.entryFingerprint(path) : '';
+    }
+
+    // Номер самой дальней общей строки листа плюс один; undefined — лист не дочитан
+    sharedStringsUsed(sheetName) {
+      return this.sharedUsed.get(sheetName);
+    }
+
+    // Отпечаток листа, не зависящий от хвоста общих строк: XML листа и SHA-256
+    // первых used общих строк — всех, на которые он ссылается. Строка, которую
+    // правка другого листа дописала в конец sharedStrings.xml, его не меняет.
+    // '' — столько общих строк в книге нет; null — нет crypto.subtle
+    async stringsFingerprint(sheetName, used) {
+      const shared = await this.loadSharedStrings();
+      if (used > shared.length) return '';
+      if (!this.sharedDigests.has(used)) {
+        this.sharedDigests.set(used, await root.WbActs.sha256(shared.slice(0, used).join('\u0000')));
+      }
+      const digest = this.sharedDigests.get(used);
+      return digest && `${this.sheetXmlFingerprint(sheetName)}/${used}:${digest}`;
+    }
+
+    compressedSize(name) {
+      const entry = this.entries.get(name);
+      return entry ? entry.compressedSize : 0;
+    }
+
+    async loadSharedStrings(signal, onBytes) {
+      if (this.sharedStrings) return this.sharedStrings;
+      const strings = [];
+      if (this.entries.has('xl/sharedStrings.xml')) {
+        let parts = [];
+        let capture = false;
+        let phonetic = 0;
+        await this.scan('xl/sharedStrings.xml', new XmlScanner({
+          open: (name) => {
+            if (name === 't') capture = !phonetic;
+            else if (name === 'rPh') phonetic++;
+          },
+          close: (name) => {
+            if (name === 't') capture = false;
+            else if (name === 'rPh') phonetic--;
+            else if (name === 'si') {
+              strings.push(decodeXml(parts.length === 1 ? parts[0] : parts.join('')));
+              parts = [];
+            }
+          },
+          text: (buffer, start, end) => {
+            if (capture) parts.push(buffer.slice(start, end));
+          }
+        }), signal, onBytes);
+      }
+      this.sharedStrings = strings;
+      return strings;
+    }
+
+    // Строки листа пачками (по одной на распакованный кусок); пустые строки пропускаются.
+    // onProgress({ loaded, total }) — сжатые байты общих строк и листа, не чаще раза на 1%.
+    async *rowBatches(sheetName = this.sheetNames[0], { signal, onProgress } = {}) {
+      const path = this.sheets.get(sheetName);
+      if (!path) throw new Error(`Лист "${sheetName}" не найден`);
+
+      const total = (this.sharedStrings ? 0 : this.compressedSize('xl/sharedStrings.xml')) + this.compressedSize(path);
+      let loaded = 0;
+      let reported = -1;
+      const onBytes = (bytes) => {
+        loaded += bytes;
+        const percent = total ? Math.floor(loaded / total * 100) : 100;
+        if (onProgress && percent !== reported) {
+          reported = percent;
+          onProgress({ loaded, total });
+        }
+      };
+
+      const shared = await this.loadSharedStrings(signal, onBytes);
+
+      let batch = [];
+      let used = 0;
+      let row = [];
+      let column = 0;
+      let kind = 'n';
+      let text = '';
+      let capture = false;
+      let phonetic = 0;
+      const scanner = new XmlScanner({
+        open: (name, tag) => {
+          if (name === 'c') {
+            const ref = attribute(tag, 'r');
+            column = ref ? columnIndex(ref) : row.length;
+            kind = attribute(tag, 't') || 'n';
+            text = '';
+          } else if (name === 'v' || (name === 't' && !phonetic)) {
+            capture = true;
+          } else if (name === 'row') {
+            row = [];
+          } else if (name === 'rPh') {
+            phonetic++;
+          }
+        },
+        close: (name) => {
+          if (name === 'c') {
+            if (!text) return;
+            if (kind === 's') {
+              const index = Number(text);
+              if (index >= used) used = index + 1;
+              row[column] = shared[index];
+            }
+            else if (kind === 'n') row[column] = Number(text);
+            else if (kind === 'b') row[column] = text === '1';
+            // inlineStr, str (формула), e (ошибка), d (дата ISO)
+            else row[column] = decodeXml(text);
+          } else if (name === 'v' || name === 't') {
+            capture = false;
+          } else if (name === 'row') {
+            if (row.length) batch.push(row);
+          } else if (name === 'rPh') {
+            phonetic--;
+          }
+        },
+        text: (buffer, start, end) => {
+          if (capture) text += buffer.slice(start, end);
+        }
+      });
+
+      const reader = (await this.openEntry(path, onBytes)).getReader();
+      try {
+        for (;;) {
+          if (signal) signal.throwIfAborted();
+          const { done, value } = await reader.read();
+          if (done) break;
+          scanner.push(value);
+          if (batch.length) {
+            const rows = batch;
+            batch = [];
+            yield rows;
+          }
+        }
+        this.sharedUsed.set(sheetName, used);
+      } finally {
+        reader.cancel().catch(() => {});
+      }
+    }
+  }
+
+  root.WbActs = Object.assign(root.WbActs || {}, {
+    XlsxStreamReader
+  });
+})(typeof self !== 'undefined' ? self : this);
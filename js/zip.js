@@ -0,0 +1,144 @@
+// Минимальная запись ZIP для пакетной выгрузки актов.
+// Записи сжимаются там, где создаются (в воркере), на странице архив только
+// склеивается из готовых кусков в Blob — без повторного копирования данных.
+(function (root) {
+  const CRC_TABLE = (() => {
+    const table = new Uint32Array(256);
+    for (let n = 0; n < 256; n++) {
+      let c = n;
+      for (let k = 0; k < 8; k++) {
+        c = c & 1 ? 0xEDB88320 ^ (c >>> 1) : c >>> 1;
+      }
+      table[n] = c >>> 0;
+    }
+    return table;
+  })();
+
+  // previous — CRC предыдущих кусков, если запись считается по частям
+  const crc32 = (bytes, previous = 0) => {
+    let crc = (previous ^ 0xFFFFFFFF) >>> 0;
+    for (let i = 0; i < bytes.length; i++) {
+      crc = CRC_TABLE[(crc ^ bytes[i]) & 0xFF] ^ (crc >>> 8);
+    }
+    return (crc ^ 0xFFFFFFFF) >>> 0;
+  };
+
+  // CompressionStream('deflate-raw') есть не во всех браузерах — тогда без сжатия
+  const deflateRaw = async (bytes) => {
+    try {
+      const stream = new Blob([bytes]).stream().pipeThrough(new CompressionStream('deflate-raw'));
+      return new Uint8Array(await new Response(stream).arrayBuffer());
+    } catch (error) {
+      return null;
+    }
+  };
+
+  const createZipEntry = async (name, bytes) => {
+    const compressed = typeof CompressionStream !== 'undefined' ? await deflateRaw(bytes) : null;
+    const deflated = compressed && compressed.length < bytes.length;
+    return {
+      name,
+      crc: crc32(bytes),
+      size: bytes.length,
+      method: deflated ? 8 : 0,
+      data: deflated ? compressed : bytes
+    };
+  };
+
+  // Запись из последовательности кусков (строк или байт), которая выдаётся лениво:
+  // куски по одному кодируются, учитываются в CRC и уходят в CompressionStream,
+  // поэтому несжатый файл целиком в памяти не собирается
+  const createStreamedZipEntry = async (name, chunks) => {
+    const encoder = new TextEncoder();
+    const iterator = chunks[Symbol.iterator]();
+    let crc = 0;
+    let size = 0;
+    const source = new ReadableStream({
+      pull(controller) {
+        const { done, value } = iterator.next();
+        if (done) {
+          controller.close();
+          return;
+        }
+        const bytes = typeof value === 'string' ? encoder.encode(value) : value;
+        crc = crc32(bytes, crc);
+        size += bytes.length;
+        controller.enqueue(bytes);
+      }
+    });
+
+    if (typeof CompressionStream === 'undefined') {
+      const data = new Uint8Array(await new Response(source).arrayBuffer());
+      return { name, crc, size, method: 0, data };
+    }
+    const stream = source.pipeThrough(new CompressionStream('deflate-raw'));
+    const data = new Uint8Array(await new Response(stream).arrayBuffer());
+    return { name, crc, size, method: 8, data };
+  };
+
+  const dosDateTime = (date) => ({
+    time: (date.getHours() << 11) | (date.getMinutes() << 5) | (date.getSeconds() >> 1),
+    date: ((date.getFullYear() - 1980) << 9) | ((date.getMonth() + 1) << 5) | date.getDate()
+  });
+
+  // Бит 11 — имена файлов в UTF-8 (кириллица в названиях актов)
+  const UTF8_FLAG = 0x0800;
+
+  class ZipWriter {
+    constructor(date = new Date()) {
+      this.parts = [];
+      this.central = [];
+      this.offset = 0;
+      this.stamp = dosDateTime(date);
+      this.encoder = new TextEncoder();
+    }
+
+    add(entry) {
+      const name = this.encoder.encode(entry.name);
+      const header = new DataView(new ArrayBuffer(30));
+      header.setUint32(0, 0x04034B50, true);
+      header.setUint16(4, 20, true);
+      header.setUint16(6, UTF8_FLAG, true);
+      header.setUint16(8, entry.method, true);
+      header.setUint16(10, this.stamp.time, true);
+      header.setUint16(12, this.stamp.date, true);
+      header.setUint32(14, entry.crc, true);
+      header.setUint32(18, entry.data.length, true);
+      header.setUint32(22, entry.size, true);
+      header.setUint16(26, name.length, true);
+      header.setUint16(28, 0, true);
+
+      const record = new DataView(new ArrayBuffer(46));
+      record.setUint32(0, 0x02014B50, true);
+      record.setUint16(4, 20, true);
+      record.setUint16(6, 20, true);
+      record.setUint16(8, UTF8_FLAG, true);
+      record.setUint16(10, entry.method, true);
+      record.setUint16(12, this.stamp.time, true);
+      record.setUint16(14, this.stamp.date, true);
+      record.setUint32(16, entry.crc, true);
+      record.setUint32(20, entry.data.length, true);
+      record.setUint32(24, entry.size, true);
+      record.setUint16(28, name.length, true);
+      record.setUint32(42, this.offset, true);
+      this.central.push(record, name);
+
+      this.parts.push(header, name, entry.data);
+      this.offset += 30 + name.length + entry.data.length;
+    }
+
+    finish() {
+      const count = this.central.length / 2;
+      const centralSize = this.central.reduce((sum, part) => sum + part.byteLength, 0);
+      const end = new DataView(new ArrayBuffer(22));
+      end.setUint32(0, 0x06054B50, true);
+      end.setUint16(8, count, true);
+      end.setUint16(10, count, true);
+      end.setUint32(12, centralSize, true);
+      end.setUint32(16, this.offset, true);
+      return new Blob([...this.parts, ...this.central, end], { type: 'application/zip' });
+    }
+  }
+
+  root.WbActs = Object.assign(root.WbActs || {}, { crc32, createZipEntry, createStreamedZipEntry, ZipWriter });
+})(typeof self !== 'undefined' ? self : this);
@@ -0,0 +1,96 @@
+"""Общие помощники тестов: маленькие книги XLSX, собранные вручную."""
+from __future__ import annotations
+
+import zipfile
+from typing import Dict, Sequence
+from xml.sax.saxutils import escape, quoteattr
+
+import pytest
+
+_WORKBOOK = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+             '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+             'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+             '<sheets>{sheets}</sheets></workbook>')
+
+_RELS = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+         '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+         '{rels}</Relationships>')
+
+
+def write_xlsx(path: str, sheets: Dict[str, str], shared: Sequence[str] = (),
+               shared_xml: str = '') -> str:
+    """sheets — имя листа -> содержимое <sheetData>; shared — общие строки по порядку;
+    shared_xml — готовые элементы <si> вместо shared."""
+    entries = ''.join(f'<sheet name={quoteattr(name)} sheetId="{number}" r:id="rId{number}"/>'
+                      for number, name in enumerate(sheets, 1))
+    rels = ''.join(f'<Relationship Id="rId{number}" Type="worksheet" Target="worksheets/sheet{number}.xml"/>'
+                   for number in range(1, len(sheets) + 1))
+    items = shared_xml or ''.join(f'<si><t>{escape(text)}</t></si>' for text in shared)
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('xl/workbook.xml', _WORKBOOK.format(sheets=entries))
+        archive.writestr('xl/_rels/workbook.xml.rels', _RELS.format(rels=rels))
+        archive.writestr('xl/sharedStrings.xml',
+                         '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                         f'{items}</sst>')
+        for number, data in enumerate(sheets.values(), 1):
+            archive.writestr(f'xl/worksheets/sheet{number}.xml',
+                             '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                             f'<sheetData>{data}</sheetData></worksheet>')
+    return path
+
+
+@pytest.fixture
+def make_xlsx(tmp_path):
+    counter = iter(range(1000))
+
+    def make(sheets: Dict[str, str], shared: Sequence[str] = ()) -> str:
+        return write_xlsx(str(tmp_path / f'book{next(counter)}.xlsx'), sheets, shared)
+
+    return make
+
+
+# Лист выгрузки с одной проданной позицией; общие строки — SHEET_SHARED
+SHEET_SHARED = ['Статус задания', 'Артикул Wildberries', 'Стоимость', 'Продано']
+SHEET_DATA = ('<row r="1"><c r="A1" t="s"><v>0</v></c><c r="B1" t="s"><v>1</v></c>'
+              '<c r="C1" t="s"><v>2</v></c></row>'
+              '<row r="2"><c r="A2" t="s"><v>3</v></c><c r="B2"><v>123456</v></c>'
+              '<c r="C2"><v>1000</v></c></row>') * 20
+
+MALFORMED = ['shared-index', 'broken-xml', 'bad-number', 'missing-part', 'corrupt-data', 'broken-workbook']
+
+
+def write_malformed_xlsx(path: str, kind: str) -> str:
+    """Книга из двух листов, испорченная способом kind (см. MALFORMED)."""
+    broken = {
+        'shared-index': '<row r="1"><c r="A1" t="s"><v>99</v></c></row>',
+        'broken-xml': '<row r="1"><c r="A1"><v>1</v></row>',
+        'bad-number': '<row r="1"><c r="A1"><v>не число</v></c></row>',
+    }.get(kind, SHEET_DATA)
+    write_xlsx(path, {'Январь 24': SHEET_DATA, 'Февраль 24': broken}, SHEET_SHARED)
+
+    with zipfile.ZipFile(path) as archive:
+        entries = [(info, archive.read(info)) for info in archive.infolist()]
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for info, data in entries:
+            if kind == 'missing-part' and info.filename == 'xl/worksheets/sheet2.xml':
+                continue
+            if kind == 'broken-workbook' and info.filename == 'xl/workbook.xml':
+                data = data[:len(data) // 2]
+            archive.writestr(info, data)
+
+    if kind == 'corrupt-data':
+        with zipfile.ZipFile(path) as archive:
+            info = archive.getinfo('xl/worksheets/sheet2.xml')
+        # Локальный заголовок — 30 байт, имя файла и дополнительное поле
+        offset = info.header_offset + 30 + len(info.filename) + len(info.extra) + info.compress_size // 2
+        with open(path, 'r+b') as target:
+            target.seek(offset)
+            byte = target.read(1)
+            target.seek(offset)
+            target.write(bytes([byte[0] ^ 0xFF]))
+    return path
+
+
+@pytest.fixture(params=MALFORMED)
+def malformed_xlsx(request, tmp_path):
+    return write_malformed_xlsx(str(tmp_path / f'{request.param}.xlsx'), request.param)
@@ -0,0 +1,63 @@
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from test_render import ROOT
+from wb_acts.aggregate import extract_items
+from wb_acts.brands import compile_brands
+
+HEADER = ['Наименование', 'Статус задания', 'Артикул Wildberries', 'Стоимость', 'Цвет',
+          'Артикул продавца', 'Статус задания']
+ROWS = [
+    HEADER,
+    ['Кабель', 'Продано', 123456, 1000, 'черный', 'ART-1'],
+    ['Кабель', 'Продано', 123456, '1500.5 руб', 'белый', 'ART-2'],
+    ['Чехол', 'Возврат', 654321, 500],
+    ['Чехол', 'Продано', '654321', None, None, None, 'Возврат'],
+    [None, 'Продано', None, 10],
+    ['Плёнка', 'Продано', '236072463', 100, 'прозрачный', ''],
+]
+CATALOG = {'654321': {'brand': 'Магнит', 'sellerArticle': 'M-1'}}
+
+
+def test_extract_items():
+    items = extract_items(iter(ROWS), 'Январь 24', compile_brands(CATALOG))
+    assert [(item.sku, item.quantity, item.brand, item.seller_article) for item in items] == [
+        ('', 1, '', ''),
+        ('123456', 2, '', 'ART-1'),
+        ('236072463', 1, items[2].brand, ''),
+        ('654321', 1, 'Магнит', 'M-1'),
+    ]
+    assert items[1].color == 'черный'
+    assert round(items[1].total_price, 2) == round((1000 + 1500.5) * 0.65, 2)
+    assert items[3].total_price == 0
+
+
+def test_header_without_status_gives_no_items():
+    assert extract_items(iter([['Артикул Wildberries'], ['1']]), 'Январь 24') == []
+
+
+@pytest.mark.parametrize('rows', [ROWS, [['Артикул Wildberries'], ['1']], []])
+def test_browser_aggregator_matches(rows):
+    if shutil.which('node') is None:
+        pytest.skip('нет node')
+    resolver = compile_brands(CATALOG)
+    script = f'''
+globalThis.self = globalThis;
+for (const name of ['brands', 'acts']) await import('{ROOT}/js/' + name + '.js');
+const [rows, brands] = JSON.parse(process.argv[1]);
+const aggregator = new self.WbActs.ItemsAggregator('Январь 24', self.WbActs.BrandResolver.fromJSON(brands));
+// По две строки за раз, как пачки XlsxStreamReader.rowBatches
+for (let start = 0; start < rows.length; start += 2) aggregator.addRows(rows.slice(start, start + 2));
+console.log(JSON.stringify(aggregator.items()));
+'''
+    output = subprocess.run(['node', '--input-type=module', '-e', script,
+                             json.dumps([rows, resolver.to_json()])],
+                            capture_output=True, text=True, check=True, cwd=ROOT)
+    expected = [{'name': item.name, 'quantity': item.quantity, 'brand': item.brand, 'color': item.color,
+                 'sku': item.sku, 'sellerArticle': item.seller_article, 'price': item.price,
+                 'totalPrice': item.total_price}
+                for item in extract_items(iter(rows), 'Январь 24', resolver)]
+    assert json.loads(output.stdout) == expected
@@ -0,0 +1,73 @@
+import pytest
+
+from wb_acts.brands import (BRAND_ARTICLES, BrandResolver, BrandsError, builtin_brand,
+                            compile_brands, read_brands_rows)
+
+CATALOG = {'100': {'brand': 'Магнит', 'sellerArticle': 'M-1'},
+           '200': {'brand': 'Литий'}}
+
+
+def test_catalog_brand_and_seller_article():
+    resolver = compile_brands(CATALOG)
+    assert resolver.resolve('100', 'Январь 24') == ('Магнит', 'M-1')
+    assert resolver.resolve('200', 'Январь 24') == ('Литий', '')
+    assert resolver.resolve('999', 'Январь 24') == ('', '')
+
+
+@pytest.mark.parametrize('month', ['Апрель 24', 'апрель 2024', 'АПРЕЛЬ 24 (2)'])
+def test_april_24_has_no_brands(month):
+    resolver = compile_brands(CATALOG)
+    # Правило месяца заменяет бренд, но не артикул продавца
+    assert resolver.resolve('100', month) == ('', 'M-1')
+    assert resolver.resolve(BRAND_ARTICLES[0], month) == ('', '')
+
+
+@pytest.mark.parametrize('month', ['Апрель 25', 'Март 24', '', None])
+def test_other_months_keep_brands(month):
+    resolver = compile_brands(CATALOG)
+    assert resolver.month_brand(month) is None
+    assert resolver.resolve('100', month) == ('Магнит', 'M-1')
+
+
+def test_custom_month_rule_needs_every_part():
+    resolver = BrandResolver({'100': ('Магнит', '')},
+                             month_rules=[{'contains': ['май', '25'], 'brand': 'Особый'}])
+    assert resolver.resolve('100', 'Май 25') == ('Особый', '')
+    assert resolver.resolve('100', 'Май 24') == ('Магнит', '')
+
+
+def test_first_matching_month_rule_wins():
+    resolver = BrandResolver({}, month_rules=[{'contains': ['25'], 'brand': 'Первый'},
+                                              {'contains': ['июнь'], 'brand': 'Второй'}])
+    assert resolver.month_brand('Июнь 25') == 'Первый'
+    assert resolver.month_brand('Июнь 24') == 'Второй'
+
+
+def test_builtin_articles_override_brand_but_not_seller_article():
+    article = BRAND_ARTICLES[0]
+    resolver = compile_brands({article: {'brand': 'Чужой', 'sellerArticle': 'S-1'}})
+    assert resolver.resolve(article, 'Январь 24') == (builtin_brand(article), 'S-1')
+    assert resolver.loaded == 1
+
+
+def test_first_catalog_row_wins():
+    resolver = read_brands_rows([
+        ['Артикул WB', 'Бренд', 'Артикул продавца'],
+        ['100', 'Первый', 'A'],
+        ['100', 'Второй', 'B'],
+    ])
+    assert resolver.resolve('100', 'Январь 24') == ('Первый', 'A')
+
+
+def test_round_trip_keeps_month_rules_and_fingerprint():
+    resolver = BrandResolver({'100': ('Магнит', '')}, month_rules=[{'contains': ['май'], 'brand': 'X'}],
+                             loaded=1)
+    restored = BrandResolver.loads(resolver.dumps())
+    assert restored.resolve('100', 'Май 25') == ('X', '')
+    assert restored.fingerprint() == resolver.fingerprint()
+    assert compile_brands().fingerprint() == 'none'
+
+
+def test_loads_rejects_other_json():
+    with pytest.raises(BrandsError):
+        BrandResolver.loads(b'{"format": "other"}')
@@ -0,0 +1,102 @@
+import json
+import os
+
+from wb_acts.aggregate import Item
+from wb_acts.cache import ItemsCache, items_key
+
+KEYS = [items_key(f'sheet{index}', 'none', 'Январь 24') for index in range(10)]
+
+
+def item(sku: str) -> Item:
+    return Item('Товар', 2, 'Бренд', 'черный', sku, 'ART-1', 650.0, 1300.0)
+
+
+def payload_size(items) -> int:
+    return len(json.dumps([entry.to_dict() for entry in items], ensure_ascii=False).encode('utf-8'))
+
+
+def files(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith('.json'))
+
+
+def clear_disk(directory):
+    for name in files(directory):
+        os.unlink(os.path.join(directory, name))
+
+
+def test_round_trip_and_persistence(tmp_path):
+    cache = ItemsCache(str(tmp_path))
+    cache.put_items(KEYS[0], [item('1')])
+    assert cache.get_items(KEYS[0]) == [item('1')]
+    # Новый экземпляр читает с диска
+    assert ItemsCache(str(tmp_path)).get_items(KEYS[0]) == [item('1')]
+    assert cache.get_items(KEYS[1]) is None
+
+
+def test_memory_lru_evicts_least_recently_used(tmp_path):
+    cache = ItemsCache(str(tmp_path), max_memory_bytes=2 * payload_size([item('1')]))
+    cache.put_items(KEYS[0], [item('1')])
+    cache.put_items(KEYS[1], [item('2')])
+    cache.get_items(KEYS[0])
+    cache.put_items(KEYS[2], [item('3')])
+
+    # Без диска остаётся только то, что в памяти: вытеснена давно не читанная запись
+    clear_disk(str(tmp_path))
+    assert cache.get_items(KEYS[0]) == [item('1')]
+    assert cache.get_items(KEYS[2]) == [item('3')]
+    assert cache.get_items(KEYS[1]) is None
+
+
+def test_evicted_from_memory_is_read_from_disk(tmp_path):
+    cache = ItemsCache(str(tmp_path), max_memory_bytes=payload_size([item('1')]))
+    cache.put_items(KEYS[0], [item('1')])
+    cache.put_items(KEYS[1], [item('2')])
+    assert cache.get_items(KEYS[0]) == [item('1')]
+
+
+def test_payload_larger_than_memory_goes_to_disk_only(tmp_path):
+    cache = ItemsCache(str(tmp_path), max_memory_bytes=10)
+    cache.put_items(KEYS[0], [item('1')])
+    assert cache.get_items(KEYS[0]) == [item('1')]
+    clear_disk(str(tmp_path))
+    assert cache.get_items(KEYS[0]) is None
+
+
+def test_disk_eviction_removes_least_recently_read(tmp_path):
+    cache = ItemsCache(str(tmp_path))
+    for index, key in enumerate(KEYS[:4]):
+        cache.put_items(key, [item(str(index))])
+        path = tmp_path / f'{key}.items.json'
+        os.utime(path, (1000 + index, 1000 + index))
+    entry = os.path.getsize(tmp_path / f'{KEYS[0]}.items.json')
+
+    # Чтение обновляет время записи: первая становится самой свежей
+    fresh = ItemsCache(str(tmp_path), max_disk_bytes=entry * 4)
+    assert fresh.get_items(KEYS[0]) is not None
+    fresh.put_items(KEYS[4], [item('4')])
+
+    remaining = files(tmp_path)
+    assert f'{KEYS[1]}.items.json' not in remaining
+    assert f'{KEYS[0]}.items.json' in remaining
+    assert f'{KEYS[4]}.items.json' in remaining
+    assert sum(os.path.getsize(tmp_path / name) for name in remaining) <= entry * 4
+
+
+def test_disk_stays_within_limit_over_many_writes(tmp_path):
+    cache = ItemsCache(str(tmp_path), max_disk_bytes=10_000)
+    for index in range(200):
+        cache.put_fingerprint(str(index), 'x' * 100)
+    assert sum(os.path.getsize(tmp_path / name) for name in files(tmp_path)) <= 10_000
+    # Последние записи на месте
+    assert cache.get_fingerprint('199') == 'x' * 100
+
+
+def test_sheet_keys_manifest_and_lookup(tmp_path):
+    cache = ItemsCache(str(tmp_path))
+    workbook = 'a' * 64
+    cache.put_sheet_keys(workbook, {'Январь 24': 'k1', 'Февраль 24': 'k2'})
+    cache.put_items(items_key('k1', 'none', 'Январь 24'), [item('1')])
+    assert cache.lookup(workbook, 'none') is None
+    cache.put_items(items_key('k2', 'none', 'Февраль 24'), [])
+    assert cache.lookup(workbook, 'none') == {'Январь 24': [item('1')], 'Февраль 24': []}
+    assert cache.month_items(workbook, 'none', 'Январь 24') == [item('1')]
@@ -0,0 +1,66 @@
+from wb_acts.aggregate import Item
+from wb_acts.diff import RowsFingerprint, diff_items, diff_uploads
+
+
+def item(sku: str, quantity: int, price: float = 100.0) -> Item:
+    return Item(f'Товар {sku}', quantity, '', '', sku, '', price, price * quantity)
+
+
+def test_diff_items():
+    diff = diff_items('Январь 24',
+                      [item('1', 2), item('2', 1), item('3', 5)],
+                      [item('1', 2), item('2', 3), item('4', 1)])
+    assert [delta.sku for delta in diff.added] == ['4']
+    assert [(delta.sku, delta.quantity) for delta in diff.removed] == [('3', -5)]
+    assert [(delta.sku, delta.quantity) for delta in diff.changed] == [('2', 2)]
+    assert diff.quantity == 2 + 1 - 5
+    assert round(diff.total_price, 2) == -200.0
+    assert not diff.is_empty
+
+
+def test_diff_items_unchanged_is_empty():
+    diff = diff_items('Январь 24', [item('1', 2)], [item('1', 2)])
+    assert diff.is_empty
+
+
+def test_diff_uploads_added_removed_and_changed_months():
+    items = {
+        ('old', 'Февраль 24'): [item('1', 1)],
+        ('new', 'Февраль 24'): [item('1', 4)],
+    }
+    requested = []
+
+    def items_of(key, month):
+        requested.append((key, month))
+        return items[key, month]
+
+    diff = diff_uploads({'Январь 24': 'same', 'Февраль 24': 'old', 'Март 24': 'gone'},
+                        {'Январь 24': 'same', 'Февраль 24': 'new', 'Апрель 24': 'added'},
+                        items_of)
+    assert diff.added == ['Апрель 24']
+    assert diff.removed == ['Март 24']
+    assert diff.unchanged == 1
+    assert [month.month for month in diff.changed] == ['Февраль 24']
+    assert diff.changed[0].quantity == 3
+    # Позиции читаются только у изменённых листов
+    assert sorted(requested) == [('new', 'Февраль 24'), ('old', 'Февраль 24')]
+    assert diff.to_dict()['changed'][0]['changed'][0]['quantity'] == 3
+
+
+def test_rows_fingerprint_drains_rows():
+    rows = [['Статус задания'], ['Продано'], ['Возврат']]
+    partial = RowsFingerprint(iter(rows))
+    next(iter(partial))
+    full = RowsFingerprint(iter(rows))
+    list(full)
+    assert partial.hexdigest() == full.hexdigest()
+    assert RowsFingerprint(iter(rows[:2])).hexdigest() != full.hexdigest()
+
+
+def test_diff_uploads_counts_same_items_as_unchanged():
+    # Правка в непроданных строках меняет ключ листа, но не позиции
+    items = {('old', 'Январь 24'): [item('1', 2)], ('new', 'Январь 24'): [item('1', 2)]}
+    diff = diff_uploads({'Январь 24': 'old'}, {'Январь 24': 'new'},
+                        lambda key, month: items[key, month])
+    assert diff.changed == []
+    assert diff.unchanged == 1
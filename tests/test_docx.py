@@ -0,0 +1,34 @@
+import io
+import zipfile
+from xml.dom import minidom
+
+import pytest
+
+from test_render import ACT_DATE, ITEMS, KINDS, MONTH, check_golden, render_js
+from wb_acts.docx import iter_document_xml, render_docx
+
+PARTS = ['[Content_Types].xml', '_rels/.rels', 'docProps/core.xml', 'word/document.xml',
+         'word/styles.xml', 'word/_rels/document.xml.rels']
+
+
+@pytest.mark.parametrize('kind', KINDS)
+def test_document_xml_matches_golden(kind):
+    check_golden(f'{kind}.document.xml', ''.join(iter_document_xml(kind, ITEMS, MONTH, ACT_DATE)))
+
+
+@pytest.mark.parametrize('kind', KINDS)
+def test_docx_package(kind):
+    with zipfile.ZipFile(io.BytesIO(render_docx(kind, ITEMS, MONTH, ACT_DATE))) as package:
+        assert package.namelist() == PARTS
+        # Каждая часть пакета — корректный XML; управляющие символы из позиций вырезаны
+        for name in PARTS:
+            minidom.parseString(package.read(name))
+        document = package.read('word/document.xml').decode('utf-8')
+        check_golden(f'{kind}.document.xml', document)
+        check_golden(f'{kind}.styles.xml', package.read('word/styles.xml').decode('utf-8'))
+
+
+def test_browser_document_xml_matches_golden():
+    rendered = render_js('(kind, ...args) => [...self.WbActs.documentXmlChunks(kind, ...args)].join("")')
+    for kind in KINDS:
+        check_golden(f'{kind}.document.xml', rendered[kind])
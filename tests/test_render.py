@@ -0,0 +1,82 @@
+"""Эталонные акты: вывод сверяется с файлами tests/golden/.
+
+Браузерный код (js/act-templates.js) должен давать тот же вывод — проверяется
+через node, если он установлен. После намеренной правки шаблонов эталоны
+перезаписываются: WB_ACTS_UPDATE_GOLDEN=1 python3 -m pytest tests/test_render.py
+"""
+import json
+import os
+import shutil
+import subprocess
+from datetime import date
+
+import pytest
+
+from wb_acts.aggregate import Item
+from wb_acts.render import BOM, act_file_name, iter_act, render_act
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GOLDEN = os.path.join(ROOT, 'tests', 'golden')
+KINDS = ['acceptance', 'services']
+MONTH = 'Январь 24'
+ACT_DATE = date(2024, 1, 31)
+
+# Спецсимволы HTML и XML, управляющий символ, пустые бренд, цвет и артикул продавца
+ITEMS = [
+    Item('Кабель <USB-C> & "зарядка"', 3, 'Lithium', 'черный', '123456', 'ART-1', 650.0, 1950.0),
+    Item('Чехол', 1, '', '', '654321', '', 123.45, 123.45),
+    Item('Плёнка\x07', 2, 'Magnet', 'прозрачный', '777', "O'Brien", 65.1, 130.2),
+]
+
+
+def check_golden(name: str, actual: str) -> None:
+    path = os.path.join(GOLDEN, name)
+    if os.environ.get('WB_ACTS_UPDATE_GOLDEN'):
+        os.makedirs(GOLDEN, exist_ok=True)
+        with open(path, 'w', encoding='utf-8', newline='') as target:
+            target.write(actual)
+    with open(path, encoding='utf-8', newline='') as source:
+        assert actual == source.read()
+
+
+def render_js(expression: str) -> dict:
+    """Значение expression(kind, items, actDate, month) по каждому виду акта в браузерном коде."""
+    if shutil.which('node') is None:
+        pytest.skip('нет node')
+    script = f'''
+globalThis.self = globalThis;
+for (const name of ['acts', 'act-templates', 'docx']) await import('{ROOT}/js/' + name + '.js');
+const items = JSON.parse(process.argv[1]);
+const render = {expression};
+const result = {{}};
+for (const kind of {json.dumps(KINDS)}) result[kind] = render(kind, items, '{ACT_DATE.isoformat()}', '{MONTH}');
+console.log(JSON.stringify(result));
+'''
+    items = [{'name': item.name, 'quantity': item.quantity, 'brand': item.brand, 'color': item.color,
+              'sku': item.sku, 'sellerArticle': item.seller_article, 'price': item.price,
+              'totalPrice': item.total_price} for item in ITEMS]
+    output = subprocess.run(['node', '--input-type=module', '-e', script, json.dumps(items)],
+                            capture_output=True, text=True, check=True, cwd=ROOT)
+    return json.loads(output.stdout)
+
+
+@pytest.mark.parametrize('kind', KINDS)
+def test_act_html_matches_golden(kind):
+    check_golden(f'{kind}.html', ''.join(iter_act(kind, ITEMS, MONTH, ACT_DATE)))
+
+
+@pytest.mark.parametrize('kind', KINDS)
+def test_doc_file_is_html_with_bom(kind):
+    data = render_act(kind, ITEMS, MONTH, ACT_DATE)
+    assert data.decode('utf-8') == BOM + ''.join(iter_act(kind, ITEMS, MONTH, ACT_DATE))
+
+
+def test_browser_acts_match_golden():
+    rendered = render_js('(kind, ...args) => self.WbActs.renderActChunks(kind, ...args).join("")')
+    for kind in KINDS:
+        check_golden(f'{kind}.html', rendered[kind])
+
+
+def test_act_file_name():
+    assert act_file_name('services', MONTH, ACT_DATE) == 'Акт ОУ (Январь 24 2024) ИП Гаряев.doc'
+    assert act_file_name('acceptance', MONTH, ACT_DATE, 'docx') == 'Акт ПП (Январь 24 2024) ИП Гаряев.docx'
@@ -0,0 +1,97 @@
+import io
+import json
+import zipfile
+from urllib.parse import quote
+
+import pytest
+
+from conftest import SHEET_DATA, SHEET_SHARED, write_xlsx
+from test_uploads import BOUNDARY, multipart
+from wb_acts.cache import ItemsCache
+from wb_acts.docx import DOCX_MIME
+from wb_acts.server import COOKIE_NAME, ActsApp
+
+
+def call(app, method, path, body=b'', **extra):
+    environ = {
+        'REQUEST_METHOD': method,
+        'PATH_INFO': path,
+        'QUERY_STRING': '',
+        'CONTENT_TYPE': f'multipart/form-data; boundary={BOUNDARY}',
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.input': io.BytesIO(body),
+    }
+    environ.update(extra)
+    status = []
+    chunks = app(environ, lambda line, headers: status.append((line, dict(headers))))
+    return status[0][0], status[0][1], b''.join(chunks)
+
+
+def upload(app, path):
+    with open(path, 'rb') as source:
+        body = multipart([('file', 'book.xlsx', source.read())])
+    status, headers, data = call(app, 'POST', '/upload', body)
+    return status, json.loads(data)
+
+
+def generate(app, upload_id, path, query=''):
+    # PATH_INFO по WSGI — байты UTF-8, прочитанные как latin-1
+    path_info = quote(path, safe='/').encode().decode('latin-1')
+    return call(app, 'GET', path_info, QUERY_STRING=query, HTTP_COOKIE=f'{COOKIE_NAME}={upload_id}')
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_upload(tmp_path, workers):
+    app = ActsApp(ItemsCache(str(tmp_path / 'cache')), workers=workers)
+    path = write_xlsx(str(tmp_path / 'book.xlsx'), {'Январь 24': SHEET_DATA, 'Февраль 24': SHEET_DATA},
+                      SHEET_SHARED)
+    status, response = upload(app, path)
+    assert status == '200 OK'
+    assert response['months'] == ['Январь 24', 'Февраль 24']
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_malformed_upload_is_bad_request(tmp_path, malformed_xlsx, workers):
+    app = ActsApp(ItemsCache(str(tmp_path / 'cache')), workers=workers)
+    status, response = upload(app, malformed_xlsx)
+    assert status == '400 Bad Request'
+    assert response['error']
+
+
+@pytest.fixture
+def uploaded(tmp_path):
+    app = ActsApp(ItemsCache(str(tmp_path / 'cache')), workers=1)
+    path = write_xlsx(str(tmp_path / 'book.xlsx'), {'Январь 24': SHEET_DATA}, SHEET_SHARED)
+    status, response = upload(app, path)
+    return app, response['upload_id']
+
+
+def test_generate_defaults_to_doc(uploaded):
+    app, upload_id = uploaded
+    status, headers, body = generate(app, upload_id, '/generate/acceptance/Январь 24')
+    assert status == '200 OK'
+    assert headers['Content-Type'].startswith('application/msword')
+    assert body.startswith('\ufeff<!DOCTYPE html>'.encode('utf-8'))
+
+
+def test_generate_docx_on_request(uploaded):
+    app, upload_id = uploaded
+    status, headers, body = generate(app, upload_id, '/generate/services/Январь 24', 'format=docx')
+    assert status == '200 OK'
+    assert headers['Content-Type'] == DOCX_MIME
+    assert zipfile.ZipFile(io.BytesIO(body)).read('word/document.xml')
+
+
+def test_generate_unknown_format(uploaded):
+    app, upload_id = uploaded
+    status, headers, body = generate(app, upload_id, '/generate/services/Январь 24', 'format=pdf')
+    assert status == '400 Bad Request'
+
+
+@pytest.mark.parametrize('query, extension', [('', '.doc'), ('format=docx', '.docx')])
+def test_generate_all_format(uploaded, query, extension):
+    app, upload_id = uploaded
+    status, headers, body = generate(app, upload_id, '/generate/all', query)
+    assert status == '200 OK'
+    names = zipfile.ZipFile(io.BytesIO(body)).namelist()
+    assert len(names) == 2 and all(name.endswith(extension) for name in names)
@@ -0,0 +1,101 @@
+import hashlib
+import io
+
+import pytest
+
+from wb_acts.uploads import CHUNK_SIZE, UploadError, spool_multipart
+
+BOUNDARY = 'testboundary'
+
+
+def multipart(parts) -> bytes:
+    """parts — (имя поля, имя файла или None, содержимое)."""
+    body = b''
+    for name, filename, data in parts:
+        disposition = f'form-data; name="{name}"'
+        if filename is not None:
+            disposition += f'; filename="{filename}"'
+        body += (f'--{BOUNDARY}\r\nContent-Disposition: {disposition}\r\n'
+                 'Content-Type: application/octet-stream\r\n\r\n').encode('utf-8')
+        body += data + b'\r\n'
+    return body + f'--{BOUNDARY}--\r\n'.encode()
+
+
+def environ(body: bytes, **extra) -> dict:
+    env = {
+        'CONTENT_TYPE': f'multipart/form-data; boundary={BOUNDARY}',
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.input': io.BytesIO(body),
+    }
+    env.update(extra)
+    return env
+
+
+def spool(env, tmp_path):
+    files = spool_multipart(env, directory=str(tmp_path))
+    contents = {}
+    for name, spooled in files.items():
+        with open(spooled.path, 'rb') as source:
+            contents[name] = source.read()
+    return files, contents
+
+
+def test_file_and_text_fields(tmp_path):
+    data = b'PK\x03\x04' + bytes(range(256)) * 10
+    body = multipart([('note', None, b'text field'), ('file', 'Выгрузка.xlsx', data)])
+    files, contents = spool(environ(body), tmp_path)
+    assert list(files) == ['file']
+    assert files['file'].filename == 'Выгрузка.xlsx'
+    assert contents['file'] == data
+    assert files['file'].size == len(data)
+    assert files['file'].sha256 == hashlib.sha256(data).hexdigest()
+
+
+# Заголовок части до начала файла: так разделитель после файла ложится на границу
+# чтения CHUNK_SIZE со сдвигом shift
+def _header_size() -> int:
+    return len(multipart([('file', 'a.xlsx', b'')])) - len(f'\r\n--{BOUNDARY}--\r\n')
+
+
+@pytest.mark.parametrize('shift', range(-len(BOUNDARY) - 6, 4))
+def test_delimiter_split_across_chunks(tmp_path, shift):
+    data = b'x' * (CHUNK_SIZE - _header_size() + shift)
+    body = multipart([('file', 'a.xlsx', data)])
+    assert body.index(f'\r\n--{BOUNDARY}'.encode()) == CHUNK_SIZE + shift
+    files, contents = spool(environ(body), tmp_path)
+    assert contents['file'] == data
+
+
+def test_delimiter_lookalike_inside_file(tmp_path):
+    # Начало разделителя внутри файла на границе чтения — не конец файла
+    data = b'y' * (CHUNK_SIZE - _header_size() - 4) + f'\r\n--{BOUNDARY[:-1]}!'.encode() + b'z' * 100
+    files, contents = spool(environ(multipart([('file', 'a.xlsx', data)])), tmp_path)
+    assert contents['file'] == data
+
+
+def test_chunked_body_without_content_length(tmp_path):
+    data = b'z' * (3 * CHUNK_SIZE + 17)
+    body = multipart([('file', 'a.xlsx', data)])
+    env = environ(body, CONTENT_LENGTH='', **{'wsgi.input_terminated': True})
+    files, contents = spool(env, tmp_path)
+    assert contents['file'] == data
+
+
+def test_missing_content_length_without_terminated_input(tmp_path):
+    body = multipart([('file', 'a.xlsx', b'data')])
+    env = environ(body)
+    del env['CONTENT_LENGTH']
+    with pytest.raises(UploadError):
+        spool_multipart(env, directory=str(tmp_path))
+
+
+def test_truncated_body_removes_spooled_file(tmp_path):
+    body = multipart([('file', 'a.xlsx', b'w' * (2 * CHUNK_SIZE))])[:CHUNK_SIZE + 100]
+    with pytest.raises(UploadError, match='оборван'):
+        spool_multipart(environ(body), directory=str(tmp_path))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_not_multipart(tmp_path):
+    with pytest.raises(UploadError):
+        spool_multipart(environ(b'{}', CONTENT_TYPE='application/json'), directory=str(tmp_path))
@@ -0,0 +1,59 @@
+from wb_acts.aggregate import Item
+from wb_acts.validate import Conflict, SellerArticleIndex, find_conflicts
+
+
+def item(sku: str, seller_article: str) -> Item:
+    return Item('Товар', 1, '', '', sku, seller_article, 100.0, 100.0)
+
+
+def test_no_conflict_for_one_sku_per_seller_article():
+    months = {'Январь 24': [item('1', 'A'), item('2', 'B')],
+              'Февраль 24': [item('1', 'A')]}
+    assert find_conflicts(months) == []
+
+
+def test_conflict_within_a_month():
+    assert find_conflicts({'Январь 24': [item('2', 'A'), item('1', 'A')]}) == [
+        Conflict('A', ['1', '2'], ['Январь 24'])]
+
+
+def test_conflict_across_months_lists_each_month_once():
+    months = {'Январь 24': [item('1', 'A')],
+              'Февраль 24': [item('2', 'A'), item('3', 'B')],
+              'Март 24': [item('1', 'A'), item('2', 'A')]}
+    [conflict] = find_conflicts(months)
+    assert (conflict.seller_article, conflict.skus) == ('A', ['1', '2'])
+    assert sorted(conflict.months) == sorted(['Январь 24', 'Февраль 24', 'Март 24'])
+
+
+def test_items_without_seller_article_are_skipped():
+    assert find_conflicts({'Январь 24': [item('1', ''), item('2', '')]}) == []
+
+
+def test_conflicts_for_one_month():
+    index = SellerArticleIndex()
+    index.add([item('1', 'A'), item('5', 'C')], 'Январь 24')
+    index.add([item('2', 'A')], 'Февраль 24')
+    index.add([item('3', 'B'), item('4', 'B')], 'Март 24')
+    assert [c.seller_article for c in index.conflicts('Февраль 24')] == ['A']
+    assert [c.seller_article for c in index.conflicts('Март 24')] == ['B']
+    assert len(index.conflicts()) == 2
+
+
+def test_adding_the_same_month_twice_changes_nothing():
+    index = SellerArticleIndex()
+    index.add([item('1', 'A')], 'Январь 24')
+    index.add([item('2', 'A')], 'Январь 24')
+    assert index.conflicts() == []
+
+
+def test_items_without_month_are_always_added():
+    index = SellerArticleIndex()
+    index.add([item('1', 'A')])
+    index.add([item('2', 'A')])
+    assert index.conflicts() == [Conflict('A', ['1', '2'], [])]
+
+
+def test_conflict_to_dict():
+    assert Conflict('A', ['1', '2'], ['Январь 24']).to_dict() == {
+        'sellerArticle': 'A', 'skus': ['1', '2'], 'months': ['Январь 24']}
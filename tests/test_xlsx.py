@@ -0,0 +1,86 @@
+import pytest
+
+from wb_acts.xlsx import XlsxError, open_workbook
+
+
+def test_inline_and_shared_strings(make_xlsx):
+    path = make_xlsx({'Лист': (
+        '<row r="1">'
+        '<c r="A1" t="s"><v>1</v></c>'
+        '<c r="B1" t="inlineStr"><is><t>встроенная</t></is></c>'
+        '<c r="C1"><v>42</v></c>'
+        '<c r="D1"><v>1.5</v></c>'
+        '<c r="E1" t="b"><v>1</v></c>'
+        '<c r="F1" t="str"><v>формула</v></c>'
+        '</row>'
+        '<row r="2"><c r="C2" t="s"><v>0</v></c></row>'
+        # Пустая строка пропускается
+        '<row r="3"></row>'
+    )}, shared=['общая', 'первая & вторая'])
+    with open_workbook(path) as workbook:
+        rows = list(workbook.iter_rows('Лист'))
+    assert rows == [
+        ['первая & вторая', 'встроенная', 42, 1.5, True, 'формула'],
+        [None, None, 'общая'],
+    ]
+
+
+def test_rich_text_and_phonetic_runs(make_xlsx):
+    path = make_xlsx({'Лист': (
+        '<row r="1"><c r="A1" t="inlineStr"><is>'
+        '<r><t>Кра</t></r><r><t>сный</t></r><rPh><t>фонетика</t></rPh>'
+        '</is></c></row>'
+    )})
+    with open_workbook(path) as workbook:
+        assert list(workbook.iter_rows('Лист')) == [['Красный']]
+
+
+def test_cells_without_reference(make_xlsx):
+    path = make_xlsx({'Лист': '<row><c><v>1</v></c><c><v>2</v></c><c r="E1"><v>5</v></c><c><v>6</v></c></row>'})
+    with open_workbook(path) as workbook:
+        assert list(workbook.iter_rows('Лист')) == [[1, 2, None, None, 5, 6]]
+
+
+def test_unknown_sheet(make_xlsx):
+    path = make_xlsx({'Лист': ''})
+    with open_workbook(path) as workbook:
+        with pytest.raises(XlsxError):
+            list(workbook.iter_rows('Нет такого'))
+
+
+def test_not_a_zip(tmp_path):
+    path = tmp_path / 'book.xlsx'
+    path.write_bytes(b'not a zip')
+    with pytest.raises(XlsxError):
+        open_workbook(str(path))
+
+
+def test_strings_fingerprint_survives_appended_shared_strings(make_xlsx):
+    sheets = {'Январь': '<row r="1"><c r="A1" t="s"><v>1</v></c></row>',
+              'Февраль': '<row r="1"><c r="A1" t="s"><v>2</v></c></row>'}
+    before = make_xlsx(sheets, shared=['а', 'б', 'в'])
+    after = make_xlsx(sheets, shared=['а', 'б', 'в', 'новая'])
+    renumbered = make_xlsx(sheets, shared=['а', 'в', 'б'])
+
+    fingerprints = []
+    for path in (before, after, renumbered):
+        with open_workbook(path) as workbook:
+            for _ in workbook.iter_rows('Январь'):
+                pass
+            used = workbook.shared_strings_used('Январь')
+            fingerprints.append((workbook.sheet_fingerprint('Январь'), used,
+                                 workbook.strings_fingerprint('Январь', used)))
+
+    assert fingerprints[0][1] == 2
+    # Новая строка в конце меняет отпечаток каталога, но не отпечаток по строкам листа
+    assert fingerprints[0][0] != fingerprints[1][0]
+    assert fingerprints[0][2] == fingerprints[1][2]
+    # Строки, на которые лист ссылается, поменялись — отпечаток другой
+    assert fingerprints[0][2] != fingerprints[2][2]
+
+
+def test_malformed_book_raises_xlsx_error(malformed_xlsx):
+    with pytest.raises(XlsxError):
+        with open_workbook(malformed_xlsx) as workbook:
+            for name in workbook.sheet_names:
+                list(workbook.iter_rows(name))
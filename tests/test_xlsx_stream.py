@@ -0,0 +1,69 @@
+"""Потоковое чтение книги в браузерном коде (js/xlsx-stream.js) против wb_acts.xlsx.
+
+Разметка, которую XML допускает, а Excel пишет редко: '>' и одинарные кавычки
+в атрибутах, CDATA, комментарии и инструкции обработки — в том числе на
+границе распакованных кусков (лист повторяется, чтобы границ было много).
+"""
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from conftest import write_xlsx
+from test_render import ROOT
+from wb_acts.xlsx import open_workbook
+
+TRICKY_ROWS = (
+    '<?mso-application progid="Excel.Sheet"?>'
+    '<row r="{n}" note="a > b">'
+    '<c r="A{n}" t="s" comment=\'x > "y"\'><v>0</v></c>'
+    "<c r='B{n}' t='s'><v>1</v></c>"
+    '<!-- <row r="999"><c r="A999"><v>7</v></c></row> > -->'
+    '<c r="C{n}" t="inlineStr"><is><t><![CDATA[<b>&amp; не сущность]]></t></is></c>'
+    '<c r="D{n}" t="inlineStr"><is><t>до<!-- > -->после &amp; <![CDATA[]]>конец</t></is></c>'
+    '<c r="E{n}"><v><![CDATA[42]]></v></c>'
+    '</row>'
+)
+SHARED_XML = ('<si><t><![CDATA[a > b & <c>]]></t></si>'
+              '<!-- <si><t>лишняя</t></si> -->'
+              '<?pi x?><si><r><t>Кра</t></r><r><t xml:space="preserve">сный </t></r></si>')
+SHEETS = {
+    'Лист "<1>"': ''.join(TRICKY_ROWS.format(n=n) for n in range(1, 3001)),
+    'Второй': '<!-- комментарий --><row r="1"><c r="A1" t="s"><v>1</v></c></row>',
+}
+
+
+@pytest.fixture
+def tricky_xlsx(tmp_path):
+    return write_xlsx(str(tmp_path / 'tricky.xlsx'), SHEETS, shared_xml=SHARED_XML)
+
+
+def test_python_reader(tricky_xlsx):
+    with open_workbook(tricky_xlsx) as workbook:
+        assert workbook.sheet_names == list(SHEETS)
+        rows = list(workbook.iter_rows(workbook.sheet_names[0]))
+    assert len(rows) == 3000
+    assert rows[0] == ['a > b & <c>', 'Красный ', '<b>&amp; не сущность', 'допосле & конец', 42]
+
+
+def test_browser_reader_matches(tricky_xlsx):
+    if shutil.which('node') is None:
+        pytest.skip('нет node')
+    script = f'''
+import {{ openAsBlob }} from 'fs';
+globalThis.self = globalThis;
+await import('{ROOT}/js/xlsx-stream.js');
+const reader = await self.WbActs.XlsxStreamReader.open(await openAsBlob(process.argv[1]));
+const result = {{}};
+for (const name of reader.sheetNames) {{
+  result[name] = [];
+  for await (const batch of reader.rowBatches(name)) result[name].push(...batch);
+}}
+console.log(JSON.stringify(result));
+'''
+    output = subprocess.run(['node', '--input-type=module', '-e', script, tricky_xlsx],
+                            capture_output=True, text=True, check=True, cwd=ROOT)
+    with open_workbook(tricky_xlsx) as workbook:
+        expected = {name: list(workbook.iter_rows(name)) for name in workbook.sheet_names}
+    assert json.loads(output.stdout) == expected
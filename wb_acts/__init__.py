@@ -0,0 +1,26 @@
+"""Серверная часть генератора актов Wildberries.
+
+Повторяет логику js/ (extractItemsData, BrandResolver, шаблоны актов),
+но читает XLSX потоково, лист за листом, без загрузки книги в память.
+Только стандартная библиотека Python — на Vercel ничего устанавливать не нужно.
+"""
+from .aggregate import Item, extract_items
+from .brands import BrandResolver, compile_brands, load_brands
+from .docx import render_docx
+from .render import render_act
+from .xlsx import Workbook, XlsxError, open_workbook
+
+__version__ = '3.10.0'
+
+__all__ = [
+    'BrandResolver',
+    'Item',
+    'Workbook',
+    'XlsxError',
+    'compile_brands',
+    'extract_items',
+    'load_brands',
+    'open_workbook',
+    'render_act',
+    'render_docx',
+]
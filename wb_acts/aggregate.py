@@ -0,0 +1,157 @@
+"""Агрегация строк листа в позиции акта — Python-версия extractItemsData."""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional
+
+from .brands import BrandResolver, compile_brands
+from .xlsx import Cell, Row
+
+STATUS_COLUMN = 'Статус задания'
+STATUS_SOLD = 'Продано'
+ARTICLE_COLUMN = 'Артикул Wildberries'
+NAME_COLUMN = 'Наименование'
+PRICE_COLUMN = 'Стоимость'
+COLOR_COLUMN = 'Цвет'
+SELLER_ARTICLE_COLUMN = 'Артикул продавца'
+
+# Цена в актах автоматически умножается на 0.65
+PRICE_FACTOR = 0.65
+
+_FLOAT_PREFIX = re.compile(r'\s*([+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)')
+
+
+@dataclass
+class Item:
+    name: str
+    quantity: int
+    brand: str
+    color: str
+    sku: str
+    seller_article: str
+    price: float
+    total_price: float
+
+    def to_dict(self) -> dict:
+        return dict(self.__dict__)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Item':
+        return cls(**data)
+
+
+def _text(value: Cell) -> str:
+    # Аналог `row[...] || ''` в JS: пустые и нулевые значения дают ''
+    if value is None or value is False or value == '' or value == 0:
+        return ''
+    return str(value)
+
+
+def parse_float(value: Cell) -> float:
+    """Как parseFloat(...) || 0 в JS."""
+    if isinstance(value, bool) or value is None:
+        return 0.0
+    if isinstance(value, (int, float)):
+        return float(value) if value == value else 0.0
+    match = _FLOAT_PREFIX.match(value)
+    return float(match.group(1)) if match else 0.0
+
+
+_BUILTIN = compile_brands()
+
+
+@dataclass(frozen=True)
+class Columns:
+    """Номера колонок листа по заголовкам; -1 — колонки нет."""
+    status: int
+    article: int
+    name: int
+    price: int
+    color: int
+    seller: int
+
+    @classmethod
+    def from_header(cls, header: Row) -> Optional['Columns']:
+        """None — в шапке нет колонки статуса, позиций на листе нет."""
+        columns = {}
+        for index, title in enumerate(header):
+            if title is not None:
+                columns.setdefault(str(title), index)
+        if STATUS_COLUMN not in columns:
+            return None
+        return cls(
+            status=columns[STATUS_COLUMN],
+            article=columns.get(ARTICLE_COLUMN, -1),
+            name=columns.get(NAME_COLUMN, -1),
+            price=columns.get(PRICE_COLUMN, -1),
+            color=columns.get(COLOR_COLUMN, -1),
+            seller=columns.get(SELLER_ARTICLE_COLUMN, -1),
+        )
+
+
+def _cell(row: Row, index: int) -> Cell:
+    return row[index] if 0 <= index < len(row) else None
+
+
+def sold_rows(rows: Iterable[Row], columns: Columns) -> Iterator[Row]:
+    """Только строки со статусом «Продано»."""
+    status = columns.status
+    for row in rows:
+        if status < len(row) and row[status] == STATUS_SOLD:
+            yield row
+
+
+def aggregate_rows(rows: Iterable[Row], columns: Columns) -> List[Item]:
+    """Позиции по артикулу WB, отсортированные по нему; бренды не заполнены.
+
+    Наименование, цвет, артикул продавца и цена — из первой строки артикула.
+    """
+    items = {}
+    for row in rows:
+        sku = _text(_cell(row, columns.article))
+        reduced_price = parse_float(_cell(row, columns.price)) * PRICE_FACTOR
+
+        item = items.get(sku)
+        if item is None:
+            item = items[sku] = Item(
+                name=_text(_cell(row, columns.name)),
+                quantity=0,
+                brand='',
+                color=_text(_cell(row, columns.color)),
+                sku=sku,
+                seller_article=_text(_cell(row, columns.seller)),
+                price=reduced_price,
+                total_price=0.0,
+            )
+
+        item.quantity += 1
+        item.total_price += reduced_price
+
+    return sorted(items.values(), key=lambda item: item.sku)
+
+
+def resolve_brands(items: List[Item], month: str,
+                   resolver: Optional[BrandResolver] = None) -> List[Item]:
+    """Бренд и артикул продавца из каталога; артикул из каталога важнее строки листа."""
+    resolver = resolver or _BUILTIN
+    for item in items:
+        brand, seller = resolver.resolve(item.sku, month)
+        item.brand = brand
+        if seller:
+            item.seller_article = seller
+    return items
+
+
+def extract_items(rows: Iterable[Row], month: str,
+                  resolver: Optional[BrandResolver] = None) -> List[Item]:
+    """Первая строка — заголовки, как в XLSX.utils.sheet_to_json.
+
+    Без резолвера бренды берутся только из встроенного списка.
+    """
+    rows = iter(rows)
+    header = next(rows, None)
+    columns = Columns.from_header(header) if header is not None else None
+    if columns is None:
+        return []
+    return resolve_brands(aggregate_rows(sold_rows(rows, columns), columns), month, resolver)
@@ -0,0 +1,203 @@
+"""Пакетная обработка книги: листы и акты в пуле процессов, ZIP потоком.
+
+Каждый лист разбирается и каждый месяц рендерится независимо, поэтому работа
+раздаётся ProcessPoolExecutor. Там, где процессы недоступны (AWS Lambda и
+Vercel — нет /dev/shm для семафоров), всё выполняется последовательно.
+Архив пишется через zipfile в несдвигаемый поток: готовые записи сразу
+отдаются в ответ, а не собираются в памяти целиком.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .aggregate import Item, extract_items
+from .brands import BrandResolver
+from .diff import RowsFingerprint
+from .docx import ACT_FORMATS, DEFAULT_FORMAT
+from .render import ACT_TITLES, act_file_name, default_act_date
+from .xlsx import open_workbook
+
+ZIP_NAME = 'Акты.zip'
+
+
+def default_workers() -> int:
+    """WB_ACTS_WORKERS или число ядер; 1 — без пула процессов."""
+    value = os.environ.get('WB_ACTS_WORKERS')
+    if value:
+        return max(1, int(value))
+    return os.cpu_count() or 1
+
+
+# Аргументы, общие для всех задач пула (каталог брендов): процессы получают их
+# один раз через initializer, а не вместе с каждой задачей
+_shared: tuple = ()
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_key: Optional[tuple] = None
+_pool_lock = threading.Lock()
+
+
+def _init_shared(shared: tuple) -> None:
+    global _shared
+    _shared = shared
+
+
+def _call_shared(function: Callable, *task):
+    return function(*task, *_shared)
+
+
+def _get_pool(workers: int, shared: tuple) -> ProcessPoolExecutor:
+    """Пул живёт между запросами; новый — только при другом числе процессов
+    или других общих аргументах (задачам без них подходит любой)."""
+    global _pool, _pool_key
+    with _pool_lock:
+        # BrandResolver сравнивается по тождеству: сервер держит один и тот же
+        if _pool is not None and _pool_key[0] == workers and (not shared or _pool_key[1] == shared):
+            return _pool
+        if _pool is not None:
+            # Дожидаемся потоков прежнего пула: fork при живых потоках управления
+            # изредка оставлял новый пул без задач, и запрос зависал
+            _pool.shutdown(wait=True)
+        _pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_shared,
+                                    initargs=(shared,))
+        _pool_key = (workers, shared)
+        return _pool
+
+
+def _drop_pool(pool: ProcessPoolExecutor) -> None:
+    global _pool, _pool_key
+    with _pool_lock:
+        if _pool is pool:
+            _pool, _pool_key = None, None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _map(function: Callable, tasks: Sequence[tuple], workers: int,
+         shared: tuple = ()) -> Iterator:
+    """function(*task, *shared) для каждой задачи; результаты — в порядке задач."""
+    done = 0
+    if workers > 1 and len(tasks) > 1:
+        pool = None
+        try:
+            pool = _get_pool(workers, shared)
+            if shared:
+                futures = [pool.submit(_call_shared, function, *task) for task in tasks]
+            else:
+                futures = [pool.submit(function, *task) for task in tasks]
+            try:
+                for future in futures:
+                    result = future.result()
+                    done += 1
+                    yield result
+            finally:
+                for future in futures[done:]:
+                    future.cancel()
+            return
+        except (OSError, NotImplementedError, BrokenProcessPool):
+            # Пул не создался или развалился — оставшееся доделываем в этом процессе
+            if pool is not None:
+                _drop_pool(pool)
+    for task in tasks[done:]:
+        yield function(*task, *shared)
+
+
+def _parse_sheet(path: str, sheet_name: str,
+                 resolver: Optional[BrandResolver]) -> List[Item]:
+    with open_workbook(path) as workbook:
+        return extract_items(workbook.iter_rows(sheet_name), sheet_name, resolver)
+
+
+def parse_sheets(path: str, sheet_names: Sequence[str],
+                 resolver: Optional[BrandResolver] = None,
+                 workers: int = 1) -> Iterator[Tuple[str, List[Item]]]:
+    """Позиции по листам в порядке sheet_names.
+
+    Без пула книга открывается один раз и общие строки читаются один раз;
+    в пуле каждый процесс открывает книгу сам, а каталог брендов получает
+    один раз при запуске, а не с каждым листом.
+    """
+    if workers > 1 and len(sheet_names) > 1:
+        tasks = [(path, name) for name in sheet_names]
+        yield from zip(sheet_names, _map(_parse_sheet, tasks, workers, (resolver,)))
+        return
+    with open_workbook(path) as workbook:
+        for name in sheet_names:
+            yield name, extract_items(workbook.iter_rows(name), name, resolver)
+
+
+def _scan_sheet(path: str, sheet_name: str,
+                resolver: Optional[BrandResolver]) -> Tuple[str, int, List[Item]]:
+    with open_workbook(path) as workbook:
+        rows = RowsFingerprint(workbook.iter_rows(sheet_name))
+        items = extract_items(rows, sheet_name, resolver)
+        return rows.hexdigest(), workbook.shared_strings_used(sheet_name), items
+
+
+def scan_sheets(path: str, sheet_names: Sequence[str],
+                resolver: Optional[BrandResolver] = None,
+                workers: int = 1) -> Iterator[Tuple[str, str, int, List[Item]]]:
+    """Как parse_sheets, но вместе с позициями — отпечаток содержимого листа
+    (diff.RowsFingerprint), посчитанный за тот же проход, и число общих строк,
+    на которые лист ссылается (Workbook.shared_strings_used)."""
+    if workers > 1 and len(sheet_names) > 1:
+        tasks = [(path, name) for name in sheet_names]
+        for name, (fingerprint, used, items) in zip(sheet_names, _map(_scan_sheet, tasks, workers, (resolver,))):
+            yield name, fingerprint, used, items
+        return
+    with open_workbook(path) as workbook:
+        for name in sheet_names:
+            rows = RowsFingerprint(workbook.iter_rows(name))
+            items = extract_items(rows, name, resolver)
+            yield name, rows.hexdigest(), workbook.shared_strings_used(name), items
+
+
+def _render_month(month: str, items: List[Item],
+                  file_format: str = DEFAULT_FORMAT) -> List[Tuple[str, bytes]]:
+    # Дата — последний день месяца, как подставляется по умолчанию
+    act_date = default_act_date(month)
+    render = ACT_FORMATS[file_format][1]
+    return [(act_file_name(kind, month, act_date, file_format), render(kind, items, month, act_date))
+            for kind in ACT_TITLES]
+
+
+def iter_month_files(months: Dict[str, List[Item]], workers: int = 1,
+                     file_format: str = DEFAULT_FORMAT) -> Iterator[Tuple[str, bytes]]:
+    """Имя файла и содержимое обоих актов за каждый месяц, по порядку месяцев."""
+    tasks = [(month, items, file_format) for month, items in months.items()]
+    for files in _map(_render_month, tasks, workers):
+        yield from files
+
+
+class _Chunks:
+    """Приёмник для zipfile: без tell/seek, поэтому zipfile пишет потоково."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def take(self) -> List[bytes]:
+        chunks, self._chunks = self._chunks, []
+        return chunks
+
+
+def stream_zip(files: Iterable[Tuple[str, bytes]]) -> Iterator[bytes]:
+    """ZIP по кускам: каждая запись уходит дальше сразу после сжатия."""
+    sink = _Chunks()
+    with zipfile.ZipFile(sink, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, data in files:
+            # .docx уже сжат внутри — повторное сжатие только тратит время
+            stored = zipfile.ZIP_STORED if name.endswith('.docx') else None
+            archive.writestr(name, data, compress_type=stored)
+            yield from sink.take()
+    yield from sink.take()
@@ -0,0 +1,256 @@
+"""Определение бренда и артикула продавца по артикулу WB.
+
+Python-версия js/brands.js: встроенный список, таблица брендов и правила по
+месяцам компилируются в один BrandResolver. Резолвер сохраняется в компактный
+файл (JSON, сжатый gzip) того же формата, что и в браузере:
+
+    python3 -m wb_acts.brands "Бренды.xlsx" -o "Каталог брендов.json.gz"
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import itertools
+import json
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+FORMAT = 'wb-brands'
+FORMAT_VERSION = 1
+
+# Специальный список из 119 артикулов (тот же, что brandArticles в js/brands.js)
+BRAND_ARTICLES = (
+    '236072463', '236072422', '236072464', '236072423', '236072500', '223409272',
+    '236072483', '236072420', '236072482', '236072466', '236072491', '236072502',
+    '236072529', '236072503', '236072444', '236072419', '230352568', '236072458',
+    '236072462', '236062809', '236072465', '236072515', '236072498', '236072442',
+    '236072508', '236072424', '236072450', '236072430', '236072475', '236072504',
+    '236072519', '236072426', '223861203', '236072433', '236072428', '236072518',
+    '236072448', '236072506', '236072436', '236072474', '236072471', '236072441',
+    '236072457', '236370991', '236072461', '236072520', '236072456', '236072486',
+    '236072455', '236072509', '223852788', '223402737', '236370968', '259042881',
+    '223402744', '223859054', '265591355', '265591354', '265591356', '223402739',
+    '216140144', '265591358', '265591564', '271711799', '223402760', '265591551',
+    '262696091', '236370990', '270538626', '230397965', '223402740', '236371005',
+    '223805238', '236370989', '223861200', '230231239', '230226603', '236370972',
+    '230359539', '236370969', '236294431', '223861204', '230353708', '223859052',
+    '236382828', '236370973', '254558872', '223805243', '265591566', '223834349',
+    '236072410', '223402720', '265591544', '273683311', '230229479', '278091287',
+    '278414535', '278494215', '262683102', '278139912', '236072412', '236370966',
+    '223861184', '236072414', '230226894', '275509508', '279082730', '223834347',
+    '254318877', '236382935', '236370965', '236382814', '265591559', '236370959',
+    '268543019', '277834382', '236382805', '236063560', '278479657',
+)
+
+BRAND_PALETTE = ('Lithium', 'Magnet', '—')
+
+# Если название месяца (в нижнем регистре) содержит все подстроки contains,
+# бренд для всех артикулов — brand. Апрель 24 — без брендов.
+MONTH_RULES = ({'contains': ['апр', '24'], 'brand': ''},)
+
+# Артикул WB -> {'brand': ..., 'sellerArticle': ...}, как прежний brandsMap в браузере
+BrandsMap = Mapping[str, Mapping[str, str]]
+
+
+class BrandsError(ValueError):
+    """Файл не является каталогом брендов."""
+
+
+def builtin_brand(article: str) -> str:
+    return BRAND_PALETTE[sum(map(ord, article)) % len(BRAND_PALETTE)]
+
+
+class BrandResolver:
+    """Артикул WB -> (бренд, артикул продавца) плюс правила по месяцам."""
+
+    def __init__(self, entries: Optional[Dict[str, Tuple[str, str]]] = None,
+                 month_rules: Sequence[dict] = MONTH_RULES, loaded: int = 0):
+        self._entries = entries if entries is not None else {}
+        self.month_rules = list(month_rules)
+        # Сколько артикулов пришло из таблицы брендов (без встроенного списка)
+        self.loaded = loaded
+        self._months: Dict[str, Optional[str]] = {}
+        self._fingerprint: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def month_brand(self, month: Optional[str]) -> Optional[str]:
+        """Бренд, заданный правилом для месяца, или None."""
+        if not month:
+            return None
+        if month not in self._months:
+            lower = month.lower()
+            self._months[month] = next(
+                (rule['brand'] for rule in self.month_rules
+                 if all(part in lower for part in rule['contains'])), None)
+        return self._months[month]
+
+    def resolve(self, article: str, month: Optional[str] = None) -> Tuple[str, str]:
+        brand, seller = self._entries.get(article, ('', ''))
+        override = self.month_brand(month)
+        return (brand if override is None else override), seller
+
+    def to_json(self) -> dict:
+        brands: Dict[str, int] = {'': 0}
+        brand_ids: List[int] = []
+        sellers: List[str] = []
+        for brand, seller in self._entries.values():
+            brand_ids.append(brands.setdefault(brand, len(brands)))
+            sellers.append(seller)
+        # Ключи в том же порядке, что и JSON.stringify в js/brands.js
+        return {
+            'format': FORMAT,
+            'version': FORMAT_VERSION,
+            'loaded': self.loaded,
+            'monthRules': self.month_rules,
+            'brands': list(brands),
+            'skus': list(self._entries),
+            'brandIds': brand_ids,
+            'sellerArticles': sellers,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> 'BrandResolver':
+        if not isinstance(data, dict) or data.get('format') != FORMAT \
+                or data.get('version') != FORMAT_VERSION:
+            raise BrandsError('Неизвестный формат каталога брендов')
+        brands = data['brands']
+        entries = {sku: (brands[brand_id], seller) for sku, brand_id, seller
+                   in zip(data['skus'], data['brandIds'], data['sellerArticles'])}
+        return cls(entries, data.get('monthRules', MONTH_RULES), data.get('loaded', 0))
+
+    def _canonical(self) -> bytes:
+        return json.dumps(self.to_json(), ensure_ascii=False,
+                          separators=(',', ':')).encode('utf-8')
+
+    def dumps(self) -> bytes:
+        return gzip.compress(self._canonical(), compresslevel=6, mtime=0)
+
+    @classmethod
+    def loads(cls, payload: bytes) -> 'BrandResolver':
+        if payload[:2] == b'\x1f\x8b':
+            payload = gzip.decompress(payload)
+        try:
+            data = json.loads(payload)
+        except ValueError as error:
+            raise BrandsError('Файл не является каталогом брендов') from error
+        return cls.from_json(data)
+
+    def fingerprint(self) -> str:
+        """Для ключей кэша: без загруженного каталога — 'none', как в браузере."""
+        if not self.loaded:
+            return 'none'
+        # Резолвер не меняется после сборки — считаем один раз
+        if self._fingerprint is None:
+            self._fingerprint = hashlib.sha256(self._canonical()).hexdigest()
+        return self._fingerprint
+
+
+class BrandResolverBuilder:
+    """Сборка резолвера из строк таблицы брендов: первая запись артикула
+    побеждает, встроенный список перекрывает бренд, но не артикул продавца."""
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[str, str]] = {}
+        self._brands: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, article, brand=None, seller_article=None) -> None:
+        article = str(article).strip()
+        if not article or article in self._entries:
+            return
+        brand = str(brand).strip() if brand else ''
+        # Один объект строки на бренд: в каталоге на миллион строк брендов немного
+        brand = self._brands.setdefault(brand, brand)
+        self._entries[article] = (brand, str(seller_article).strip() if seller_article else '')
+
+    def build(self) -> BrandResolver:
+        loaded = len(self._entries)
+        for article in BRAND_ARTICLES:
+            seller = self._entries.get(article, ('', ''))[1]
+            self._entries[article] = (builtin_brand(article), seller)
+        return BrandResolver(self._entries, loaded=loaded)
+
+
+def compile_brands(brands_map: Optional[BrandsMap] = None) -> BrandResolver:
+    builder = BrandResolverBuilder()
+    for article, entry in (brands_map or {}).items():
+        builder.add(article, entry.get('brand'), entry.get('sellerArticle'))
+    return builder.build()
+
+
+def _find_column(header: Sequence, title: str) -> int:
+    return next((i for i, cell in enumerate(header) if title in str(cell)), -1)
+
+
+def read_brands_rows(rows: Iterable[Sequence]) -> BrandResolver:
+    """Строки таблицы брендов, как в handleBrandsFileUpload: строка заголовков
+    ищется среди первых десяти по колонкам «Бренд» и «Артикул WB»."""
+    rows = iter(rows)
+    head = []
+    header = None
+    for row in rows:
+        head.append(row)
+        if any('Бренд' in str(cell) for cell in row) and \
+                any('Артикул WB' in str(cell) for cell in row):
+            header = row
+            break
+        if len(head) == 10:
+            break
+    if header is None:
+        if not head:
+            return BrandResolverBuilder().build()
+        # Как в браузере: без явных заголовков первой считается первая строка
+        header, rows = head[0], itertools.chain(head[1:], rows)
+
+    brand_i = _find_column(header, 'Бренд')
+    article_i = _find_column(header, 'Артикул WB')
+    seller_i = _find_column(header, 'Артикул продавца')
+
+    def cell(row: Sequence, index: int):
+        return row[index] if 0 <= index < len(row) else None
+
+    builder = BrandResolverBuilder()
+    for row in rows:
+        article = cell(row, article_i)
+        if article:
+            builder.add(article, cell(row, brand_i),
+                        cell(row, seller_i) if seller_i >= 0 else '')
+    return builder.build()
+
+
+def load_brands(path: str) -> BrandResolver:
+    """Каталог из XLSX (первый лист) или из сохранённого .json/.json.gz."""
+    from .xlsx import XlsxError, open_workbook
+
+    with open(path, 'rb') as source:
+        signature = source.read(2)
+    if signature == b'PK':
+        try:
+            with open_workbook(path) as workbook:
+                return read_brands_rows(workbook.iter_rows(workbook.sheet_names[0]))
+        except (XlsxError, IndexError) as error:
+            raise BrandsError(f'Не удалось прочитать таблицу брендов: {error}') from error
+    with open(path, 'rb') as source:
+        return BrandResolver.loads(source.read())
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description='Компиляция таблицы брендов в компактный каталог')
+    parser.add_argument('source', help='таблица брендов (.xlsx) или каталог (.json.gz)')
+    parser.add_argument('-o', '--output', required=True, help='куда сохранить каталог (.json.gz)')
+    args = parser.parse_args(argv)
+
+    resolver = load_brands(args.source)
+    payload = resolver.dumps()
+    with open(args.output, 'wb') as target:
+        target.write(payload)
+    print(f'Артикулов: {resolver.loaded} (+ встроенный список), '
+          f'каталог: {len(payload) / 1024:.1f} КБ')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+"""Кэш агрегированных позиций по месяцам.
+
+Ключ — отпечаток содержимого листа (diff.py), отпечаток каталога брендов
+(BrandResolver.fingerprint) и имя листа. В памяти держится
+LRU с ограничением по размеру, на диске — JSON-файлы, переживающие перезапуск
+(на Vercel — в /tmp, пока жив экземпляр функции). Повторная загрузка той же
+выгрузки не открывает XLSX вовсе: листы и их ключи берутся из манифеста книги
+(по SHA-256 файла), а в исправленной выгрузке неизменённые листы находятся по
+отпечатку из каталога ZIP.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from .aggregate import Item
+
+# Меняется при изменении логики агрегации — старые записи перестают совпадать
+CACHE_VERSION = 1
+
+MAX_MEMORY_BYTES = 64 * 1024 * 1024
+MAX_DISK_BYTES = 512 * 1024 * 1024
+
+_HASH = re.compile(r'^[0-9a-f]{64}$')
+
+
+def default_data_dir() -> str:
+    return os.environ.get('WB_ACTS_DATA_DIR') or os.path.join(tempfile.gettempdir(), 'wb-acts')
+
+
+def items_key(sheet_key: str, brands_hash: str, sheet_name: str) -> str:
+    payload = f'{CACHE_VERSION}\0{sheet_key}\0{brands_hash}\0{sheet_name}'
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _raw_key(raw_fingerprint: str) -> str:
+    return hashlib.sha256(raw_fingerprint.encode('utf-8')).hexdigest()
+
+
+class ItemsCache:
+    def __init__(self, directory: Optional[str] = None,
+                 max_memory_bytes: int = MAX_MEMORY_BYTES,
+                 max_disk_bytes: int = MAX_DISK_BYTES):
+        self.directory = directory or default_data_dir()
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._memory_bytes = 0
+        # Байт на диске по нашим же записям; None — каталог ещё не обходили.
+        # Каталог целиком обходится, только когда сумма превысила предел
+        self._disk_bytes: Optional[int] = None
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key: str, suffix: str) -> str:
+        if not _HASH.match(key or ''):
+            raise KeyError(key)
+        return os.path.join(self.directory, f'{key}.{suffix}.json')
+
+    def _remember(self, key: str, payload: bytes) -> None:
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._memory_bytes -= len(old)
+            if len(payload) > self.max_memory_bytes:
+                return
+            self._memory[key] = payload
+            self._memory_bytes += len(payload)
+            while self._memory_bytes > self.max_memory_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+
+    def _recall(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            payload = self._memory.get(key)
+            if payload is not None:
+                self._memory.move_to_end(key)
+            return payload
+
+    def _read(self, key: str, suffix: str) -> Optional[bytes]:
+        payload = self._recall(key)
+        if payload is not None:
+            return payload
+        try:
+            path = self._path(key, suffix)
+            with open(path, 'rb') as source:
+                payload = source.read()
+            # Время доступа обновляем вручную: noatime на дисках встречается часто
+            os.utime(path)
+        except (KeyError, FileNotFoundError):
+            return None
+        self._remember(key, payload)
+        return payload
+
+    def _write(self, key: str, suffix: str, payload: bytes) -> None:
+        self._remember(key, payload)
+        path = self._path(key, suffix)
+        try:
+            replaced = os.stat(path).st_size
+        except FileNotFoundError:
+            replaced = 0
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as target:
+            target.write(payload)
+        os.replace(tmp, path)
+        with self._lock:
+            if self._disk_bytes is not None:
+                self._disk_bytes += len(payload) - replaced
+            if self._disk_bytes is None or self._disk_bytes > self.max_disk_bytes:
+                self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        """Обходит каталог и заново считает занятые байты (их могли менять и
+        другие процессы). Сверх предела удаляет давно не читанные записи с
+        запасом в десятую часть, чтобы следующие записи не обходили каталог снова."""
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if entry.name.endswith('.json'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        if total > self.max_disk_bytes:
+            for _, size, path in sorted(entries):
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                if total <= self.max_disk_bytes * 9 // 10:
+                    break
+        self._disk_bytes = total
+
+    def get_items(self, key: str) -> Optional[List[Item]]:
+        payload = self._read(key, 'items')
+        if payload is None:
+            return None
+        return [Item.from_dict(item) for item in json.loads(payload)]
+
+    def put_items(self, key: str, items: List[Item]) -> None:
+        payload = json.dumps([item.to_dict() for item in items], ensure_ascii=False)
+        self._write(key, 'items', payload.encode('utf-8'))
+
+    def get_sheet_keys(self, workbook_hash: str) -> Optional[Dict[str, str]]:
+        """Манифест книги: лист -> ключ содержимого, в порядке листов."""
+        payload = self._read(workbook_hash, 'sheetkeys')
+        return json.loads(payload) if payload is not None else None
+
+    def put_sheet_keys(self, workbook_hash: str, sheet_keys: Dict[str, str]) -> None:
+        payload = json.dumps(sheet_keys, ensure_ascii=False)
+        self._write(workbook_hash, 'sheetkeys', payload.encode('utf-8'))
+
+    def get_fingerprint(self, raw_fingerprint: str) -> Optional[str]:
+        """Отпечаток содержимого по отпечатку листа из каталога ZIP."""
+        payload = self._read(_raw_key(raw_fingerprint), 'fingerprint')
+        return json.loads(payload) if payload is not None else None
+
+    def put_fingerprint(self, raw_fingerprint: str, content_fingerprint: str) -> None:
+        self._write(_raw_key(raw_fingerprint), 'fingerprint', json.dumps(content_fingerprint).encode('utf-8'))
+
+    def month_items(self, workbook_hash: str, brands_hash: str,
+                    sheet_name: str) -> Optional[List[Item]]:
+        """Позиции одного месяца загруженной книги."""
+        sheet_keys = self.get_sheet_keys(workbook_hash)
+        if sheet_keys is None or sheet_name not in sheet_keys:
+            return None
+        return self.get_items(items_key(sheet_keys[sheet_name], brands_hash, sheet_name))
+
+    def lookup(self, workbook_hash: str, brands_hash: str) -> Optional[Dict[str, List[Item]]]:
+        """Все месяцы книги, если каждый из них уже есть в кэше."""
+        sheet_keys = self.get_sheet_keys(workbook_hash)
+        if sheet_keys is None:
+            return None
+        months = {}
+        for sheet_name, sheet_key in sheet_keys.items():
+            items = self.get_items(items_key(sheet_key, brands_hash, sheet_name))
+            if items is None:
+                return None
+            months[sheet_name] = items
+        return months
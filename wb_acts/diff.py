@@ -0,0 +1,142 @@
+"""Повторная загрузка исправленной выгрузки — Python-версия js/workbook-diff.js.
+
+Позиции месяца в кэше хранятся по отпечатку содержимого листа, а не всей книги:
+правка одного месяца не сбрасывает остальные. Отпечаток из каталога ZIP
+(Workbook.sheet_fingerprint) бесплатен, но меняется и у нетронутых листов, когда
+меняются общие строки. Поэтому по нему ищется отпечаток содержимого — SHA-256
+значений ячеек. Если правка только дописала общие строки, лист узнаётся по XML
+и нужным ему общим строкам (Workbook.strings_fingerprint). Если нет и его,
+лист разбирается, и отпечаток считается по тем же строкам, что идут в агрегацию.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator, List, Mapping
+
+from .aggregate import Item
+from .xlsx import Row
+
+
+class RowsFingerprint:
+    """Пропускает строки листа насквозь и считает SHA-256 их значений."""
+
+    def __init__(self, rows: Iterable[Row]):
+        self._rows = iter(rows)
+        self._hash = hashlib.sha256()
+
+    def __iter__(self) -> Iterator[Row]:
+        for row in self._rows:
+            self._hash.update(json.dumps(row, ensure_ascii=False).encode('utf-8'))
+            self._hash.update(b'\n')
+            yield row
+
+    def hexdigest(self) -> str:
+        # Агрегация могла остановиться на шапке (нет колонки статуса) — дочитываем лист
+        for _ in self:
+            pass
+        return self._hash.hexdigest()
+
+
+def _is_zero(value: float) -> bool:
+    # Копейки: суммы складываются во float, сравниваем с допуском
+    return abs(value) < 0.005
+
+
+@dataclass
+class ItemDelta:
+    sku: str
+    name: str
+    quantity: int
+    total_price: float
+
+    def to_dict(self) -> dict:
+        return {'sku': self.sku, 'name': self.name, 'quantity': self.quantity,
+                'totalPrice': round(self.total_price, 2)}
+
+
+@dataclass
+class MonthDiff:
+    """Разница позиций месяца; приращения — «стало минус было»."""
+    month: str
+    added: List[ItemDelta] = field(default_factory=list)
+    removed: List[ItemDelta] = field(default_factory=list)
+    changed: List[ItemDelta] = field(default_factory=list)
+    quantity: int = 0
+    total_price: float = 0.0
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.changed) and _is_zero(self.total_price)
+
+    def to_dict(self) -> dict:
+        return {
+            'month': self.month,
+            'added': [delta.to_dict() for delta in self.added],
+            'removed': [delta.to_dict() for delta in self.removed],
+            'changed': [delta.to_dict() for delta in self.changed],
+            'quantity': self.quantity,
+            'totalPrice': round(self.total_price, 2),
+        }
+
+
+def diff_items(month: str, before: Iterable[Item], after: Iterable[Item]) -> MonthDiff:
+    """Разница позиций месяца между загрузками по артикулу WB."""
+    previous = {item.sku: item for item in before}
+    diff = MonthDiff(month)
+    for item in after:
+        old = previous.pop(item.sku, None)
+        delta = ItemDelta(item.sku, item.name,
+                          item.quantity - (old.quantity if old else 0),
+                          item.total_price - (old.total_price if old else 0))
+        diff.quantity += delta.quantity
+        diff.total_price += delta.total_price
+        if old is None:
+            diff.added.append(delta)
+        elif delta.quantity or not _is_zero(delta.total_price):
+            diff.changed.append(delta)
+    for sku, old in previous.items():
+        diff.removed.append(ItemDelta(sku, old.name, -old.quantity, -old.total_price))
+        diff.quantity -= old.quantity
+        diff.total_price -= old.total_price
+    return diff
+
+
+@dataclass
+class UploadDiff:
+    """Листы новой загрузки относительно предыдущей."""
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    changed: List[MonthDiff] = field(default_factory=list)
+    unchanged: int = 0
+
+    def to_dict(self) -> dict:
+        return {'added': self.added, 'removed': self.removed,
+                'changed': [month.to_dict() for month in self.changed],
+                'unchanged': self.unchanged}
+
+
+def diff_uploads(before: Mapping[str, str], after: Mapping[str, str],
+                 items_of: Callable[[str, str], List[Item]]) -> UploadDiff:
+    """before/after — лист -> ключ содержимого; items_of(ключ, лист) — позиции.
+
+    Позиции читаются только для листов, ключ которых изменился. Лист, у которого
+    сменилось содержимое, но не позиции (правка в непроданных строках), считается
+    неизменённым: его акты перегенерировать не нужно.
+    """
+    diff = UploadDiff()
+    for month, key in after.items():
+        if month not in before:
+            diff.added.append(month)
+        elif before[month] != key:
+            month_diff = diff_items(month, items_of(before[month], month), items_of(key, month))
+            if month_diff.is_empty:
+                diff.unchanged += 1
+            else:
+                diff.changed.append(month_diff)
+        else:
+            diff.unchanged += 1
+    diff.removed = [month for month in before if month not in after]
+    return diff
+
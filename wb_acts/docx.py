@@ -0,0 +1,302 @@
+"""Акты в формате Word 2007+ (.docx) — то же, что js/docx.js.
+
+Макеты общие с HTML-актами (ACT_LAYOUTS в render.py). word/document.xml
+собирается построчно и кусками пишется в ZIP через ZipFile.open(..., 'w'):
+весь XML в памяти не держится. Таблица — с фиксированной сеткой колонок,
+шапка повторяется на каждой странице.
+"""
+from __future__ import annotations
+
+import io
+import re
+import zipfile
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from .aggregate import Item
+from .render import (
+    CHUNK_SIZE, ActLayout, Block, Party, act_data, act_layout, compile_template,
+    default_act_date, line_parts, render_act,
+)
+
+DOCX_MIME = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+# A4 и поля как в @page HTML-акта (2cm 1.5cm 2cm 2cm), в твипах
+PAGE = {'width': 11906, 'height': 16838, 'top': 1134, 'right': 850, 'bottom': 1134, 'left': 1134}
+TEXT_WIDTH = PAGE['width'] - PAGE['left'] - PAGE['right']
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+
+# Символы, недопустимые в XML 1.0 (из ячеек Excel попадают управляющие)
+_INVALID_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+
+def _escape(text: str) -> str:
+    # Для текста из макета (он не экранирован); значения колонок уже прошли _text
+    text = str(text).replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+    return _INVALID_XML.sub('', text)
+
+
+def _run(text: str, bold: bool = False) -> str:
+    return f'<w:r>{"<w:rPr><w:b/></w:rPr>" if bold else ""}<w:t xml:space="preserve">{text}</w:t></w:r>'
+
+
+def _paragraph_props(style: str) -> str:
+    return f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ''
+
+
+def _paragraph(content: str, style: str = '') -> str:
+    return f'<w:p>{_paragraph_props(style)}{content}</w:p>'
+
+
+_EMPTY_LINE = _paragraph('', 'Body')
+
+
+def _blocks_xml(blocks: Sequence[Block]) -> str:
+    def xml(block: Block) -> str:
+        if block.tag == 'br':
+            return _EMPTY_LINE
+        if block.tag == 'h2':
+            return _paragraph(_run(_escape(block.text)), 'ActTitle')
+        return _paragraph(_run(_escape(block.text), block.bold), 'Right' if block.align == 'right' else 'Body')
+    return '\n'.join(xml(block) for block in blocks)
+
+
+def _grid_widths(layout: ActLayout, table_width: int) -> List[int]:
+    # Как Math.round в js/docx.js; округление добирает последняя колонка
+    widths = [int(table_width * column.width / 100 + 0.5) for column in layout.columns]
+    widths[-1] += table_width - sum(widths)
+    return widths
+
+
+_CELL_STYLES = {'c': 'CellC', 'r': 'CellR'}
+
+# Пробелы по краям значения не сохраняются — как и в HTML-акте
+_CELL_END = '</w:t></w:r></w:p></w:tc>'
+
+
+def _head_cell(title: str, width: int, extra: str = '') -> str:
+    return (f'<w:tc><w:tcPr><w:tcW w:w="{width}" w:type="dxa"/>{extra}'
+            '<w:shd w:val="clear" w:color="auto" w:fill="F0F0F0"/></w:tcPr>'
+            f'{_paragraph(_run(_escape(title)) if title else "", "CellHead")}</w:tc>')
+
+
+def _requisites_xml(parties: Sequence[Party]) -> str:
+    """Реквизиты — таблица без рамок на две колонки."""
+    width = int(TEXT_WIDTH / len(parties) + 0.5)
+    line_break = '<w:r><w:br/></w:r>'
+
+    def cell(party: Party) -> str:
+        return ''.join([
+            f'<w:tc><w:tcPr><w:tcW w:w="{width}" w:type="dxa"/></w:tcPr>',
+            _paragraph(_run(_escape(party.title), True), 'Requisites'),
+            _paragraph('', 'Requisites'),
+            *(_paragraph(line_break.join(_run(_escape(part)) for part in line_parts(line)), 'Requisites')
+              for line in party.lines),
+            _paragraph('', 'Requisites'),
+            _paragraph('', 'Requisites'),
+            _paragraph(_run('_________________________'), 'Requisites'),
+            '</w:tc>',
+        ])
+    grid = ''.join(f'<w:gridCol w:w="{width}"/>' for _ in parties)
+    return '\n'.join([
+        '<w:tbl><w:tblPr><w:tblW w:w="5000" w:type="pct"/><w:tblLayout w:type="fixed"/>',
+        '<w:tblCellMar><w:top w:w="150" w:type="dxa"/><w:left w:w="150" w:type="dxa"/>',
+        '<w:bottom w:w="150" w:type="dxa"/><w:right w:w="150" w:type="dxa"/></w:tblCellMar></w:tblPr>',
+        f'<w:tblGrid>{grid}</w:tblGrid>',
+        f'<w:tr>{"".join(cell(party) for party in parties)}</w:tr></w:tbl>',
+    ])
+
+
+def _style(style_id: str, based_on: str = '', ppr: str = '', rpr: str = '') -> str:
+    kind = ' w:default="1"' if style_id == 'Normal' else ' w:customStyle="1"'
+    return (f'<w:style w:type="paragraph"{kind} w:styleId="{style_id}"><w:name w:val="{style_id}"/>'
+            + (f'<w:basedOn w:val="{based_on}"/>' if based_on else '')
+            + (f'<w:pPr>{ppr}</w:pPr>' if ppr else '')
+            + (f'<w:rPr>{rpr}</w:rPr>' if rpr else '') + '</w:style>')
+
+
+def _styles_xml(layout: ActLayout) -> str:
+    """Стиль по умолчанию (Normal) — текст ячеек таблицы: ячеек в акте тысячи, и в
+    каждой не нужны свойства абзаца. Текст акта — стиль Body и основанные на нём."""
+    font = layout.font.split(',')[0].strip()
+    borders = ''.join(f'<w:{side} w:val="single" w:sz="4" w:space="0" w:color="000000"/>'
+                      for side in ('top', 'left', 'bottom', 'right', 'insideH', 'insideV'))
+    return '\n'.join([
+        XML_HEADER + f'<w:styles xmlns:w="{W_NS}">',
+        f'<w:docDefaults><w:rPrDefault><w:rPr><w:rFonts w:ascii="{font}" w:hAnsi="{font}" '
+        f'w:cs="{font}" w:eastAsia="{font}"/>'
+        '<w:sz w:val="22"/><w:szCs w:val="22"/><w:lang w:val="ru-RU"/></w:rPr></w:rPrDefault>'
+        '<w:pPrDefault><w:pPr><w:spacing w:before="60" w:after="60" w:line="312" w:lineRule="auto"/>'
+        '</w:pPr></w:pPrDefault></w:docDefaults>',
+        _style('Normal', ppr='<w:spacing w:before="0" w:after="0" w:line="240" w:lineRule="auto"/>'
+                             '<w:jc w:val="left"/>',
+               rpr='<w:sz w:val="14"/><w:szCs w:val="14"/>'),
+        _style('CellC', 'Normal', '<w:jc w:val="center"/>'),
+        _style('CellR', 'Normal', '<w:jc w:val="right"/>'),
+        _style('CellHead', 'Normal', '<w:jc w:val="center"/>', '<w:b/>'),
+        _style('Body', ppr='<w:jc w:val="both"/>' if layout.justify else ''),
+        _style('Right', 'Body', '<w:jc w:val="right"/>'),
+        _style('ActTitle', 'Body',
+               '<w:keepNext/><w:spacing w:before="240" w:after="240"/><w:jc w:val="center"/>',
+               '<w:b/><w:sz w:val="32"/><w:szCs w:val="32"/>'),
+        _style('Requisites',
+               ppr='<w:spacing w:before="75" w:after="75" w:line="240" w:lineRule="auto"/><w:jc w:val="left"/>',
+               rpr='<w:sz w:val="20"/><w:szCs w:val="20"/>'),
+        '<w:style w:type="table" w:customStyle="1" w:styleId="ActTable"><w:name w:val="ActTable"/><w:tblPr>'
+        f'<w:tblBorders>{borders}</w:tblBorders>'
+        '<w:tblCellMar><w:top w:w="15" w:type="dxa"/><w:left w:w="15" w:type="dxa"/>'
+        '<w:bottom w:w="15" w:type="dxa"/><w:right w:w="15" w:type="dxa"/></w:tblCellMar></w:tblPr></w:style>',
+        '</w:styles>',
+    ])
+
+
+CONTENT_TYPES = (
+    XML_HEADER
+    + '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '<Override PartName="/word/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>'
+    '<Override PartName="/docProps/core.xml" '
+    'ContentType="application/vnd.openxmlformats-package.core-properties+xml"/>'
+    '</Types>'
+)
+
+PACKAGE_RELS = (
+    XML_HEADER
+    + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/'
+    'officeDocument" Target="word/document.xml"/>'
+    '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/package/2006/relationships/metadata/'
+    'core-properties" Target="docProps/core.xml"/>'
+    '</Relationships>'
+)
+
+DOCUMENT_RELS = (
+    XML_HEADER
+    + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/'
+    'styles" Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+
+def _core_xml(title: str) -> str:
+    return (XML_HEADER
+            + '<cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/'
+            'core-properties" xmlns:dc="http://purl.org/dc/elements/1.1/">'
+            f'<dc:title>{_escape(title)}</dc:title><dc:language>ru-RU</dc:language></cp:coreProperties>')
+
+
+class _DocxLayout:
+    """Статические части document.xml; {{date}}, {{total}} и т. п. — данные акта."""
+
+    def __init__(self, layout: ActLayout):
+        columns = layout.columns
+        table_width = int(TEXT_WIDTH * layout.table_width / 100 + 0.5)
+        widths = _grid_widths(layout, table_width)
+        last = len(columns) - 1
+        header_row = '<w:tr><w:trPr><w:tblHeader/></w:trPr>'
+        restart = '<w:vMerge w:val="restart"/>'
+        grid = ''.join(f'<w:gridCol w:w="{width}"/>' for width in widths)
+        inner = ''.join(_head_cell(column.title, widths[i])
+                        for i, column in enumerate(columns) if 0 < i < last)
+
+        head = '\n'.join([
+            XML_HEADER + f'<w:document xmlns:w="{W_NS}"><w:body>',
+            _blocks_xml(layout.heading),
+            f'<w:tbl><w:tblPr><w:tblStyle w:val="ActTable"/><w:tblW w:w="{table_width}" w:type="dxa"/>'
+            '<w:jc w:val="center"/><w:tblLayout w:type="fixed"/></w:tblPr>',
+            f'<w:tblGrid>{grid}</w:tblGrid>',
+            # Первая и последняя колонки — на две строки шапки, остальные — под «Товар»
+            header_row + _head_cell(columns[0].title, widths[0], restart)
+            + _head_cell('Товар', sum(widths[1:-1]), f'<w:gridSpan w:val="{last - 1}"/>')
+            + _head_cell(columns[last].title, widths[last], restart) + '</w:tr>',
+            header_row + _head_cell('', widths[0], '<w:vMerge/>') + inner
+            + _head_cell('', widths[last], '<w:vMerge/>') + '</w:tr>',
+            '',
+        ])
+        tail = '\n'.join([
+            f'<w:tr><w:tc><w:tcPr><w:gridSpan w:val="{last}"/></w:tcPr>{_paragraph(_run("Итого", True), "CellR")}'
+            f'</w:tc><w:tc>{_paragraph(_run("{{total}}", True), "CellR")}</w:tc></w:tr>',
+            '</w:tbl>',
+            _blocks_xml(layout.footer),
+            _EMPTY_LINE + '\n' + _EMPTY_LINE,
+            _requisites_xml(layout.requisites),
+            f'<w:sectPr><w:pgSz w:w="{PAGE["width"]}" w:h="{PAGE["height"]}"/>'
+            f'<w:pgMar w:top="{PAGE["top"]}" w:right="{PAGE["right"]}" w:bottom="{PAGE["bottom"]}" '
+            f'w:left="{PAGE["left"]}" w:header="709" w:footer="709" w:gutter="0"/></w:sectPr>',
+            '</w:body></w:document>',
+        ])
+        self.head = compile_template(head)
+        self.tail = compile_template(tail)
+        # Ячейка строки — готовые начало и конец, между ними только значение
+        self.cells = [f'<w:tc><w:p>{_paragraph_props(_CELL_STYLES.get(column.align, ""))}<w:r><w:t>'
+                      for column in columns]
+        self.values = [column.value for column in columns]
+        self.styles = _styles_xml(layout)
+        self.title = layout.title
+
+
+_compiled: Dict[str, _DocxLayout] = {}
+
+
+def _docx_layout(kind: str) -> _DocxLayout:
+    if kind not in _compiled:
+        _compiled[kind] = _DocxLayout(act_layout(kind))
+    return _compiled[kind]
+
+
+def iter_document_xml(kind: str, items: List[Item], month_name: str,
+                      act_date: date) -> Iterator[str]:
+    """word/document.xml кусками примерно по CHUNK_SIZE символов — как documentXmlChunks."""
+    layout = _docx_layout(kind)
+    data = act_data(kind, items, month_name, act_date)
+    parts = list(layout.head(data))
+    size = 0
+    cells = list(zip(layout.cells, layout.values))
+    for index, item in enumerate(items):
+        row = ''.join([cell + _INVALID_XML.sub('', str(value(item, index))) + _CELL_END
+                       for cell, value in cells])
+        parts.append(f'<w:tr>{row}</w:tr>\n')
+        size += len(row)
+        if size >= CHUNK_SIZE:
+            yield ''.join(parts)
+            parts = []
+            size = 0
+    parts.extend(layout.tail(data))
+    yield ''.join(parts)
+
+
+def render_docx(kind: str, items: List[Item], month_name: str,
+                act_date: Optional[date] = None) -> bytes:
+    """Готовый .docx: части пакета, word/document.xml — потоком в ZIP."""
+    if act_date is None:
+        act_date = default_act_date(month_name)
+    layout = _docx_layout(kind)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as package:
+        package.writestr('[Content_Types].xml', CONTENT_TYPES)
+        package.writestr('_rels/.rels', PACKAGE_RELS)
+        package.writestr('docProps/core.xml', _core_xml(layout.title))
+        with package.open('word/document.xml', 'w') as document:
+            for chunk in iter_document_xml(kind, items, month_name, act_date):
+                document.write(chunk.encode('utf-8'))
+        package.writestr('word/styles.xml', layout.styles)
+        package.writestr('word/_rels/document.xml.rels', DOCUMENT_RELS)
+    return buffer.getvalue()
+
+
+# Форматы файла акта: расширение -> (Content-Type, рендер); .doc — прежний HTML
+ACT_FORMATS = {
+    'docx': (DOCX_MIME, render_docx),
+    'doc': ('application/msword; charset=utf-8', render_act),
+}
+
+# Без ?format= маршруты отдают прежний .doc: ссылки и сценарии, рассчитанные
+# на него, не ломаются; .docx — по выбору
+DEFAULT_FORMAT = 'doc'
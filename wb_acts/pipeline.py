@@ -0,0 +1,338 @@
+"""Генерация актов без интерфейса, с разбивкой времени по этапам.
+
+    python3 -m wb_acts.pipeline Выгрузка.xlsx --brands Бренды.xlsx
+    python3 -m wb_acts.pipeline Выгрузка.xlsx --month "Январь 24" --acceptance-date 2024-01-20 -o Акты/
+    python3 -m wb_acts.pipeline Выгрузка.xlsx --json отчёт.json
+
+Этапы те же, что на странице: чтение книги и каталога брендов, разбор листа,
+отбор «Продано», агрегация, бренды, проверка артикулов продавца, рендер и запись.
+Для каждого этапа печатается время и скорость, для всего прогона — пиковый RSS
+процесса (ru_maxrss только растёт, поэтому по этапам он не делится).
+Разбор, отбор и агрегация идут одним потоком строк, поэтому их время меряется
+внутри итераторов и не требует держать строки листа в памяти.
+
+Результат — ZIP (по умолчанию «<книга> - акты.zip») или папка, если -o не
+оканчивается на .zip. Конфликты артикулов продавца выводятся предупреждением,
+с --strict генерация на них останавливается.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+import zipfile
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+from .aggregate import Columns, Item, aggregate_rows, resolve_brands, sold_rows
+from .brands import BrandsError, compile_brands, load_brands
+from .docx import ACT_FORMATS, DEFAULT_FORMAT
+from .render import ACT_TITLES, act_file_name, default_act_date
+from .validate import Conflict, SellerArticleIndex
+from .xlsx import XlsxError, open_workbook
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# (этап, заголовок, единица скорости) в порядке выполнения
+STAGES = (
+    ('read', 'чтение', ''),
+    ('parse', 'разбор листа', 'строк'),
+    ('filter', 'отбор «Продано»', 'строк'),
+    ('aggregate', 'агрегация', 'строк'),
+    ('brands', 'бренды', 'позиций'),
+    ('validate', 'проверка', 'позиций'),
+    ('render', 'рендер', 'позиций'),
+    ('write', 'запись', 'файлов'),
+)
+
+
+class PipelineError(ValueError):
+    pass
+
+
+def peak_rss_bytes() -> int:
+    """Пиковый RSS процесса; 0 — если ОС его не сообщает."""
+    if resource is None:
+        return 0
+    # В Linux ru_maxrss в килобайтах, в macOS — в байтах
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+@dataclass
+class StageStats:
+    seconds: float = 0.0
+    # Сколько прошло через этап: строк, позиций или файлов (см. STAGES)
+    count: int = 0
+
+    @property
+    def rate(self) -> float:
+        return self.count / self.seconds if self.seconds > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        return {'seconds': self.seconds, 'count': self.count, 'rate': self.rate}
+
+
+@dataclass
+class PipelineReport:
+    output: str
+    months: List[str]
+    rows: int = 0
+    items: int = 0
+    files: List[str] = field(default_factory=list)
+    bytes_written: int = 0
+    conflicts: List[Conflict] = field(default_factory=list)
+    seconds: float = 0.0
+    # Пиковый RSS процесса за весь прогон
+    peak_rss: int = 0
+    stages: Dict[str, StageStats] = field(
+        default_factory=lambda: {stage: StageStats() for stage, _, _ in STAGES})
+
+    def to_dict(self) -> dict:
+        return {
+            'output': self.output,
+            'months': self.months,
+            'rows': self.rows,
+            'items': self.items,
+            'files': self.files,
+            'bytes_written': self.bytes_written,
+            'conflicts': [conflict.to_dict() for conflict in self.conflicts],
+            'seconds': self.seconds,
+            'rows_per_second': self.rows / self.seconds if self.seconds > 0 else 0.0,
+            'peak_rss': self.peak_rss,
+            'stages': {stage: stats.to_dict() for stage, stats in self.stages.items()},
+        }
+
+    def format(self) -> str:
+        lines = [f'{"этап":<18}{"время, с":>10}{"доля":>7}{"скорость":>22}']
+        for stage, title, unit in STAGES:
+            stats = self.stages[stage]
+            share = stats.seconds / self.seconds * 100 if self.seconds > 0 else 0.0
+            rate = f'{stats.rate:,.0f} {unit}/с'.replace(',', ' ') if unit and stats.seconds > 0 else '—'
+            lines.append(f'{title:<18}{stats.seconds:>10.3f}{share:>6.0f}%{rate:>22}')
+        rows_rate = f'{self.rows / self.seconds:,.0f}'.replace(',', ' ') if self.seconds > 0 else '—'
+        lines.append(f'{"всего":<18}{self.seconds:>10.3f}{"":>7}{rows_rate + " строк/с":>22}')
+        lines.append(f'пиковый RSS процесса: {self.peak_rss / 1e6:.1f} МБ')
+        return '\n'.join(lines)
+
+
+class _Timed:
+    """Итератор-обёртка: копит время, проведённое внутри next() источника."""
+
+    def __init__(self, source: Iterable):
+        self._source = iter(source)
+        self.seconds = 0.0
+        self.count = 0
+
+    def __iter__(self) -> '_Timed':
+        return self
+
+    def __next__(self):
+        started = time.perf_counter()
+        try:
+            value = next(self._source)
+        finally:
+            self.seconds += time.perf_counter() - started
+        self.count += 1
+        return value
+
+
+@contextmanager
+def _stage(stats: StageStats) -> Iterator[StageStats]:
+    started = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        stats.seconds += time.perf_counter() - started
+
+
+class _ZipSink:
+    def __init__(self, path: str):
+        self._archive = zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED)
+
+    def write(self, name: str, data: bytes) -> None:
+        # .docx уже сжат внутри — повторное сжатие только тратит время
+        stored = zipfile.ZIP_STORED if name.endswith('.docx') else None
+        self._archive.writestr(name, data, compress_type=stored)
+
+    def close(self) -> None:
+        self._archive.close()
+
+
+class _DirectorySink:
+    def __init__(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        self._path = path
+
+    def write(self, name: str, data: bytes) -> None:
+        with open(os.path.join(self._path, name), 'wb') as target:
+            target.write(data)
+
+    def close(self) -> None:
+        pass
+
+
+def default_output(path: str) -> str:
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return f'{stem} - акты.zip'
+
+
+def run_pipeline(path: str, output: Optional[str] = None, brands: Optional[str] = None,
+                 months: Optional[Sequence[str]] = None,
+                 act_dates: Optional[Dict[str, date]] = None,
+                 file_format: str = DEFAULT_FORMAT, strict: bool = False) -> PipelineReport:
+    """Книга -> акты за месяцы months (по умолчанию все листы).
+
+    act_dates — {вид акта: дата} для всех месяцев; без даты — последний день месяца.
+    С strict конфликты артикулов продавца останавливают генерацию до рендера.
+    """
+    if file_format not in ACT_FORMATS:
+        raise PipelineError(f'Формат акта: {", ".join(ACT_FORMATS)}')
+    output = output or default_output(path)
+    act_dates = act_dates or {}
+    started = time.perf_counter()
+    report = PipelineReport(output, [])
+    stages = report.stages
+
+    with _stage(stages['read']):
+        resolver = load_brands(brands) if brands else compile_brands()
+        workbook = open_workbook(path)
+
+    try:
+        with _stage(stages['read']):
+            available = workbook.sheet_names
+            missing = [month for month in months or () if month not in available]
+            if missing:
+                raise PipelineError(f'Нет листов: {", ".join(missing)}. '
+                                    f'В книге: {", ".join(available)}')
+            report.months = list(months) if months else available
+            # Общие строки — часть чтения книги, а не разбора первого листа
+            workbook.load_shared_strings()
+
+        index = SellerArticleIndex()
+        month_items: Dict[str, List[Item]] = {}
+        for month in report.months:
+            rows = _Timed(workbook.iter_rows(month))
+            header = next(rows, None)
+            columns = Columns.from_header(header) if header is not None else None
+            items: List[Item] = []
+            if columns is not None:
+                header_seconds = rows.seconds
+                sold = _Timed(sold_rows(rows, columns))
+                aggregating = time.perf_counter()
+                items = aggregate_rows(sold, columns)
+                aggregating = time.perf_counter() - aggregating
+                # Время вложенных итераторов включает время источника — вычитаем его
+                stages['filter'].seconds += sold.seconds - (rows.seconds - header_seconds)
+                stages['filter'].count += rows.count - 1
+                stages['aggregate'].seconds += aggregating - sold.seconds
+                stages['aggregate'].count += sold.count
+            stages['parse'].seconds += rows.seconds
+            stages['parse'].count += rows.count
+            report.rows += max(rows.count - 1, 0)
+
+            with _stage(stages['brands']) as stats:
+                resolve_brands(items, month, resolver)
+                stats.count += len(items)
+            with _stage(stages['validate']) as stats:
+                index.add(items, month)
+                stats.count += len(items)
+            report.items += len(items)
+            month_items[month] = items
+    finally:
+        workbook.close()
+
+    with _stage(stages['validate']):
+        report.conflicts = index.conflicts()
+    if strict and report.conflicts:
+        report.seconds = time.perf_counter() - started
+        report.peak_rss = peak_rss_bytes()
+        return report
+
+    render = ACT_FORMATS[file_format][1]
+    with _stage(stages['write']):
+        sink = _ZipSink(output) if output.lower().endswith('.zip') else _DirectorySink(output)
+    try:
+        for month, items in month_items.items():
+            for kind in ACT_TITLES:
+                act_date = act_dates.get(kind) or default_act_date(month)
+                with _stage(stages['render']) as stats:
+                    body = render(kind, items, month, act_date)
+                    stats.count += len(items)
+                name = act_file_name(kind, month, act_date, file_format)
+                with _stage(stages['write']) as stats:
+                    sink.write(name, body)
+                    stats.count += 1
+                report.files.append(name)
+                report.bytes_written += len(body)
+    finally:
+        with _stage(stages['write']):
+            sink.close()
+
+    report.seconds = time.perf_counter() - started
+    report.peak_rss = peak_rss_bytes()
+    return report
+
+
+def _iso_date(value: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError('дата в формате ГГГГ-ММ-ДД') from None
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description='Генерация актов Wildberries без интерфейса')
+    parser.add_argument('workbook', help='выгрузка WB (.xlsx)')
+    parser.add_argument('--brands', default=os.environ.get('WB_ACTS_BRANDS'),
+                        help='таблица брендов (.xlsx) или каталог (.json.gz); по умолчанию $WB_ACTS_BRANDS')
+    parser.add_argument('--month', action='append', dest='months',
+                        help='лист (месяц); можно несколько раз, по умолчанию — все')
+    parser.add_argument('--acceptance-date', type=_iso_date,
+                        help='дата акта приема-передачи (ГГГГ-ММ-ДД), по умолчанию — конец месяца')
+    parser.add_argument('--services-date', type=_iso_date,
+                        help='дата акта оказания услуг (ГГГГ-ММ-ДД), по умолчанию — конец месяца')
+    parser.add_argument('--format', choices=sorted(ACT_FORMATS), default=DEFAULT_FORMAT,
+                        help='формат актов')
+    parser.add_argument('-o', '--output', help='ZIP или папка для актов (по умолчанию «<книга> - акты.zip»)')
+    parser.add_argument('--strict', action='store_true',
+                        help='не генерировать акты при конфликтах артикулов продавца')
+    parser.add_argument('--json', metavar='ФАЙЛ', help='отчёт по этапам в JSON («-» — в stdout)')
+    args = parser.parse_args(argv)
+
+    act_dates = {'acceptance': args.acceptance_date, 'services': args.services_date}
+    try:
+        report = run_pipeline(args.workbook, args.output, args.brands, args.months,
+                              {kind: value for kind, value in act_dates.items() if value},
+                              args.format, args.strict)
+    except (PipelineError, XlsxError, BrandsError, OSError) as error:
+        raise SystemExit(f'Ошибка: {error}') from None
+
+    # С --json - в stdout идёт только отчёт, таблица — в stderr
+    log = sys.stderr if args.json == '-' else sys.stdout
+    for conflict in report.conflicts:
+        print(f'Конфликт: артикул продавца {conflict.seller_article} — '
+              f'артикулы WB {", ".join(conflict.skus)} ({", ".join(conflict.months)})', file=sys.stderr)
+    print(f'Книга: листов {len(report.months)}, строк {report.rows}, позиций {report.items}', file=log)
+    print(report.format(), file=log)
+
+    if args.json == '-':
+        print(json.dumps(report.to_dict(), ensure_ascii=False))
+    elif args.json:
+        with open(args.json, 'w', encoding='utf-8') as target:
+            json.dump(report.to_dict(), target, ensure_ascii=False, indent=2)
+
+    if args.strict and report.conflicts:
+        raise SystemExit(f'Акты не созданы: конфликтов артикулов продавца — {len(report.conflicts)}')
+    print(f'Актов: {len(report.files)}, {report.bytes_written / 1e6:.1f} МБ -> {report.output}', file=log)
+
+
+if __name__ == '__main__':
+    main()
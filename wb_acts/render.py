@@ -0,0 +1,483 @@
+"""HTML-шаблоны актов — те же, что в js/act-templates.js.
+
+Макет акта компилируется один раз: каркас делится на статические куски и
+подстановки, стили ячеек — классы в <style>. Акт собирается кусками (iter_act).
+Результат сохраняется как .doc с BOM, Word открывает его как документ.
+Текст и таблицы актов — данные (Block, Party, Column): из них же wb_acts/docx.py
+собирает .docx.
+"""
+from __future__ import annotations
+
+import calendar
+import re
+from dataclasses import dataclass
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal
+from html import escape
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Union
+
+from .aggregate import Item
+
+BOM = '\ufeff'
+
+# Примерный размер куска акта в символах
+CHUNK_SIZE = 64 * 1024
+
+# Стоимость услуг: 60 рублей за единицу товара
+SERVICE_COST_PER_ITEM = 60
+
+_MONTHS = (
+    ('янв', 1), ('фев', 2), ('мар', 3), ('апр', 4), ('май', 5), ('июн', 6),
+    ('июл', 7), ('авг', 8), ('сен', 9), ('окт', 10), ('ноя', 11), ('дек', 12),
+)
+
+
+@dataclass(frozen=True)
+class Party:
+    """Реквизиты стороны: строка из нескольких частей — один абзац с переносами."""
+    title: str
+    lines: Sequence[Union[str, Sequence[str]]]
+
+
+EXECUTOR = Party('Исполнитель', (
+    'Индивидуальный предприниматель Мирошниченко Михаил Михайлович',
+    'ИНН: 771994433911',
+    'Банк: МОСКОВСКИЙ ФИЛИАЛ АО КБ "МОДУЛЬБАНК"',
+    'БИК: 044525092',
+    'к/с: 30101810645250000092',
+    'Счет: 40802810670010452146',
+))
+
+_CUSTOMER_BANK = (
+    'Банк: МОСКОВСКИЙ ФИЛИАЛ АО КБ "МОДУЛЬБАНК"',
+    'БИК: 044525092',
+    'к/с: 30101810645250000092',
+    'Счет: 40802810470010467690',
+)
+
+REQUISITES = {
+    # Реквизиты для акта приема-передачи
+    'acceptance': (EXECUTOR, Party('Заказчик', (
+        'ИП Гаряев Руслан Асланович',
+        'ИНН: 910303241077',
+        'ОГРНИП: 320911200033071',
+        *_CUSTOMER_BANK,
+        ('Адрес: 427112, Удмуртская Республика,', 'р-н. Якшур-Бодьинский,',
+         'с. Старые Зятцы, ул. Советская, д. 43'),
+    ))),
+    # Новые реквизиты по образцу (без ОГРНИП и адреса у заказчика)
+    'services': (EXECUTOR, Party('Заказчик', (
+        ('Индивидуальный предприниматель', 'Гаряев Руслан Асланович'),
+        'ИНН: 910303241077',
+        *_CUSTOMER_BANK,
+    ))),
+}
+
+
+def line_parts(line: Union[str, Sequence[str]]) -> Sequence[str]:
+    return (line,) if isinstance(line, str) else line
+
+
+_BR_INDENT = '<br>\n        '
+
+
+def _requisites_html(parties: Sequence[Party]) -> str:
+    def cell(party: Party) -> str:
+        lines = '\n'.join(f'        <p style="margin: 5px 0;">{_BR_INDENT.join(line_parts(line))}</p>'
+                          for line in party.lines)
+        return f'''      <td style="border: none; width: 50%; vertical-align: top; padding: 10px; font-size: 10pt;">
+        <p style="font-weight: bold; margin: 5px 0;">{party.title}</p>
+        <br>
+{lines}
+        <br><br>
+        <p style="margin: 5px 0;">_________________________</p>
+      </td>'''
+    cells = '\n'.join(cell(party) for party in parties)
+    return f'''
+  <table style="border: none; width: 100%; border-collapse: collapse; table-layout: fixed; margin-top: 30px;">
+    <tr>
+{cells}
+    </tr>
+  </table>'''
+
+
+def format_date(value: date) -> str:
+    return value.strftime('%d.%m.%Y')
+
+
+def month_period(month_name: str) -> Optional[tuple]:
+    """(первый день, последний день) месяца из названия листа — как getPeriodDates."""
+    lower = month_name.lower()
+    year = 2024
+
+    # Ищем год в названии
+    match = re.search(r'(\d{2,4})', month_name)
+    if match:
+        digits = match.group(1)
+        year = 2000 + int(digits) if len(digits) == 2 else int(digits)
+
+    for key, number in _MONTHS:
+        if key in lower:
+            last_day = calendar.monthrange(year, number)[1]
+            return date(year, number, 1), date(year, number, last_day)
+    return None
+
+
+def period_dates(month_name: str) -> dict:
+    period = month_period(month_name)
+    if period is None:
+        return {'start': '__________', 'end': '__________'}
+    start, end = period
+    # Последний день без ведущего нуля — как в getPeriodDates
+    return {
+        'start': format_date(start),
+        'end': f'{end.day}.{end.month:02d}.{end.year}',
+    }
+
+
+def default_act_date(month_name: str) -> date:
+    period = month_period(month_name)
+    return period[1] if period else date.today()
+
+
+def _text(value: str) -> str:
+    return escape(value, quote=False)
+
+
+_CENTS = Decimal('0.01')
+
+
+def _money(value: float) -> str:
+    # Как Number.toFixed(2): точное двоичное значение, половина — вверх (10.125 -> 10.13)
+    return str(Decimal(value).quantize(_CENTS, ROUND_HALF_UP))
+
+
+_PLACEHOLDER = re.compile(r'\{\{(\w+)\}\}')
+
+Template = Callable[[Mapping[str, object]], Iterator[str]]
+
+
+def compile_template(source: str) -> Template:
+    """Шаблон с подстановками {{имя}} -> генератор кусков для данных."""
+    # Чётные элементы — статический текст, нечётные — имена подстановок
+    parts = _PLACEHOLDER.split(source)
+
+    def render(data: Mapping[str, object]) -> Iterator[str]:
+        for index, part in enumerate(parts):
+            if index % 2:
+                yield str(data[part])
+            elif part:
+                yield part
+    return render
+
+
+# Общий каркас обоих актов; {{rows}} — место строк таблицы.
+# Ячейки таблицы: 7pt, перенос слов; .c — по центру, .r — по правому краю.
+ACT_SHELL = '''<!DOCTYPE html>
+<html xmlns:o="urn:schemas-microsoft-com:office:office" xmlns:w="urn:schemas-microsoft-com:office:word">
+<head>
+  <meta charset="UTF-8">
+  <title>{{title}}</title>
+  <!--[if gte mso 9]>
+  <xml>
+    <w:WordDocument>
+      <w:View>Print</w:View>
+      <w:Zoom>100</w:Zoom>
+    </w:WordDocument>
+  </xml>
+  <![endif]-->
+  <style>
+    @page { size: A4; margin: 2cm 1.5cm 2cm 2cm; }
+    body { font-family: {{font}}; font-size: 11pt; line-height: 1.3; margin: 0; padding: 0; }
+    .right-text { text-align: right; }
+    .center-text { text-align: center; }
+    .bold { font-weight: bold; }
+    p { margin: 4px 0;{{paragraph}} }
+    td, th { word-wrap: break-word; word-break: break-word; overflow-wrap: break-word; white-space: normal; vertical-align: top; }
+    td { font-size: 7pt; }
+    th { background-color: #f0f0f0; font-size: 7pt; text-align: center; }
+    .c { text-align: center; }
+    .r { text-align: right; }
+  </style>
+</head>
+<body>
+{{heading}}
+  <table width="{{tableWidth}}" border="1" cellpadding="1" cellspacing="0" align="center" style="border-collapse: collapse; table-layout: fixed; margin: 10px auto;">
+{{tableHead}}
+{{rows}}    <tr>
+      <td colspan="{{totalColspan}}" class="r"><strong>Итого</strong></td>
+      <td class="r"><strong>{{total}}</strong></td>
+    </tr>
+  </table>
+{{footer}}
+  <br><br>
+  {{requisites}}
+</body>
+</html>'''
+
+_INTRO = ('Индивидуальный предприниматель Гаряев Руслан Асланович, ИНН 910303241077 '
+          'именуемый в дальнейшем Заказчик с одной стороны и ')
+_CONTRACT = 'договора по оказанию транспортных услуг и услуг Фулфилмента №11/3/24 от 11.03.2024 г.'
+
+
+@dataclass(frozen=True)
+class Block:
+    """Абзац текста акта: из блоков собираются и HTML (.doc), и DOCX.
+    p — абзац, h2 — заголовок по центру, br — пустая строка."""
+    tag: str
+    text: str = ''
+    bold: bool = False
+    # '' — по ширине макета, 'right' — по правому краю
+    align: str = ''
+
+
+BR = Block('br')
+
+
+def _p(text: str, **options) -> Block:
+    return Block('p', text, **options)
+
+
+def _blocks_html(blocks: Sequence[Block]) -> str:
+    def html(block: Block) -> str:
+        if block.tag == 'br':
+            return '  <br>'
+        if block.tag == 'h2':
+            return f'  <h2 class="center-text">{block.text}</h2>'
+        text = f'<strong>{block.text}</strong>' if block.bold else block.text
+        css = f' class="{block.align}-text"' if block.align else ''
+        return f'  <p{css}>{text}</p>'
+    return '\n'.join(html(block) for block in blocks)
+
+
+@dataclass(frozen=True)
+class Column:
+    title: str
+    # Ширина в процентах ширины таблицы
+    width: int
+    value: Callable[[Item, int], object]
+    # '' — по левому краю, 'c' — по центру, 'r' — по правому краю
+    align: str = ''
+
+
+@dataclass(frozen=True)
+class ActLayout:
+    """Макет акта. Первая и последняя колонки — на две строки шапки,
+    остальные — под общим заголовком «Товар»."""
+    title: str
+    font: str
+    # Абзацы по ширине
+    justify: bool
+    # Ширина таблицы в процентах ширины текста
+    table_width: int
+    heading: Sequence[Block]
+    footer: Sequence[Block]
+    requisites: Sequence[Party]
+    columns: Sequence[Column]
+    total: Callable[[List[Item]], object]
+
+
+ACT_LAYOUTS = {
+    'acceptance': ActLayout(
+        title='Акт приема-передачи',
+        font='Arial, sans-serif',
+        justify=False,
+        table_width=100,
+        heading=(
+            _p('{{date}}', bold=True),
+            _p('Приложение № 1', align='right'),
+            _p('к договору по оказанию транспортных услуг', align='right'),
+            _p('и услуг Фулфилмента №11/3/24 от 11.03.2024', align='right'),
+            BR,
+            Block('h2', 'АКТ ПРИЕМА-ПЕРЕДАЧИ'),
+            BR,
+            _p(f'{_INTRO}Индивидуальный предприниматель Зверева Юлиана Владимировна, ИНН 623406499402, '
+               'именуемая в дальнейшем Исполнитель, а совместно именуемые Стороны, заключили настоящий '
+               'акт, о нижеследующем:'),
+            BR,
+            _p(f'1. В рамках исполнения {_CONTRACT} Заказчик передал, а Исполнитель принял следующий товар:'),
+            BR,
+        ),
+        footer=(
+            BR,
+            _p('2. Особые отметки: внешних повреждений тары (упаковки) товара не выявлено.'),
+            BR,
+            _p('3. Настоящий акт составлен в двух экземплярах, имеющих одинаковую юридическую силу, '
+               'по одному для каждой из Сторон.'),
+            BR,
+            _p(f'4. Настоящий акт является неотъемлемой частью {_CONTRACT}'),
+        ),
+        requisites=REQUISITES['acceptance'],
+        columns=(
+            Column('№', 3, lambda item, index: index + 1, 'c'),
+            Column('Наименование', 37, lambda item, index: _text(item.name)),
+            Column('Кол', 6, lambda item, index: item.quantity, 'c'),
+            Column('Бренд', 15, lambda item, index: _text(item.brand)),
+            Column('Артикул', 15, lambda item, index: _text(item.seller_article)),
+            Column('Цвет', 14, lambda item, index: _text(item.color)),
+            Column('Сумма', 10, lambda item, index: _money(item.total_price), 'r'),
+        ),
+        total=lambda items: _money(sum(item.total_price for item in items)),
+    ),
+    'services': ActLayout(
+        title='Акт оказания услуг',
+        font='Verdana, Arial, sans-serif',
+        justify=True,
+        table_width=104,
+        heading=(
+            Block('h2', 'АКТ ОКАЗАНИЯ УСЛУГ ОТ {{date}} г.'),
+            BR,
+            _p(f'{_INTRO}Индивидуальный предприниматель Мирошниченко Михаил Михайлович, ИНН 771994433911, '
+               'именуемый в дальнейшем Исполнитель с другой стороны, а совместно именуемые Стороны, '
+               'заключили настоящий акт, о нижеследующем:'),
+            BR,
+            _p(f'1. В рамках исполнения {_CONTRACT} Исполнитель за период с {{{{periodStart}}}} по '
+               '{{periodEnd}}, согласно сборочным заданиям, поставил на маркетплейс Wildberries '
+               'следующие товары:'),
+            BR,
+        ),
+        footer=(
+            BR,
+            _p('2. Настоящий акт составлен в двух экземплярах, имеющих одинаковую юридическую силу, '
+               'по одному для каждой из Сторон.'),
+            BR,
+            _p(f'3. Настоящий акт является неотъемлемой частью {_CONTRACT}'),
+        ),
+        requisites=REQUISITES['services'],
+        columns=(
+            Column('№', 3, lambda item, index: index + 1, 'c'),
+            Column('Наименование', 29, lambda item, index: _text(item.name)),
+            Column('Кол-во', 5, lambda item, index: item.quantity, 'c'),
+            Column('Бренд', 13, lambda item, index: _text(item.brand)),
+            Column('Артикул', 14, lambda item, index: _text(item.seller_article)),
+            Column('Цвет', 14, lambda item, index: _text(item.color)),
+            Column('SKU', 14, lambda item, index: _text(item.sku)),
+            Column('Стоимость услуг', 8,
+                   lambda item, index: item.quantity * SERVICE_COST_PER_ITEM, 'r'),
+        ),
+        total=lambda items: sum(item.quantity for item in items) * SERVICE_COST_PER_ITEM,
+    ),
+}
+
+
+def act_layout(kind: str) -> ActLayout:
+    if kind not in ACT_LAYOUTS:
+        raise ValueError(f'Неизвестный тип акта: {kind}')
+    return ACT_LAYOUTS[kind]
+
+
+def act_data(kind: str, items: List[Item], month_name: str, act_date: date) -> dict:
+    """Подстановки акта: дата, период (для услуг) и итог."""
+    period = period_dates(month_name) if kind == 'services' else {'start': '', 'end': ''}
+    return {
+        'date': format_date(act_date),
+        'periodStart': period['start'],
+        'periodEnd': period['end'],
+        'total': act_layout(kind).total(items),
+    }
+
+
+@dataclass
+class _CompiledLayout:
+    head: Template
+    tail: Template
+    # Открывающие теги ячеек готовы заранее: в строке остаются только значения
+    cells: List[str]
+    values: List[Callable[[Item, int], object]]
+
+
+def _compile_layout(layout: ActLayout) -> _CompiledLayout:
+    columns = layout.columns
+    inner = columns[1:-1]
+
+    def th(column: Column, attributes: str = '') -> str:
+        return f'<th width="{column.width}%"{attributes}>{column.title}</th>'
+
+    rowspan = ' rowspan="2"'
+    head_rows = '\n'.join([
+        '    <tr>',
+        f'      {th(columns[0], rowspan)}',
+        f'      <th colspan="{len(inner)}">Товар</th>',
+        f'      {th(columns[-1], rowspan)}',
+        '    </tr>',
+        '    <tr>',
+        *(f'      {th(column)}' for column in inner),
+        '    </tr>',
+    ])
+    shell = {
+        'title': layout.title,
+        'font': layout.font,
+        'paragraph': ' text-align: justify;' if layout.justify else '',
+        'tableWidth': f'{layout.table_width}%',
+        'tableHead': head_rows,
+        'totalColspan': len(columns) - 1,
+        'requisites': _requisites_html(layout.requisites),
+    }
+
+    # Статические подстановки каркаса вписываем сразу — остаются только данные акта
+    def bake(source: str) -> str:
+        return _PLACEHOLDER.sub(lambda match: str(shell.get(match.group(1), match.group(0))), source)
+
+    head, tail = ACT_SHELL.split('{{rows}}')
+    return _CompiledLayout(
+        head=compile_template(bake(head).replace('{{heading}}', _blocks_html(layout.heading))),
+        tail=compile_template(bake(tail).replace('{{footer}}', _blocks_html(layout.footer))),
+        cells=[f'<td class="{column.align}">' if column.align else '<td>' for column in columns],
+        values=[column.value for column in columns],
+    )
+
+
+_compiled: Dict[str, _CompiledLayout] = {}
+
+
+def _layout(kind: str) -> _CompiledLayout:
+    if kind not in _compiled:
+        _compiled[kind] = _compile_layout(act_layout(kind))
+    return _compiled[kind]
+
+
+def iter_act(kind: str, items: List[Item], month_name: str, act_date: date) -> Iterator[str]:
+    """Акт кусками примерно по CHUNK_SIZE символов — как renderActChunks."""
+    layout = _layout(kind)
+    data = act_data(kind, items, month_name, act_date)
+
+    parts = list(layout.head(data))
+    size = 0
+    cells = list(zip(layout.cells, layout.values))
+    for index, item in enumerate(items):
+        row = ''.join([cell + str(value(item, index)) + '</td>' for cell, value in cells])
+        parts.append(f'<tr>{row}</tr>\n')
+        size += len(row)
+        if size >= CHUNK_SIZE:
+            yield ''.join(parts)
+            parts = []
+            size = 0
+    parts.extend(layout.tail(data))
+    yield ''.join(parts)
+
+
+def render_acceptance_act(items: List[Item], act_date: date) -> str:
+    return ''.join(iter_act('acceptance', items, '', act_date))
+
+
+def render_services_act(items: List[Item], act_date: date, month_name: str) -> str:
+    return ''.join(iter_act('services', items, month_name, act_date))
+
+
+ACT_TITLES = {
+    'acceptance': 'Акт ПП',
+    'services': 'Акт ОУ',
+}
+
+
+def act_file_name(kind: str, month_name: str, act_date: date, extension: str = 'doc') -> str:
+    # Формируем название: "Акт ПП (месяц год) ИП Гаряев"
+    return f'{ACT_TITLES[kind]} ({month_name} {act_date.year}) ИП Гаряев.{extension}'
+
+
+def render_act(kind: str, items: List[Item], month_name: str,
+               act_date: Optional[date] = None) -> bytes:
+    """Готовый .doc: HTML в UTF-8 с BOM, как openInGoogleDocs."""
+    if act_date is None:
+        act_date = default_act_date(month_name)
+    return (BOM + ''.join(iter_act(kind, items, month_name, act_date))).encode('utf-8')
@@ -0,0 +1,309 @@
+"""WSGI-приложение с маршрутами, которые вызывает templates/index.html.
+
+    POST /upload                    — загрузка XLSX, ответ {"months": [...], "conflicts": [...]},
+                                      при повторной загрузке — и "diff" с предыдущей
+    GET  /generate/<вид>/<месяц>    — скачать акт (acceptance | services)
+    GET  /generate/all              — оба акта за все месяцы одним ZIP
+
+У обоих /generate — ?format=doc (по умолчанию, HTML для Word) или ?format=docx;
+у /generate/all — ещё ?month=<месяц> (можно несколько): архив только за эти месяцы.
+
+Локальный запуск:  python3 -m wb_acts.server --port 5000
+На Vercel приложение подключается через api/index.py.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from datetime import date
+from http.cookies import SimpleCookie
+from typing import Callable, Dict, Iterable, List, Optional
+from urllib.parse import parse_qs, quote, unquote
+
+from .aggregate import Item
+from .batch import ZIP_NAME, default_workers, iter_month_files, scan_sheets, stream_zip
+from .brands import BrandResolver, compile_brands, load_brands
+from .cache import ItemsCache, items_key
+from .diff import UploadDiff, diff_uploads
+from .docx import ACT_FORMATS, DEFAULT_FORMAT
+from .render import ACT_TITLES, act_file_name, default_act_date
+from .uploads import UploadError, spool_multipart
+from .validate import find_conflicts
+from .xlsx import Workbook, XlsxError, open_workbook
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATE = os.path.join(ROOT, 'templates', 'index.html')
+
+COOKIE_NAME = 'wb_upload'
+
+StartResponse = Callable[..., object]
+
+
+def _shared_used_key(workbook: Workbook, sheet_name: str) -> str:
+    # Сколько общих строк затрагивает XML листа — зависит только от самого XML
+    return f'{workbook.sheet_xml_fingerprint(sheet_name)}/shared-used'
+
+
+def _strings_sheet_key(cache: ItemsCache, workbook: Workbook, sheet_name: str) -> Optional[str]:
+    """Ключ содержимого листа, когда отпечаток из каталога ZIP не совпал.
+
+    Правка другого листа, добавившая новую строку, меняет sharedStrings.xml,
+    а с ним и отпечаток каждого листа. XML нетронутого листа при этом прежний,
+    и если прежние и те общие строки, на которые он ссылается, лист узнаётся
+    без разбора (Workbook.strings_fingerprint).
+    """
+    used = cache.get_fingerprint(_shared_used_key(workbook, sheet_name))
+    if used is None:
+        return None
+    fingerprint = workbook.strings_fingerprint(sheet_name, int(used))
+    return cache.get_fingerprint(fingerprint) if fingerprint else None
+
+
+def aggregate_workbook(path: str, resolver: Optional[BrandResolver] = None,
+                       cache: Optional[ItemsCache] = None,
+                       workbook_hash: str = '', workers: int = 1) -> Dict[str, List[Item]]:
+    """Лист за листом: строки идут из потокового парсера прямо в агрегацию.
+
+    С кэшем разбираются только листы, которых в нём нет; если есть все —
+    книга даже не открывается. Лист исправленной выгрузки, который уже
+    встречался, узнаётся по отпечатку из каталога ZIP (diff.py), а если правка
+    дописала новые общие строки — по XML листа и тем общим строкам, на которые
+    он ссылается. Так правка одного месяца стоит разбора одного листа.
+    При workers > 1 листы разбираются параллельно.
+    """
+    resolver = resolver or compile_brands()
+    brands_hash = resolver.fingerprint()
+    if cache is not None:
+        cached = cache.lookup(workbook_hash, brands_hash)
+        if cached is not None:
+            return cached
+
+    with open_workbook(path) as workbook:
+        raw = {month: workbook.sheet_fingerprint(month) for month in workbook.sheet_names}
+
+        months: Dict[str, Optional[List[Item]]] = {}
+        sheet_keys: Dict[str, Optional[str]] = {}
+        for month, fingerprint in raw.items():
+            key = None
+            if cache is not None:
+                key = cache.get_fingerprint(fingerprint) or _strings_sheet_key(cache, workbook, month)
+            sheet_keys[month] = key
+            months[month] = cache.get_items(items_key(key, brands_hash, month)) if key else None
+
+        missing = [month for month, items in months.items() if items is None]
+        for month, key, used, items in scan_sheets(path, missing, resolver, workers):
+            months[month] = items
+            sheet_keys[month] = key
+            if cache is not None:
+                cache.put_fingerprint(raw[month], key)
+                cache.put_fingerprint(_shared_used_key(workbook, month), str(used))
+                cache.put_fingerprint(workbook.strings_fingerprint(month, used), key)
+                cache.put_items(items_key(key, brands_hash, month), items)
+
+    if cache is not None:
+        cache.put_sheet_keys(workbook_hash, sheet_keys)
+    return months
+
+
+def _request_path(environ: dict) -> str:
+    # PATH_INFO по стандарту WSGI — latin-1; месяц в URL — кириллица в UTF-8
+    path = environ.get('PATH_INFO', '').encode('latin-1').decode('utf-8', 'replace')
+    return unquote(path) if '%' in path else path
+
+
+def _json(start_response: StartResponse, data: dict, status: str = '200 OK',
+          headers: Optional[list] = None) -> Iterable[bytes]:
+    body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+    start_response(status, [
+        ('Content-Type', 'application/json; charset=utf-8'),
+        ('Content-Length', str(len(body))),
+    ] + (headers or []))
+    return [body]
+
+
+def _text(start_response: StartResponse, status: str, message: str) -> Iterable[bytes]:
+    body = message.encode('utf-8')
+    start_response(status, [
+        ('Content-Type', 'text/plain; charset=utf-8'),
+        ('Content-Length', str(len(body))),
+    ])
+    return [body]
+
+
+def _upload_id(environ: dict) -> str:
+    query = parse_qs(environ.get('QUERY_STRING', ''))
+    if query.get('upload'):
+        return query['upload'][0]
+    cookie = SimpleCookie(environ.get('HTTP_COOKIE', ''))
+    return cookie[COOKIE_NAME].value if COOKIE_NAME in cookie else ''
+
+
+def _file_format(query: Dict[str, List[str]]) -> Optional[str]:
+    """?format=doc|docx; None — неизвестный формат."""
+    file_format = query.get('format', [DEFAULT_FORMAT])[0]
+    return file_format if file_format in ACT_FORMATS else None
+
+
+def default_brands() -> BrandResolver:
+    """Каталог из $WB_ACTS_BRANDS (.xlsx или .json.gz) или только встроенный список."""
+    path = os.environ.get('WB_ACTS_BRANDS')
+    return load_brands(path) if path else compile_brands()
+
+
+class ActsApp:
+    def __init__(self, cache: Optional[ItemsCache] = None, workers: Optional[int] = None,
+                 brands: Optional[BrandResolver] = None):
+        self.cache = cache or ItemsCache()
+        self.workers = workers or default_workers()
+        self.brands = brands or default_brands()
+
+    def __call__(self, environ: dict, start_response: StartResponse) -> Iterable[bytes]:
+        method = environ.get('REQUEST_METHOD', 'GET')
+        path = _request_path(environ)
+        # На Vercel запросы переписываются на /api/index, исходный путь сохраняется
+        if path.startswith('/api/index'):
+            path = path[len('/api/index'):] or '/'
+
+        if path == '/upload' and method == 'POST':
+            return self.upload(environ, start_response)
+        if path == '/generate/all' and method == 'GET':
+            return self.generate_all(environ, start_response)
+        if path.startswith('/generate/') and method == 'GET':
+            kind, _, month = path[len('/generate/'):].partition('/')
+            return self.generate(environ, start_response, kind, month)
+        if path == '/' and method == 'GET':
+            return self.index(start_response)
+        return _text(start_response, '404 Not Found', 'Не найдено')
+
+    def index(self, start_response: StartResponse) -> Iterable[bytes]:
+        with open(TEMPLATE, 'rb') as source:
+            body = source.read()
+        start_response('200 OK', [
+            ('Content-Type', 'text/html; charset=utf-8'),
+            ('Content-Length', str(len(body))),
+        ])
+        return [body]
+
+    def upload(self, environ: dict, start_response: StartResponse) -> Iterable[bytes]:
+        try:
+            files = spool_multipart(environ)
+        except UploadError as error:
+            return _json(start_response, {'error': str(error)}, '400 Bad Request')
+
+        previous = _upload_id(environ)
+        try:
+            upload = files.get('file')
+            if upload is None or not upload.size:
+                return _json(start_response, {'error': 'Файл не выбран'}, '400 Bad Request')
+            try:
+                months = aggregate_workbook(upload.path, self.brands, cache=self.cache,
+                                            workbook_hash=upload.sha256,
+                                            workers=self.workers)
+            except XlsxError as error:
+                return _json(start_response, {'error': str(error)}, '400 Bad Request')
+        finally:
+            for spooled in files.values():
+                spooled.remove()
+
+        cookie = f'{COOKIE_NAME}={upload.sha256}; Path=/; HttpOnly; SameSite=Lax'
+        conflicts = [conflict.to_dict() for conflict in find_conflicts(months)]
+        response = {'months': list(months), 'conflicts': conflicts, 'upload_id': upload.sha256}
+        diff = self.upload_diff(previous, upload.sha256)
+        if diff is not None:
+            response['diff'] = diff.to_dict()
+        return _json(start_response, response, headers=[('Set-Cookie', cookie)])
+
+    def upload_diff(self, previous: str, current: str) -> Optional[UploadDiff]:
+        """Разница с предыдущей загрузкой (cookie); None — сравнивать не с чем."""
+        if not previous or previous == current:
+            return None
+        before = self.cache.get_sheet_keys(previous)
+        after = self.cache.get_sheet_keys(current)
+        if before is None or after is None:
+            return None
+        brands_hash = self.brands.fingerprint()
+
+        def items_of(sheet_key: str, month: str) -> List[Item]:
+            return self.cache.get_items(items_key(sheet_key, brands_hash, month)) or []
+
+        return diff_uploads(before, after, items_of)
+
+    def generate(self, environ: dict, start_response: StartResponse,
+                 kind: str, month: str) -> Iterable[bytes]:
+        if kind not in ACT_TITLES:
+            return _text(start_response, '404 Not Found', f'Неизвестный тип акта: {kind}')
+        items = self.cache.month_items(_upload_id(environ), self.brands.fingerprint(), month)
+        if items is None:
+            return _text(start_response, '404 Not Found',
+                         'Месяц не найден. Загрузите файл заново.')
+
+        query = parse_qs(environ.get('QUERY_STRING', ''))
+        file_format = _file_format(query)
+        if file_format is None:
+            return _text(start_response, '400 Bad Request', 'Формат акта: doc или docx')
+        try:
+            act_date = date.fromisoformat(query['date'][0]) if query.get('date') else None
+        except ValueError:
+            return _text(start_response, '400 Bad Request', 'Дата должна быть в формате ГГГГ-ММ-ДД')
+        if act_date is None:
+            act_date = default_act_date(month)
+
+        content_type, render = ACT_FORMATS[file_format]
+        body = render(kind, items, month, act_date)
+        file_name = act_file_name(kind, month, act_date, file_format)
+        start_response('200 OK', [
+            ('Content-Type', content_type),
+            ('Content-Length', str(len(body))),
+            ('Content-Disposition', f"attachment; filename*=UTF-8''{quote(file_name)}"),
+        ])
+        return [body]
+
+    def generate_all(self, environ: dict, start_response: StartResponse) -> Iterable[bytes]:
+        months = self.cache.lookup(_upload_id(environ), self.brands.fingerprint())
+        if months is None:
+            return _text(start_response, '404 Not Found',
+                         'Книга не найдена. Загрузите файл заново.')
+        query = parse_qs(environ.get('QUERY_STRING', ''))
+        file_format = _file_format(query)
+        if file_format is None:
+            return _text(start_response, '400 Bad Request', 'Формат акта: doc или docx')
+        # ?month=...&month=... — только эти месяцы, например изменённые при повторной загрузке
+        if query.get('month'):
+            months = {month: items for month, items in months.items() if month in query['month']}
+
+        # Длина заранее неизвестна: архив отдаётся по мере готовности месяцев
+        start_response('200 OK', [
+            ('Content-Type', 'application/zip'),
+            ('Content-Disposition', f"attachment; filename*=UTF-8''{quote(ZIP_NAME)}"),
+        ])
+        return stream_zip(iter_month_files(months, self.workers, file_format))
+
+
+app = ActsApp()
+
+
+def main(argv: Optional[list] = None) -> None:
+    from wsgiref.simple_server import make_server
+
+    parser = argparse.ArgumentParser(description='Генератор актов Wildberries (WSGI)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=None,
+                        help='процессов для разбора листов и актов (по умолчанию — число ядер)')
+    parser.add_argument('--brands', default=None,
+                        help='таблица брендов (.xlsx) или каталог (.json.gz)')
+    args = parser.parse_args(argv)
+
+    if args.workers or args.brands:
+        application = ActsApp(workers=args.workers,
+                              brands=load_brands(args.brands) if args.brands else None)
+    else:
+        application = app
+    with make_server(args.host, args.port, application) as server:
+        print(f'Сервер запущен: http://{args.host}:{args.port}/')
+        server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
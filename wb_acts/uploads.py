@@ -0,0 +1,166 @@
+"""Приём загрузок: потоковый разбор multipart.
+
+Файл из формы пишется на диск кусками, попутно считается SHA-256 —
+он же служит идентификатором загрузки и ключом кэша. Книга целиком
+в память не читается.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from typing import IO, Dict, Optional
+
+CHUNK_SIZE = 64 * 1024
+
+
+class UploadError(ValueError):
+    """Некорректный запрос на загрузку."""
+
+
+@dataclass
+class SpooledFile:
+    filename: str
+    path: str
+    sha256: str
+    size: int
+
+    def remove(self) -> None:
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def _boundary(content_type: str) -> bytes:
+    match = re.search(r'boundary="?([^";]+)"?', content_type or '')
+    if not match or not content_type.startswith('multipart/form-data'):
+        raise UploadError('Ожидается multipart/form-data')
+    return match.group(1).encode('latin-1')
+
+
+def _disposition(headers: bytes) -> Dict[str, str]:
+    text = headers.decode('utf-8', 'replace')
+    params = {}
+    for line in text.split('\r\n'):
+        name, _, value = line.partition(':')
+        if name.strip().lower() != 'content-disposition':
+            continue
+        for key, quoted, plain in re.findall(r';\s*([\w*]+)=(?:"([^"]*)"|([^;]*))', value):
+            params[key.lower()] = quoted or plain.strip()
+    return params
+
+
+class _Reader:
+    """length=None — тело без Content-Length (chunked), читается до конца потока."""
+
+    def __init__(self, stream: IO[bytes], length: Optional[int]):
+        self.stream = stream
+        self.left = length
+        self.buffer = b''
+
+    def fill(self) -> bool:
+        if self.left is None:
+            chunk = self.stream.read(CHUNK_SIZE)
+            if not chunk:
+                self.left = 0
+                return False
+            self.buffer += chunk
+            return True
+        if self.left <= 0:
+            return False
+        chunk = self.stream.read(min(CHUNK_SIZE, self.left))
+        if not chunk:
+            self.left = 0
+            return False
+        self.left -= len(chunk)
+        self.buffer += chunk
+        return True
+
+    def read_until(self, marker: bytes) -> bytes:
+        while True:
+            index = self.buffer.find(marker)
+            if index >= 0:
+                data, self.buffer = self.buffer[:index], self.buffer[index + len(marker):]
+                return data
+            if not self.fill():
+                raise UploadError('Запрос оборван')
+
+    def copy_until(self, marker: bytes, target: IO[bytes], digest) -> int:
+        size = 0
+        keep = len(marker) - 1
+        while True:
+            index = self.buffer.find(marker)
+            if index >= 0:
+                data, self.buffer = self.buffer[:index], self.buffer[index + len(marker):]
+                target.write(data)
+                digest.update(data)
+                return size + len(data)
+            # Хвост буфера может оказаться началом разделителя — его оставляем
+            if len(self.buffer) > keep:
+                data, self.buffer = self.buffer[:-keep], self.buffer[-keep:]
+                target.write(data)
+                digest.update(data)
+                size += len(data)
+            if not self.fill():
+                raise UploadError('Запрос оборван')
+
+
+class _Discard:
+    def write(self, data: bytes) -> None:
+        pass
+
+
+class _NoDigest:
+    def update(self, data: bytes) -> None:
+        pass
+
+
+def spool_multipart(environ: dict, directory: Optional[str] = None) -> Dict[str, SpooledFile]:
+    """Сохраняет файловые поля формы во временные файлы. Текстовые поля пропускаются."""
+    boundary = _boundary(environ.get('CONTENT_TYPE', ''))
+    length: Optional[int]
+    if environ.get('CONTENT_LENGTH'):
+        try:
+            length = int(environ['CONTENT_LENGTH'])
+        except ValueError:
+            raise UploadError('Некорректный Content-Length') from None
+    elif environ.get('wsgi.input_terminated'):
+        # Chunked-тело: сервер сам отдаёт конец потока (PEP 3333, wsgi.input_terminated)
+        length = None
+    else:
+        raise UploadError('Не указан Content-Length')
+    reader = _Reader(environ['wsgi.input'], length)
+
+    delimiter = b'--' + boundary
+    reader.read_until(delimiter)
+    files: Dict[str, SpooledFile] = {}
+    try:
+        while True:
+            while len(reader.buffer) < 2 and reader.fill():
+                pass
+            if reader.buffer.startswith(b'--'):
+                break
+            reader.read_until(b'\r\n')
+            params = _disposition(reader.read_until(b'\r\n\r\n'))
+            name = params.get('name', '')
+            marker = b'\r\n' + delimiter
+
+            if 'filename' not in params or name in files:
+                reader.copy_until(marker, _Discard(), _NoDigest())
+                continue
+
+            fd, path = tempfile.mkstemp(prefix='wb-upload-', suffix='.xlsx', dir=directory)
+            digest = hashlib.sha256()
+            with os.fdopen(fd, 'wb') as target:
+                spooled = SpooledFile(params['filename'], path, '', 0)
+                files[name] = spooled
+                spooled.size = reader.copy_until(marker, target, digest)
+            spooled.sha256 = digest.hexdigest()
+    except BaseException:
+        for spooled in files.values():
+            spooled.remove()
+        raise
+    return files
@@ -0,0 +1,65 @@
+"""Проверка артикулов продавца — Python-версия SellerArticleIndex из js/acts.js.
+
+Один артикул продавца должен соответствовать одному артикулу WB. Индекс
+строится за один проход по позициям и пополняется листами книги, поэтому
+конфликт между любыми месяцами находится один раз, без попарного сравнения.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Set
+
+from .aggregate import Item
+
+
+@dataclass
+class Conflict:
+    seller_article: str
+    skus: List[str]
+    months: List[str]
+
+    def to_dict(self) -> dict:
+        return {'sellerArticle': self.seller_article, 'skus': self.skus, 'months': self.months}
+
+
+class SellerArticleIndex:
+    """Артикул продавца -> артикул WB -> месяцы, в которых встретилась пара."""
+
+    def __init__(self):
+        self._articles: Dict[str, Dict[str, List[str]]] = {}
+        self._months: Set[str] = set()
+
+    def add(self, items: Iterable[Item], month: str = '') -> 'SellerArticleIndex':
+        # Повторное добавление того же месяца ничего не меняет; позиции без
+        # месяца добавляются всегда — их нечем отличить друг от друга
+        if month:
+            if month in self._months:
+                return self
+            self._months.add(month)
+        for item in items:
+            if not item.seller_article:
+                continue
+            months = self._articles.setdefault(item.seller_article, {}).setdefault(item.sku, [])
+            if not months or months[-1] != month:
+                months.append(month)
+        return self
+
+    def conflicts(self, month: Optional[str] = None) -> List[Conflict]:
+        """Конфликты по всей книге; с month — только затрагивающие этот месяц."""
+        conflicts = []
+        for seller_article, skus in self._articles.items():
+            if len(skus) < 2:
+                continue
+            months = list(dict.fromkeys(m for sku_months in skus.values() for m in sku_months))
+            if month is not None and month not in months:
+                continue
+            conflicts.append(Conflict(seller_article, sorted(skus), [m for m in months if m]))
+        return conflicts
+
+
+def find_conflicts(months: Mapping[str, List[Item]]) -> List[Conflict]:
+    """Конфликты артикулов продавца по всем месяцам книги."""
+    index = SellerArticleIndex()
+    for month, items in months.items():
+        index.add(items, month)
+    return index.conflicts()
@@ -0,0 +1,336 @@
+"""Потоковое чтение XLSX без сторонних библиотек.
+
+Книга открывается как ZIP, каждый лист разбирается expat-парсером кусками
+по CHUNK_SIZE байт, строки отдаются генератором. В памяти одновременно
+держатся только таблица общих строк и текущая порция строк листа.
+"""
+from __future__ import annotations
+
+import hashlib
+import posixpath
+import zipfile
+import zlib
+from typing import IO, Dict, Iterator, List, Optional, Union
+from xml.parsers import expat
+
+CHUNK_SIZE = 64 * 1024
+
+Cell = Union[str, int, float, bool, None]
+Row = List[Cell]
+
+
+class XlsxError(ValueError):
+    """Файл не является корректной книгой XLSX."""
+
+
+def _local(name: str) -> str:
+    # Теги бывают с префиксом (x:row) — сравниваем только локальное имя
+    return name.rpartition(':')[2]
+
+
+_DIGITS = '0123456789'
+_columns: dict = {}
+
+
+def _column_index(ref: str) -> int:
+    """Индекс колонки по ссылке на ячейку: A1 -> 0, AB12 -> 27."""
+    letters = ref.rstrip(_DIGITS)
+    index = _columns.get(letters)
+    if index is None:
+        index = 0
+        for char in letters.upper():
+            index = index * 26 + ord(char) - 64
+        index = _columns[letters] = index - 1
+    return index
+
+
+def _number(text: str) -> Union[int, float]:
+    value = float(text)
+    # Как и SheetJS, целые числа отдаём без дробной части: 123456, а не 123456.0
+    if value.is_integer() and abs(value) < 2 ** 53:
+        return int(value)
+    return value
+
+
+# Чем оборачиваются в XlsxError ошибки разбора и распаковки: битый XML,
+# нечисловое значение ячейки, повреждённые данные внутри ZIP
+_XML_ERRORS = (expat.ExpatError, ValueError)
+_ZIP_ERRORS = (zipfile.BadZipFile, zlib.error, EOFError)
+
+
+def _parse_xml(parser: expat.XMLParserType, data: bytes, final: bool) -> None:
+    try:
+        parser.Parse(data, final)
+    except XlsxError:
+        raise
+    except _XML_ERRORS as error:
+        raise XlsxError(f'Повреждённый XML в книге: {error}') from error
+
+
+def _parse(stream: IO[bytes], parser: expat.XMLParserType, pending: list) -> Iterator:
+    while True:
+        try:
+            chunk = stream.read(CHUNK_SIZE)
+        except _ZIP_ERRORS as error:
+            raise XlsxError('Файл книги повреждён') from error
+        _parse_xml(parser, chunk, not chunk)
+        if pending:
+            yield from pending
+            pending.clear()
+        if not chunk:
+            return
+
+
+class Workbook:
+    """Книга XLSX, открытая для потокового чтения листов."""
+
+    def __init__(self, source: Union[str, IO[bytes]]):
+        try:
+            self._zip = zipfile.ZipFile(source)
+        except zipfile.BadZipFile as error:
+            raise XlsxError('Файл не является книгой XLSX') from error
+        self._shared_strings: Optional[List[str]] = None
+        # Лист -> сколько первых общих строк он может затрагивать (после iter_rows)
+        self._shared_used: Dict[str, int] = {}
+        self._sheets = self._read_sheets()
+
+    def __enter__(self) -> 'Workbook':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._zip.close()
+
+    @property
+    def sheet_names(self) -> List[str]:
+        return list(self._sheets)
+
+    def _open(self, path: str) -> IO[bytes]:
+        try:
+            return self._zip.open(path)
+        except KeyError:
+            raise XlsxError(f'В книге нет {path}') from None
+        except _ZIP_ERRORS as error:
+            raise XlsxError('Файл книги повреждён') from error
+
+    def _entry_fingerprint(self, path: str) -> str:
+        try:
+            info = self._zip.getinfo(path)
+        except KeyError:
+            return ''
+        return f'{info.CRC:x}-{info.file_size}'
+
+    def _sheet_path(self, sheet_name: str) -> str:
+        try:
+            return self._sheets[sheet_name]
+        except KeyError:
+            raise XlsxError(f'Лист "{sheet_name}" не найден') from None
+
+    def sheet_fingerprint(self, sheet_name: str) -> str:
+        """Отпечаток листа по каталогу ZIP (CRC-32 и размер XML листа и общих строк).
+
+        Совпал — совпало и содержимое; обратное неверно: Excel перенумеровывает
+        общие строки, и XML нетронутых листов тоже меняется (см. diff.py).
+        """
+        path = self._sheet_path(sheet_name)
+        return f'{self._entry_fingerprint(path)}/{self._entry_fingerprint("xl/sharedStrings.xml")}'
+
+    def sheet_xml_fingerprint(self, sheet_name: str) -> str:
+        """Отпечаток одного XML листа по каталогу ZIP, без общих строк."""
+        return self._entry_fingerprint(self._sheet_path(sheet_name))
+
+    def shared_strings_used(self, sheet_name: str) -> Optional[int]:
+        """Номер самой дальней общей строки листа плюс один; None — лист ещё
+        не дочитан через iter_rows."""
+        return self._shared_used.get(sheet_name)
+
+    def strings_fingerprint(self, sheet_name: str, shared_used: int) -> str:
+        """Отпечаток листа, не зависящий от хвоста общих строк: XML листа и
+        SHA-256 первых shared_used общих строк — всех, на которые он ссылается.
+
+        Строка, которую правка другого листа дописала в конец sharedStrings.xml,
+        его не меняет; при перенумерации строк он меняется, как и XML листа.
+        """
+        shared = self.load_shared_strings()
+        if shared_used > len(shared):
+            return ''
+        digest = hashlib.sha256('\0'.join(shared[:shared_used]).encode('utf-8')).hexdigest()
+        return f'{self.sheet_xml_fingerprint(sheet_name)}/{shared_used}:{digest}'
+
+    def _read_sheets(self) -> dict:
+        try:
+            workbook_xml = self._zip.read('xl/workbook.xml')
+            rels_xml = self._zip.read('xl/_rels/workbook.xml.rels')
+        except KeyError as error:
+            raise XlsxError('В книге нет xl/workbook.xml') from error
+        except _ZIP_ERRORS as error:
+            raise XlsxError('Файл книги повреждён') from error
+
+        targets = {}
+
+        def rel_start(name, attrs):
+            if _local(name) == 'Relationship':
+                targets[attrs.get('Id')] = attrs.get('Target', '')
+
+        parser = expat.ParserCreate()
+        parser.StartElementHandler = rel_start
+        _parse_xml(parser, rels_xml, True)
+
+        sheets = {}
+
+        def sheet_start(name, attrs):
+            if _local(name) != 'sheet':
+                return
+            rel_id = next((v for k, v in attrs.items() if _local(k) == 'id'), None)
+            target = targets.get(rel_id)
+            if target is None:
+                return
+            if target.startswith('/'):
+                path = target.lstrip('/')
+            else:
+                path = posixpath.normpath(posixpath.join('xl', target))
+            sheets[attrs.get('name', '')] = path
+
+        parser = expat.ParserCreate()
+        parser.StartElementHandler = sheet_start
+        _parse_xml(parser, workbook_xml, True)
+        return sheets
+
+    def load_shared_strings(self) -> List[str]:
+        """Общие строки книги; читаются один раз, при первом вызове."""
+        if self._shared_strings is not None:
+            return self._shared_strings
+
+        strings: List[str] = []
+        self._shared_strings = strings
+        try:
+            self._zip.getinfo('xl/sharedStrings.xml')
+        except KeyError:
+            return strings
+        stream = self._open('xl/sharedStrings.xml')
+
+        parts: List[str] = []
+        capture = False
+        phonetic = 0
+
+        def start(name, attrs):
+            nonlocal capture, phonetic
+            tag = _local(name)
+            if tag == 't':
+                capture = not phonetic
+            elif tag == 'rPh':
+                phonetic += 1
+
+        def end(name):
+            nonlocal capture, phonetic
+            tag = _local(name)
+            if tag == 't':
+                capture = False
+            elif tag == 'rPh':
+                phonetic -= 1
+            elif tag == 'si':
+                strings.append(''.join(parts))
+                parts.clear()
+
+        def data(text):
+            if capture:
+                parts.append(text)
+
+        parser = expat.ParserCreate()
+        parser.buffer_text = True
+        parser.StartElementHandler = start
+        parser.EndElementHandler = end
+        parser.CharacterDataHandler = data
+        with stream:
+            for _ in _parse(stream, parser, []):
+                pass
+        return strings
+
+    def iter_rows(self, sheet_name: str) -> Iterator[Row]:
+        """Строки листа по порядку; пустые строки пропускаются."""
+        path = self._sheet_path(sheet_name)
+
+        shared = self.load_shared_strings()
+        used = 0
+        pending: List[Row] = []
+        row: dict = {}
+        text: List[str] = []
+        column = 0
+        kind = 'n'
+        capture = False
+        phonetic = 0
+        # Имена тегов с учётом префикса (x:row); префикс берём у корневого элемента
+        C = V = T = ROW = RPH = ''
+
+        def detect(name, attrs):
+            nonlocal C, V, T, ROW, RPH
+            prefix = name[:len(name) - len(_local(name))]
+            C, V, T, ROW, RPH = (prefix + tag for tag in ('c', 'v', 't', 'row', 'rPh'))
+            parser.StartElementHandler = start
+
+        def start(name, attrs):
+            nonlocal column, kind, capture, phonetic
+            if name == C:
+                ref = attrs.get('r')
+                if ref:
+                    column = _column_index(ref)
+                else:
+                    column = max(row) + 1 if row else 0
+                kind = attrs.get('t', 'n')
+                text.clear()
+            elif name == V or (name == T and not phonetic):
+                capture = True
+            elif name == ROW:
+                row.clear()
+            elif name == RPH:
+                phonetic += 1
+
+        def end(name):
+            nonlocal capture, phonetic, used
+            if name == C:
+                if not text:
+                    return
+                raw = text[0] if len(text) == 1 else ''.join(text)
+                if kind == 's':
+                    index = int(raw)
+                    if index >= used:
+                        if index >= len(shared):
+                            raise XlsxError(f'Ссылка на несуществующую общую строку {index}')
+                        used = index + 1
+                    row[column] = shared[index]
+                elif kind == 'n':
+                    row[column] = _number(raw)
+                elif kind == 'b':
+                    row[column] = raw == '1'
+                else:
+                    # inlineStr, str (формула), e (ошибка), d (дата ISO)
+                    row[column] = raw
+            elif name == V or name == T:
+                capture = False
+            elif name == ROW:
+                if row:
+                    values: Row = [None] * (max(row) + 1)
+                    for col, value in row.items():
+                        values[col] = value
+                    pending.append(values)
+            elif name == RPH:
+                phonetic -= 1
+
+        def data(chunk):
+            if capture:
+                text.append(chunk)
+
+        parser = expat.ParserCreate()
+        parser.buffer_text = True
+        parser.StartElementHandler = detect
+        parser.EndElementHandler = end
+        parser.CharacterDataHandler = data
+        with self._open(path) as stream:
+            yield from _parse(stream, parser, pending)
+        self._shared_used[sheet_name] = used
+
+
+def open_workbook(source: Union[str, IO[bytes]]) -> Workbook:
+    return Workbook(source)